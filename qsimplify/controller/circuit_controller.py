@@ -10,7 +10,7 @@ from qsimplify.drawer import Drawer
 from qsimplify.generator import QiskitGenerator
 from qsimplify.model import quantum_gate
 from qsimplify.model.quantum_graph import QuantumGraph
-from qsimplify.simplifier import Simplifier
+from qsimplify.simplifier import OptimizationLevel, Simplifier
 
 circuit_controller = Blueprint("circuit", __name__)
 gates_converter = GatesConverter()
@@ -18,12 +18,32 @@ qiskit_converter = QiskitConverter()
 simplifier = Simplifier()
 drawer = Drawer()
 qiskit_generator = QiskitGenerator()
+_LEVELS = [int(level) for level in OptimizationLevel]
 
 
 @circuit_controller.post("/simplify")
 def _simplify_circuit() -> tuple[Response, int]:
-    graph = _json_to_graph(request.get_json()["gates"])
-    simplified_graph = simplifier.simplify_graph(graph)
+    json = request.get_json()
+    graph = _json_to_graph(json["gates"])
+    errors = _validate_simplify_options(json)
+
+    if len(errors) != 0:
+        return jsonify({"errors": errors}), 400
+
+    include_statistics = json.get("statistics", False)
+    time_budget = json.get("time_budget")
+    level = json.get("level")
+
+    if level is None:
+        simplification = simplifier.simplify(
+            graph, collect_statistics=include_statistics, time_budget=time_budget
+        )
+    else:
+        simplification = simplifier.simplify_at_level(
+            graph, level, collect_statistics=include_statistics, time_budget=time_budget
+        )
+
+    simplified_graph = simplification.graph
     simplified_gates = [gate.model_dump() for gate in gates_converter.from_graph(simplified_graph)]
     original_metrics = analyzer.calculate_metrics(graph)
     new_metrics = analyzer.calculate_metrics(simplified_graph)
@@ -36,11 +56,38 @@ def _simplify_circuit() -> tuple[Response, int]:
         "new_metrics": new_metrics,
         "delta_metrics": _remove_empty_metrics(delta_metrics),
         "code": build_steps,
+        "partial": simplification.partial,
     }
 
+    if include_statistics:
+        result["statistics"] = simplification.statistics.to_dict()
+
     return jsonify(result), 200
 
 
+def _validate_simplify_options(json: dict) -> dict[str, list[str]]:
+    """Check the optional fields of a simplification request, mapping each invalid field to its errors."""
+    errors = {}
+    statistics = json.get("statistics", False)
+    time_budget = json.get("time_budget")
+    level = json.get("level")
+
+    if not isinstance(statistics, bool):
+        errors["statistics"] = ["must be a boolean"]
+
+    if time_budget is not None and not (_is_number(time_budget, (int, float)) and time_budget >= 0):
+        errors["time_budget"] = ["must be a non-negative number of seconds"]
+
+    if level is not None and (not _is_number(level, int) or level not in _LEVELS):
+        errors["level"] = [f"must be one of the optimization levels {_LEVELS}"]
+
+    return errors
+
+
+def _is_number(value: object, number_type: type | tuple[type, ...]) -> bool:
+    return isinstance(value, number_type) and not isinstance(value, bool)
+
+
 def _json_to_graph(json: Any) -> QuantumGraph:
     gates = quantum_gate.parse_gates(json)
     return gates_converter.to_graph(gates)
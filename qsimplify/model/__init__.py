@@ -1,5 +1,6 @@
 """Contains data structures necessary to represent quantum circuits and their elements."""
 
+from qsimplify.model.dense_quantum_graph import DenseQuantumGraph as DenseQuantumGraph
 from qsimplify.model.edge_data import EdgeData as EdgeData
 from qsimplify.model.edge_name import EdgeName as EdgeName
 from qsimplify.model.gate_name import GateName as GateName
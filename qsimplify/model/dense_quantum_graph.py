@@ -0,0 +1,453 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+import numpy
+
+from qsimplify.model.edge_name import EdgeName
+from qsimplify.model.gate_name import GateName
+from qsimplify.model.graph_node import GraphNode
+from qsimplify.model.position import Position
+from qsimplify.model.quantum_graph import QuantumGraph
+
+_EMPTY = -1
+_NO_BIT = -1
+_GATE_NAMES = tuple(GateName)
+_GATE_CODES = {name: code for code, name in enumerate(_GATE_NAMES)}
+_MIN_CAPACITY = 8
+_ARRAYS = (
+    ("_codes", _EMPTY),
+    ("_angles", numpy.nan),
+    ("_bit_array", _NO_BIT),
+    ("_left_links", False),
+    ("_right_links", False),
+)
+
+Cell = tuple[int, int]
+
+
+class DenseQuantumGraph(QuantumGraph):
+    """A quantum graph that keeps its nodes in NumPy arrays, instead of a dictionary per column.
+
+    The gate names, angles and bits are stored in rows by columns arrays, where missing nodes, angles and bits
+    are -1, NaN and -1 respectively. LEFT and RIGHT edges between adjacent nodes are two boolean arrays,
+    while every other edge goes into a side table, indexed by the (row, column) of its start.
+    It has the same interface as QuantumGraph, so it can be used anywhere in its place,
+    but a large circuit takes a few bytes per node instead of a few hundred.
+    For the same reason, positions are created whenever they are needed instead of being kept.
+    """
+
+    def _init_storage(self) -> None:
+        """Create the empty arrays and side table."""
+        self._codes = numpy.full((0, 0), _EMPTY, dtype=numpy.int8)
+        self._angles = numpy.full((0, 0), numpy.nan, dtype=numpy.float64)
+        self._bit_array = numpy.full((0, 0), _NO_BIT, dtype=numpy.int32)
+        self._left_links = numpy.zeros((0, 0), dtype=numpy.bool_)
+        self._right_links = numpy.zeros((0, 0), dtype=numpy.bool_)
+        self._links: dict[Cell, dict[Cell, EdgeName]] = {}
+        self._back_links: dict[Cell, set[Cell]] = {}
+
+    @classmethod
+    def from_graph(cls, graph: QuantumGraph) -> DenseQuantumGraph:
+        """Copy every node and edge of another graph into a new dense graph."""
+        dense = cls()
+
+        for node in graph:
+            dense.add_node(node.name, node.position, node.angle, node.bit)
+
+        for node in graph:
+            for edge_name, end in graph.iter_node_links(node.position):
+                dense.add_edge(edge_name, node.position, end)
+
+        return dense
+
+    def _get_positions(self) -> Iterator[Position]:
+        return self.iter_positions_by_row()
+
+    def add_node(
+        self,
+        name: GateName,
+        position: Position,
+        angle: float | None = None,
+        bit: int | None = None,
+    ) -> None:
+        """Add a new node to the graph. If there's already a node on that position, its attributes are replaced."""
+        row, column = position.row, position.column
+        self._reserve(row, column)
+
+        old_code = int(self._codes[row, column])
+
+        if old_code == _EMPTY:
+            self._node_count += 1
+            self._add_to_bounds(position)
+        else:
+            old_bit = int(self._bit_array[row, column])
+            self._remove_bit(_GATE_NAMES[old_code], None if old_bit == _NO_BIT else old_bit)
+
+        self._add_bit(name, bit)
+        self._codes[row, column] = _GATE_CODES[name]
+        self._angles[row, column] = numpy.nan if angle is None else angle
+        self._bit_array[row, column] = _NO_BIT if bit is None else bit
+
+    def remove_node(self, position: Position) -> None:
+        """Remove the node at the specified position and all its edges. If no such node exists, nothing happens."""
+        attributes = self.node_attributes(position)
+
+        if attributes is None:
+            return
+
+        row, column = position.row, position.column
+        cell = (row, column)
+        self._remove_bit(attributes[0], attributes[2])
+        self._codes[row, column] = _EMPTY
+        self._angles[row, column] = numpy.nan
+        self._bit_array[row, column] = _NO_BIT
+
+        self._left_links[row, column] = False
+        self._right_links[row, column] = False
+
+        if column > 0:
+            self._right_links[row, column - 1] = False
+
+        if column + 1 < self._left_links.shape[1]:
+            self._left_links[row, column + 1] = False
+
+        self._unlink_cell(cell)
+        self._node_count -= 1
+        self._remove_from_bounds(position)
+
+    def _unlink_cell(self, cell: Cell) -> None:
+        """Remove every edge in the side table that starts or ends on a cell."""
+        for end in self._links.pop(cell, {}):
+            self._discard_back_link(cell, end)
+
+        for start in self._back_links.pop(cell, set()):
+            start_links = self._links[start]
+            del start_links[cell]
+
+            if not start_links:
+                del self._links[start]
+
+    def _is_column_empty(self, column: int) -> bool:
+        return not numpy.any(self._codes[: self._height, column] != _EMPTY)
+
+    def set_angle(self, position: Position, angle: float | None) -> None:
+        """Change the angle of the node at the specified position, keeping all its edges."""
+        if not self.has_node_at(position):
+            raise ValueError(f"Node at position {position} does not exist")
+
+        self._angles[position.row, position.column] = numpy.nan if angle is None else angle
+
+    def __iter__(self) -> Iterator[GraphNode]:
+        """Iterate over the nodes in the graph, row by row."""
+        for position in self.iter_positions_by_row():
+            yield self[position]
+
+    def node_attributes(
+        self, position: Position
+    ) -> tuple[GateName, float | None, int | None] | None:
+        """Get the name, angle and bit of the node at the specified position, without creating a view."""
+        row, column = position.row, position.column
+
+        if row >= self._height or column >= self._width:
+            return None
+
+        code = int(self._codes[row, column])
+
+        if code == _EMPTY:
+            return None
+
+        angle = float(self._angles[row, column])
+        bit = int(self._bit_array[row, column])
+        return (
+            _GATE_NAMES[code],
+            None if numpy.isnan(angle) else angle,
+            None if bit == _NO_BIT else bit,
+        )
+
+    def iter_positions_by_row(self) -> Iterator[Position]:
+        """Iterate over the graph's positions, first row by row and then column by column.
+
+        In case some spaces are empty, they will be skipped.
+        """
+        occupied = self._codes[: self._height, : self._width] != _EMPTY
+
+        for row, column in numpy.argwhere(occupied).tolist():
+            yield Position(row, column)
+
+    def iter_positions_by_column(self) -> Iterator[Position]:
+        """Iterate over the graph's positions, first column by column and then row by row.
+
+        In case some spaces are empty, they will be skipped.
+        """
+        occupied = self._codes[: self._height, : self._width] != _EMPTY
+
+        for column, row in numpy.argwhere(occupied.T).tolist():
+            yield Position(row, column)
+
+    def add_edge(self, name: EdgeName, start: Position, end: Position) -> None:
+        """Add a new edge to the graph, replacing any other edge between the same nodes."""
+        start_cell = (start.row, start.column)
+        end_cell = (end.row, end.column)
+        self._remove_link(start_cell, end_cell)
+        self._reserve(*start_cell)
+
+        if name == EdgeName.LEFT and end_cell == (start.row, start.column - 1):
+            self._left_links[start_cell] = True
+        elif name == EdgeName.RIGHT and end_cell == (start.row, start.column + 1):
+            self._right_links[start_cell] = True
+        else:
+            self._links.setdefault(start_cell, {})[end_cell] = name
+            self._back_links.setdefault(end_cell, set()).add(start_cell)
+
+    def iter_node_links(self, position: Position) -> Iterator[tuple[EdgeName, Position]]:
+        """Iterate over the names and end positions of the edges of a node, without creating views."""
+        row, column = position.row, position.column
+
+        if row >= self._left_links.shape[0] or column >= self._left_links.shape[1]:
+            return
+
+        if self._left_links[row, column]:
+            yield EdgeName.LEFT, Position(row, column - 1)
+
+        if self._right_links[row, column]:
+            yield EdgeName.RIGHT, Position(row, column + 1)
+
+        for end_cell, edge_name in self._links.get((row, column), {}).items():
+            yield edge_name, Position(*end_cell)
+
+    def _iter_back_links(self, position: Position) -> Iterator[tuple[EdgeName, Position]]:
+        """Iterate over the names and start positions of the edges that end on a node."""
+        row, column = position.row, position.column
+        rows, columns = self._left_links.shape
+
+        if row < rows and 0 < column <= columns and self._right_links[row, column - 1]:
+            yield EdgeName.RIGHT, Position(row, column - 1)
+
+        if row < rows and column + 1 < columns and self._left_links[row, column + 1]:
+            yield EdgeName.LEFT, Position(row, column + 1)
+
+        for start_cell in self._back_links.get((row, column), ()):
+            yield self._links[start_cell][(row, column)], Position(*start_cell)
+
+    def _remove_link(self, start: Cell, end: Cell) -> None:
+        start_row, start_column = start
+        rows, columns = self._left_links.shape
+
+        if start_row < rows and start_column < columns and start_row == end[0]:
+            if end[1] == start_column - 1:
+                self._left_links[start] = False
+            elif end[1] == start_column + 1:
+                self._right_links[start] = False
+
+        start_links = self._links.get(start)
+
+        if start_links is not None and start_links.pop(end, None) is not None:
+            self._discard_back_link(start, end)
+
+            if not start_links:
+                del self._links[start]
+
+    def _discard_back_link(self, start: Cell, end: Cell) -> None:
+        end_links = self._back_links[end]
+        end_links.discard(start)
+
+        if not end_links:
+            del self._back_links[end]
+
+    def __eq__(self, other: object) -> bool:
+        """Check whether this graph has the same nodes and edges as another graph, regardless of its backend."""
+        if not isinstance(other, QuantumGraph):
+            return NotImplemented
+
+        if (self.height, self.width, len(self)) != (other.height, other.width, len(other)):
+            return False
+
+        if isinstance(other, DenseQuantumGraph):
+            return self._equals_dense(other)
+
+        for node in other:
+            if self.node_attributes(node.position) != (node.name, node.angle, node.bit):
+                return False
+
+        return self._link_table(self) == self._link_table(other)
+
+    def _equals_dense(self, other: DenseQuantumGraph) -> bool:
+        bounds = (slice(0, self._height), slice(0, self._width))
+        return (
+            numpy.array_equal(self._codes[bounds], other._codes[bounds])
+            and numpy.array_equal(self._angles[bounds], other._angles[bounds], equal_nan=True)
+            and numpy.array_equal(self._bit_array[bounds], other._bit_array[bounds])
+            and numpy.array_equal(self._left_links[bounds], other._left_links[bounds])
+            and numpy.array_equal(self._right_links[bounds], other._right_links[bounds])
+            and self._links == other._links
+        )
+
+    @staticmethod
+    def _link_table(graph: QuantumGraph) -> dict[tuple[Position, Position], EdgeName]:
+        return {
+            (node.position, end): edge_name
+            for node in graph
+            for edge_name, end in graph.iter_node_links(node.position)
+        }
+
+    def has_node_at(self, position: Position) -> bool:
+        """Check whether the graph has a node at the specified row and column."""
+        row, column = position.row, position.column
+        return row < self._height and column < self._width and self._codes[row, column] != _EMPTY
+
+    def insert_column(self, column_index: int) -> None:
+        """Insert an empty column at the given index by shifting all columns at or to the right of it rightward by one.
+
+        The arrays are shifted in bulk, and the LEFT and RIGHT edges that crossed the new column are moved to the side table.
+        Unlike QuantumGraph, this copies every array and rewrites the whole side table,
+        so it takes O(rows * columns + edges) time, although the copies are done by NumPy.
+        """
+        if self.is_empty():
+            raise ValueError("It's not possible to insert a column on an empty graph")
+
+        if column_index < 0 or column_index > self.width:
+            raise ValueError(f"Column index {column_index} is out of bounds")
+
+        self._reserve(0, column_index)
+        crossing_links = []
+
+        if column_index > 0:
+            right_rows = numpy.flatnonzero(self._right_links[:, column_index - 1]).tolist()
+            crossing_links.extend(
+                (EdgeName.RIGHT, (row, column_index - 1), (row, column_index)) for row in right_rows
+            )
+            self._right_links[:, column_index - 1] = False
+
+        left_rows = numpy.flatnonzero(self._left_links[:, column_index]).tolist()
+        crossing_links.extend(
+            (EdgeName.LEFT, (row, column_index), (row, column_index - 1)) for row in left_rows
+        )
+
+        self._left_links[:, column_index] = False
+
+        for attribute, fill_value in _ARRAYS:
+            array = getattr(self, attribute)
+            setattr(self, attribute, numpy.insert(array, column_index, fill_value, axis=1))
+
+        self._shift_links(column_index, 1)
+
+        for edge_name, (start_row, start_column), (end_row, end_column) in crossing_links:
+            start = Position(start_row, start_column + (start_column >= column_index))
+            end = Position(end_row, end_column + (end_column >= column_index))
+            self.add_edge(edge_name, start, end)
+
+        if column_index < self._width:
+            self._width += 1
+
+        for row in range(self.height):
+            self.add_node(GateName.ID, Position(row, column_index))
+
+    def remove_column(self, column_index: int) -> None:
+        """Remove the column at the given index with all its nodes and their edges, shifting all columns to the right of it leftward by one.
+
+        Like insert_column, it takes O(rows * columns + edges) time.
+        """
+        if column_index < 0 or column_index >= self.width:
+            raise ValueError(f"Column index {column_index} is out of bounds")
+
+        for row in range(self.height):
+            self.remove_node(Position(row, column_index))
+
+        linked_cells = self._links.keys() | self._back_links.keys()
+
+        for cell in [cell for cell in linked_cells if cell[1] == column_index]:
+            self._unlink_cell(cell)
+
+        if column_index > 0:
+            self._right_links[:, column_index - 1] = False
+
+        if column_index + 1 < self._left_links.shape[1]:
+            self._left_links[:, column_index + 1] = False
+
+        for attribute, _ in _ARRAYS:
+            setattr(self, attribute, numpy.delete(getattr(self, attribute), column_index, axis=1))
+
+        self._shift_links(column_index + 1, -1)
+        adjacent_links = [
+            (edge_name, start, end)
+            for start, ends in self._links.items()
+            for end, edge_name in ends.items()
+            if edge_name in (EdgeName.LEFT, EdgeName.RIGHT)
+            and start[0] == end[0]
+            and abs(start[1] - end[1]) == 1
+        ]
+
+        for edge_name, start, end in adjacent_links:
+            self.add_edge(edge_name, Position(*start), Position(*end))
+
+        if column_index < self._width:
+            self._width -= 1
+
+        while self._width > 0 and self._is_column_empty(self._width - 1):
+            self._width -= 1
+
+    def _shift_links(self, column_index: int, offset: int) -> None:
+        """Move the cells of the side table that are at or to the right of a column by an offset."""
+
+        def shift(cell: Cell) -> Cell:
+            return (cell[0], cell[1] + offset) if cell[1] >= column_index else cell
+
+        self._links = {
+            shift(start): {shift(end): edge_name for end, edge_name in ends.items()}
+            for start, ends in self._links.items()
+        }
+        self._back_links = {
+            shift(end): {shift(start) for start in starts}
+            for end, starts in self._back_links.items()
+        }
+
+    def clear_edges(self) -> None:
+        """Remove all the edges from the graph."""
+        self._left_links.fill(False)
+        self._right_links.fill(False)
+        self._links.clear()
+        self._back_links.clear()
+
+    def __len__(self) -> int:
+        """Get the total number of nodes in the graph."""
+        return self._node_count
+
+    def copy(self) -> DenseQuantumGraph:
+        """Create a copy of the graph."""
+        copy = DenseQuantumGraph()
+        copy._codes = self._codes.copy()
+        copy._angles = self._angles.copy()
+        copy._bit_array = self._bit_array.copy()
+        copy._left_links = self._left_links.copy()
+        copy._right_links = self._right_links.copy()
+        copy._links = {start: dict(ends) for start, ends in self._links.items()}
+        copy._back_links = {end: set(starts) for end, starts in self._back_links.items()}
+        copy._node_count = self._node_count
+        copy._row_counts = self._row_counts.copy()
+        copy._bit_counts = self._bit_counts.copy()
+        copy._width = self._width
+        copy._height = self._height
+        copy._bits = self._bits
+        return copy
+
+    def _reserve(self, row: int, column: int) -> None:
+        """Grow the arrays so they include the specified cell, at least doubling the size of each one that grows."""
+        rows, columns = self._codes.shape
+
+        if row < rows and column < columns:
+            return
+
+        new_rows = rows if row < rows else max(row + 1, 2 * rows, _MIN_CAPACITY)
+        new_columns = columns if column < columns else max(column + 1, 2 * columns, _MIN_CAPACITY)
+        shape = (new_rows, new_columns)
+
+        for attribute, fill_value in _ARRAYS:
+            setattr(self, attribute, _grow(getattr(self, attribute), shape, fill_value))
+
+
+def _grow(array: numpy.ndarray, shape: tuple[int, ...], fill_value: object) -> numpy.ndarray:
+    """Copy an array into the top-left corner of a larger one, filling the rest with a value."""
+    grown = numpy.full(shape, fill_value, dtype=array.dtype)
+    grown[tuple(slice(0, size) for size in array.shape)] = array
+    return grown
@@ -1,39 +1,132 @@
+from bisect import bisect_left
+from typing import Iterable
+
 import numpy
 
 from qsimplify import math_utils
 from qsimplify.model.edge_name import EdgeName
 from qsimplify.model.gate_name import GateName
+from qsimplify.model.graph_node import GraphNode
 from qsimplify.model.position import Position
 from qsimplify.model.quantum_graph import QuantumGraph
 
 
-def clean_and_fill(graph: QuantumGraph) -> None:
-    """Clean the provided graph, which removes empty rows, columns, adjusts bit indices, and also fills up any empty spaces."""
-    _remove_empty_rows(graph)
+def clean_and_fill(graph: QuantumGraph, keep_rows: bool = False) -> None:
+    """Clean the provided graph, which removes empty rows, columns, adjusts bit indices, and also fills up any empty spaces.
+
+    Setting keep_rows to True leaves empty rows and bit indices untouched, so the graph can still be merged into a larger one.
+    """
+    if not keep_rows:
+        _remove_empty_rows(graph)
+
     _remove_empty_columns(graph)
     _normalize_rotation_angles(graph)
-    _remove_unused_bits(graph)
+
+    if not keep_rows:
+        _remove_unused_bits(graph)
+
     fill(graph)
 
 
+def clean_and_fill_columns(
+    graph: QuantumGraph, positions: Iterable[Position], keep_rows: bool = False
+) -> None:
+    """Clean the provided graph like clean_and_fill, after changing the nodes at some positions of a clean graph.
+
+    Only the columns of the changed positions and their neighbours are cleaned, and the changed rows are only
+    searched up to their first gate, so a few changes don't go over the whole graph.
+    Bit indices are never adjusted, so changes that add or remove measurements need clean_and_fill.
+    Removing a row shifts every row below it, so the whole graph is cleaned if one of the changed rows becomes empty.
+    """
+    positions = list(positions)
+    rows = {position.row for position in positions}
+
+    if not keep_rows and any(_is_row_empty(graph, row) for row in rows):
+        clean_and_fill(graph, keep_rows)
+        return
+
+    columns = sorted({position.column for position in positions})
+    empty_columns = [column for column in columns if _is_column_empty(graph, column)]
+
+    for column in reversed(empty_columns):
+        graph.remove_column(column)
+
+    new_columns = {column: column - bisect_left(empty_columns, column) for column in columns}
+    changed_columns = {new_columns[column] for column in columns if column not in empty_columns}
+    seams = {new_columns[column] for column in empty_columns}
+
+    nodes = (
+        graph[Position(position.row, new_columns[position.column])]
+        for position in positions
+        if position.column not in empty_columns
+    )
+    _normalize_node_angles(graph, [node for node in nodes if node is not None])
+
+    for column in changed_columns:
+        for row in range(graph.height):
+            if not graph.has_node_at(Position(row, column)):
+                graph.add_node(GateName.ID, Position(row, column))
+
+    right_columns = seams | changed_columns | {column + 1 for column in changed_columns}
+
+    for column in right_columns:
+        if 0 < column < graph.width:
+            _link_columns(graph, column - 1, column)
+
+
 def fill(graph: QuantumGraph) -> None:
     """Fill up empty spaces on the provided graph, without removing any empty rows, columns, or adjusting bit indices."""
     _fill_empty_spaces(graph)
     _fix_positional_edges(graph)
 
 
+def normalize_node_angle(name: GateName, angle: float | None) -> float | None:
+    """Get the angle that a node would have after cleaning up the graph."""
+    if angle is None:
+        return None
+
+    if name.is_phase():
+        return math_utils.normalize_angle(angle)
+
+    if name.is_rotation():
+        return math_utils.normalize_angle(angle, 4 * numpy.pi)
+
+    return angle
+
+
+def _link_columns(graph: QuantumGraph, left_column: int, right_column: int) -> None:
+    for row in range(graph.height):
+        left = Position(row, left_column)
+        right = Position(row, right_column)
+
+        if graph.has_node_at(left) and graph.has_node_at(right):
+            graph.add_edge(EdgeName.RIGHT, left, right)
+            graph.add_edge(EdgeName.LEFT, right, left)
+
+
 def _normalize_rotation_angles(graph: QuantumGraph) -> None:
-    for node in [node for node in graph if node.name == GateName.P]:
+    _normalize_node_angles(
+        graph,
+        [
+            node
+            for node in graph
+            if node.name == GateName.P
+            or node.name.is_rotation()
+            or (node.name == GateName.CP and node.angle is not None)
+        ],
+    )
+
+
+def _normalize_node_angles(graph: QuantumGraph, nodes: list[GraphNode]) -> None:
+    for node in [node for node in nodes if node.name == GateName.P]:
         graph.remove_node(node.position)
-        graph.add_node(node.name, node.position, angle=math_utils.normalize_angle(node.angle))
+        graph.add_node(node.name, node.position, angle=normalize_node_angle(node.name, node.angle))
 
-    for node in [node for node in graph if node.name.is_rotation()]:
+    for node in [node for node in nodes if node.name.is_rotation()]:
         graph.remove_node(node.position)
-        graph.add_node(
-            node.name, node.position, angle=math_utils.normalize_angle(node.angle, 4 * numpy.pi)
-        )
+        graph.add_node(node.name, node.position, angle=normalize_node_angle(node.name, node.angle))
 
-    for node in [node for node in graph if node.name == GateName.CP and node.angle is not None]:
+    for node in [node for node in nodes if node.name == GateName.CP and node.angle is not None]:
         edges = graph.node_edge_data(node.position)
         control = edges.controlled_by[0].position
         target = node.position
@@ -42,7 +135,7 @@ def _normalize_rotation_angles(graph: QuantumGraph) -> None:
         graph.remove_node(target)
 
         graph.add_node(GateName.CP, control)
-        graph.add_node(GateName.CP, target, angle=math_utils.normalize_angle(node.angle))
+        graph.add_node(GateName.CP, target, angle=normalize_node_angle(node.name, node.angle))
 
         graph.add_edge(EdgeName.TARGETS, control, target)
         graph.add_edge(EdgeName.CONTROLLED_BY, target, control)
@@ -61,9 +154,8 @@ def _remove_empty_rows(graph: QuantumGraph) -> None:
         for subsequent_row in range(adjusted_row + 1, initial_height):
             for column_index in range(graph.width):
                 node_position = Position(subsequent_row, column_index)
-                node = graph[node_position]
 
-                if node is not None:
+                if graph.has_node_at(node_position):
                     graph.move_node(
                         node_position,
                         Position(subsequent_row - 1, column_index),
@@ -71,63 +163,32 @@ def _remove_empty_rows(graph: QuantumGraph) -> None:
 
 
 def _find_empty_rows(graph: QuantumGraph) -> list[int]:
-    empty_rows = []
-
-    for row_index in range(graph.height):
-        is_empty = True
-
-        for column_index in range(graph.width):
-            node = graph[Position(row_index, column_index)]
-
-            if node is not None and node.name != GateName.ID:
-                is_empty = False
-                break
+    return [row_index for row_index in range(graph.height) if _is_row_empty(graph, row_index)]
 
-        if is_empty:
-            empty_rows.append(row_index)
 
-    return empty_rows
+def _is_row_empty(graph: QuantumGraph, row_index: int) -> bool:
+    return not any(
+        graph.is_occupied(Position(row_index, column_index)) for column_index in range(graph.width)
+    )
 
 
 def _remove_empty_columns(graph: QuantumGraph) -> None:
     empty_columns = _find_empty_columns(graph)
-    initial_width = graph.width
 
     for offset, column_index in enumerate(empty_columns):
-        adjusted_column = column_index - offset
-
-        for row_index in range(graph.height):
-            graph.remove_node(Position(row_index, adjusted_column))
-
-        for subsequent_column in range(adjusted_column + 1, initial_width):
-            for row_index in range(graph.height):
-                node_position = Position(row_index, subsequent_column)
-                node = graph[node_position]
-
-                if node is not None:
-                    graph.move_node(
-                        node_position,
-                        Position(row_index, subsequent_column - 1),
-                    )
+        graph.remove_column(column_index - offset)
 
 
 def _find_empty_columns(graph: QuantumGraph) -> list[int]:
-    empty_columns = []
-
-    for column_index in range(graph.width):
-        is_empty = True
-
-        for row_index in range(graph.height):
-            node = graph[Position(row_index, column_index)]
-
-            if node is not None and node.name != GateName.ID:
-                is_empty = False
-                break
+    return [
+        column_index for column_index in range(graph.width) if _is_column_empty(graph, column_index)
+    ]
 
-        if is_empty:
-            empty_columns.append(column_index)
 
-    return empty_columns
+def _is_column_empty(graph: QuantumGraph, column_index: int) -> bool:
+    return not any(
+        graph.is_occupied(Position(row_index, column_index)) for row_index in range(graph.height)
+    )
 
 
 def _remove_unused_bits(graph: QuantumGraph) -> None:
@@ -167,12 +228,17 @@ def _fix_positional_edges(graph: QuantumGraph) -> None:
 
 
 def _clear_positional_edges(graph: QuantumGraph) -> None:
-    non_positional_edges = [edge for edge in graph.edges() if not edge.name.is_positional()]
+    non_positional_edges = [
+        (edge_name, node.position, end)
+        for node in graph
+        for edge_name, end in graph.iter_node_links(node.position)
+        if not edge_name.is_positional()
+    ]
 
     graph.clear_edges()
 
-    for edge in non_positional_edges:
-        graph.add_edge(edge.name, edge.start.position, edge.end.position)
+    for edge_name, start, end in non_positional_edges:
+        graph.add_edge(edge_name, start, end)
 
 
 def _find_adjacent_positions(position: Position) -> dict[EdgeName, Position]:
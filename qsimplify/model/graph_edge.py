@@ -4,7 +4,7 @@ from qsimplify.model.edge_name import EdgeName
 from qsimplify.model.graph_node import GraphNode
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GraphEdge:
     """A view of an edge in a quantum graph.
 
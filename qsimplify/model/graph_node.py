@@ -4,7 +4,7 @@ from qsimplify.model.gate_name import GateName
 from qsimplify.model.position import Position
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GraphNode:
     """A view of a node in a quantum graph.
 
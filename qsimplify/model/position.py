@@ -1,24 +1,61 @@
-from dataclasses import dataclass
+from __future__ import annotations
+
+from dataclasses import FrozenInstanceError
 from typing import Iterator
 
 
-@dataclass(frozen=True)
 class Position:
     """Represents a (row, column) position in a QuantumGraph.
 
+    Positions are immutable and compute their hash only once.
+    QuantumGraph keeps the positions of its nodes, so iterating over a graph reuses the same instances.
+
     Attributes:
         row: The row, equivalent to the qubit index. Cannot be negative.
         column: The column index. Cannot be negative.
 
     """
 
+    __slots__ = ("_hash", "column", "row")
+    __match_args__ = ("row", "column")
+
     row: int
     column: int
 
-    def __post_init__(self) -> None:
-        """Check that the position's coordinates are valid."""
-        if self.row < 0 or self.column < 0:
-            raise ValueError(f"Position '{self}' can't have negative coordinates")
+    def __init__(self, row: int, column: int) -> None:
+        """Create a new position after checking that its coordinates are valid."""
+        if row < 0 or column < 0:
+            raise ValueError(f"Position '({row}, {column})' can't have negative coordinates")
+
+        object.__setattr__(self, "row", row)
+        object.__setattr__(self, "column", column)
+        object.__setattr__(self, "_hash", hash((row, column)))
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """Prevent any changes, since positions are shared."""
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        """Prevent any changes, since positions are shared."""
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __reduce__(self) -> tuple[type[Position], tuple[int, int]]:
+        """Recreate positions through the constructor when unpickling, since their fields can't be assigned."""
+        return Position, (self.row, self.column)
+
+    def __eq__(self, other: object) -> bool:
+        """Check whether this position has the same coordinates as another one."""
+        if self is other:
+            return True
+
+        if not isinstance(other, Position):
+            return NotImplemented
+
+        return self.row == other.row and self.column == other.column
+
+    def __hash__(self) -> int:
+        """Get the hash of the position's coordinates, which is computed only once."""
+        return self._hash
 
     def __iter__(self) -> Iterator[int]:
         """Iterate over the position's coordinates, first the row and then the column.
@@ -27,6 +64,10 @@ class Position:
         """
         return iter((self.row, self.column))
 
+    def __repr__(self) -> str:
+        """Get a representation of this position that can be evaluated back."""
+        return f"Position(row={self.row}, column={self.column})"
+
     def __str__(self) -> str:
         """Get a string representation of this position."""
         return f"({self.row}, {self.column})"
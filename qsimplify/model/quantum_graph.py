@@ -1,10 +1,8 @@
 from __future__ import annotations
 
+from collections import Counter
 from typing import Iterator
 
-import networkx
-from networkx.classes import DiGraph
-
 from qsimplify.model.edge_data import EdgeData
 from qsimplify.model.edge_name import EdgeName
 from qsimplify.model.gate_name import GateName
@@ -12,6 +10,38 @@ from qsimplify.model.graph_edge import GraphEdge
 from qsimplify.model.graph_node import GraphNode
 from qsimplify.model.position import Position
 
+NodeAttributes = tuple[GateName, float | None, int | None]
+Link = tuple[int, int]
+"""The row of the other end of an edge, and how many columns it's away from this end."""
+
+CrossingLink = tuple[int, int, int, int]
+
+
+class _Column:
+    """The nodes on a column of the graph, and the edges that start or end on them, indexed by row.
+
+    Edges refer to their other end by its row and its distance in columns, which only changes
+    when a column is inserted or removed between both ends.
+    The positions of the column's rows are kept once created, and recreated if the column is moved.
+    """
+
+    __slots__ = ("back_links", "id", "links", "nodes", "positions")
+
+    def __init__(self, column_id: int) -> None:
+        self.id = column_id
+        self.nodes: dict[int, NodeAttributes] = {}
+        self.links: dict[int, dict[Link, EdgeName]] = {}
+        self.back_links: dict[int, dict[Link, None]] = {}
+        self.positions: dict[int, Position] = {}
+
+    def copy(self) -> _Column:
+        copy = _Column(self.id)
+        copy.nodes = self.nodes.copy()
+        copy.positions = self.positions.copy()
+        copy.links = {row: links.copy() for row, links in self.links.items()}
+        copy.back_links = {row: links.copy() for row, links in self.back_links.items()}
+        return copy
+
 
 class QuantumGraph:
     """Represents a quantum circuit as a hybrid of a directed graph and a 2D matrix.
@@ -22,42 +52,160 @@ class QuantumGraph:
     Single-qubit gates occupy a single node, while multi-qubit gates use multiple related nodes (one for each qubit involved).
     Empty spaces are filled by ID (identity) gates.
     It's recommended to use the graph builder to build the graph with ease.
+    The width, height and bits are kept up to date as nodes are added and removed,
+    by counting the nodes on each row and column, and the measurements on each bit.
+    Nodes are stored column by column, and a position's column is an index into the list of columns.
+    Edges store the distance to their other end, so inserting or removing a column only touches the nodes on it
+    and the edges that cross it, which are the ones between the columns next to it in a clean graph.
+    Copies share their columns with the original graph, and each graph copies a column the first time it changes it.
+    Subclasses can keep the nodes and edges in a different storage, like DenseQuantumGraph, by replacing
+    _init_storage and every method that reads or writes the columns.
     """
 
     def __init__(self) -> None:
         """Create an empty quantum graph."""
-        self._network = DiGraph()
+        self._init_storage()
+        self._node_count = 0
+        self._reset_bounds()
+
+    def _init_storage(self) -> None:
+        """Create the empty storage of the nodes and edges."""
+        self._columns: list[_Column] = []
+        self._shares_columns = False
+        self._owned_columns: set[int] = set()
+        self._next_column_id = 0
+        self._long_links: Counter[int] = Counter()
+        self._long_distances: Counter[int] = Counter()
+
+    def _reset_bounds(self) -> None:
+        self._row_counts: Counter[int] = Counter()
+        self._bit_counts: Counter[int] = Counter()
+        self._shares_counts = False
+        self._width = 0
+        self._height = 0
+        self._bits = 0
 
     @property
     def width(self) -> int:
         """The number of columns in the graph. Also known as the graph depth."""
-        if self.is_empty():
-            return 0
-
-        return max(position.column for position in self._get_positions()) + 1
+        return self._width
 
     @property
     def height(self) -> int:
         """The number of rows (qubits) in the graph."""
-        if self.is_empty():
-            return 0
-
-        return max(position.row for position in self._get_positions()) + 1
+        return self._height
 
     @property
     def bits(self) -> int:
         """The number of classical bits in the graph."""
-        measure_nodes = [node for node in self if node.name == GateName.MEASURE]
+        return self._bits
+
+    def _own_counts(self) -> None:
+        """Stop sharing the node and measurement counts with the graph this one was copied from, or copied to."""
+        if self._shares_counts:
+            self._row_counts = self._row_counts.copy()
+            self._bit_counts = self._bit_counts.copy()
+            self._shares_counts = False
+
+    def _add_to_bounds(self, position: Position) -> None:
+        self._own_counts()
+        self._row_counts[position.row] += 1
+        self._height = max(self._height, position.row + 1)
+        self._width = max(self._width, position.column + 1)
+
+    def _remove_from_bounds(self, position: Position) -> None:
+        """Stop counting a removed node, shrinking the bounds only if it was on the bottom row or right column."""
+        self._own_counts()
+        self._row_counts[position.row] -= 1
+
+        if position.row == self._height - 1:
+            while self._height > 0 and self._row_counts[self._height - 1] == 0:
+                self._height -= 1
+
+        if position.column == self._width - 1:
+            while self._width > 0 and self._is_column_empty(self._width - 1):
+                self._width -= 1
+
+    def _is_column_empty(self, column: int) -> bool:
+        return not self._columns[column].nodes
+
+    def _add_bit(self, name: GateName | None, bit: int | None) -> None:
+        if name != GateName.MEASURE or bit is None:
+            return
+
+        self._own_counts()
+        self._bit_counts[bit] += 1
+        self._bits = max(self._bits, bit + 1)
+
+    def _remove_bit(self, name: GateName | None, bit: int | None) -> None:
+        if name != GateName.MEASURE or bit is None:
+            return
+
+        self._own_counts()
+        self._bit_counts[bit] -= 1
+
+        while self._bits > 0 and self._bit_counts[self._bits - 1] == 0:
+            self._bits -= 1
+
+    def _find_column(self, column: int) -> _Column | None:
+        if column < len(self._columns):
+            return self._columns[column]
+
+        return None
+
+    def _get_column(self, column: int) -> _Column:
+        """Get a column that is going to be modified, creating it and any missing columns before it.
+
+        If the column is shared with another graph, it's replaced by a copy that belongs only to this one.
+        """
+        self._own_columns()
+
+        while len(self._columns) <= column:
+            self._columns.append(self._new_column())
 
-        if len(measure_nodes) == 0:
-            return 0
+        found_column = self._columns[column]
 
-        highest_bit = max(node.bit for node in measure_nodes)
-        return highest_bit + 1
+        if found_column.id not in self._owned_columns:
+            found_column = found_column.copy()
+            self._columns[column] = found_column
+            self._owned_columns.add(found_column.id)
+
+        return found_column
+
+    def _new_column(self) -> _Column:
+        new_column = _Column(self._next_column_id)
+        self._next_column_id += 1
+        self._owned_columns.add(new_column.id)
+        return new_column
+
+    def _own_columns(self) -> None:
+        """Stop sharing the list of columns with another graph, but not the columns themselves."""
+        if self._shares_columns:
+            self._columns = list(self._columns)
+            self._long_links = self._long_links.copy()
+            self._long_distances = self._long_distances.copy()
+            self._shares_columns = False
+
+    def _count_long_link(self, column: _Column, distance: int, change: int) -> None:
+        """Keep track of the columns with edges that span more than one column, which are rare in a clean graph,
+        and of how far those edges reach.
+        """
+        if abs(distance) <= 1:
+            return
+
+        self._long_links[column.id] += change
+        self._long_distances[abs(distance)] += change
+
+        if self._long_links[column.id] == 0:
+            del self._long_links[column.id]
+
+        if self._long_distances[abs(distance)] == 0:
+            del self._long_distances[abs(distance)]
 
     def _get_positions(self) -> Iterator[Position]:
-        for position in self._network.nodes:
-            yield position
+        for index, column in enumerate(self._columns):
+            for row in sorted(column.nodes):
+                yield _get_position(column, row, index)
 
     def is_empty(self) -> bool:
         """Check whether this graph is empty (has no gates) or not."""
@@ -70,121 +218,207 @@ class QuantumGraph:
         angle: float | None = None,
         bit: int | None = None,
     ) -> None:
-        """Add a new node to the graph."""
-        self._network.add_node(
-            position,
-            name=name,
-            angle=angle,
-            bit=bit,
-        )
+        """Add a new node to the graph. If there's already a node on that position, its attributes are replaced."""
+        column = self._get_column(position.column)
+        old_node = column.nodes.get(position.row)
+
+        if old_node is None:
+            self._node_count += 1
+            self._add_to_bounds(position)
+        else:
+            self._remove_bit(old_node[0], old_node[2])
+
+        column.nodes[position.row] = (name, angle, bit)
+        self._add_bit(name, bit)
 
     def remove_node(self, position: Position) -> None:
         """Remove the node at the specified position and all its edges. If no such node exists, nothing happens."""
-        if self.has_node_at(position):
-            self._network.remove_node(position)
+        if not self.has_node_at(position):
+            return
+
+        column = self._get_column(position.column)
+        name, _, bit = column.nodes.pop(position.row)
+        column.positions.pop(position.row, None)
+        self._unlink(position.column, position.row)
+        self._node_count -= 1
+        self._remove_from_bounds(position)
+        self._remove_bit(name, bit)
+
+    def _unlink(self, index: int, row: int) -> None:
+        """Remove every edge that starts or ends on a row of a column."""
+        column = self._get_column(index)
+
+        for end_row, distance in column.links.pop(row, {}):
+            end_column = self._get_column(index + distance)
+            _discard_link(end_column.back_links, end_row, (row, -distance))
+            self._count_long_link(column, distance, -1)
+
+        for start_row, distance in column.back_links.pop(row, {}):
+            start_column = self._get_column(index + distance)
+            _discard_link(start_column.links, start_row, (row, -distance))
+            self._count_long_link(start_column, distance, -1)
 
     def move_node(self, start: Position, end: Position) -> None:
         """Move the node at the specified position to another position, removing the node at the destination."""
-        if not self.has_node_at(start):
+        node = self.node_attributes(start)
+
+        if node is None:
             raise ValueError(f"Node at position {start} does not exist")
 
         if start == end:
             raise ValueError(f"Start and end positions shouldn't be the same {start}")
 
-        node = self._network.nodes[start]
-        in_edges = list(self._network.in_edges(start, data=True))
-        out_edges = list(self._network.out_edges(start, data=True))
+        in_links = list(self._iter_back_links(start))
+        out_links = list(self.iter_node_links(start))
 
         self.remove_node(end)
         self.remove_node(start)
-        self._network.add_node(end, **node)
+        self.add_node(node[0], end, node[1], node[2])
 
-        for source, _, data in in_edges:
+        for edge_name, source in in_links:
             if source != start:
-                self._network.add_edge(source, end, **data)
+                self.add_edge(edge_name, source, end)
 
-        for _, target, data in out_edges:
+        for edge_name, target in out_links:
             if target != start:
-                self._network.add_edge(end, target, **data)
+                self.add_edge(edge_name, end, target)
 
     def clear_node(self, position: Position) -> None:
         """Replace the node at the specified position with an identity node."""
         self.remove_node(position)
         self.add_node(GateName.ID, position)
 
+    def set_angle(self, position: Position, angle: float | None) -> None:
+        """Change the angle of the node at the specified position, keeping all its edges."""
+        node = self.node_attributes(position)
+
+        if node is None:
+            raise ValueError(f"Node at position {position} does not exist")
+
+        self._get_column(position.column).nodes[position.row] = (node[0], angle, node[2])
+
     def __getitem__(self, position: Position) -> GraphNode | None:
         """Get the node at the specified position."""
-        if not self.has_node_at(position):
+        node = self.node_attributes(position)
+
+        if node is None:
             return None
 
-        node = self._network.nodes[position]
-        return GraphNode(
-            node["name"],
-            position,
-            angle=node["angle"],
-            bit=node["bit"],
-        )
+        name, angle, bit = node
+        return GraphNode(name, position, angle=angle, bit=bit)
 
     def __iter__(self) -> Iterator[GraphNode]:
-        """Iterate over the nodes in the graph."""
-        for position, node in self._network.nodes(data=True):
-            yield GraphNode(
-                node["name"],
-                position,
-                angle=node["angle"],
-                bit=node["bit"],
-            )
+        """Iterate over the nodes in the graph, column by column."""
+        for index, column in enumerate(self._columns):
+            nodes = column.nodes
+
+            for row in sorted(nodes):
+                name, angle, bit = nodes[row]
+                yield GraphNode(name, _get_position(column, row, index), angle=angle, bit=bit)
+
+    def node_attributes(self, position: Position) -> NodeAttributes | None:
+        """Get the name, angle and bit of the node at the specified position, without creating a view."""
+        if position.column >= len(self._columns):
+            return None
+
+        return self._columns[position.column].nodes.get(position.row)
 
     def iter_positions_by_row(self) -> Iterator[Position]:
         """Iterate over the graph's positions, first row by row and then column by column.
 
         In case some spaces are empty, they will be skipped.
         """
-        for row in range(self.height):
-            for column in range(self.width):
-                position = Position(row, column)
+        columns = self._columns[: self.width]
 
-                if self.has_node_at(position):
-                    yield position
+        for row in range(self.height):
+            for index, column in enumerate(columns):
+                if row in column.nodes:
+                    yield _get_position(column, row, index)
 
     def iter_positions_by_column(self) -> Iterator[Position]:
         """Iterate over the graph's positions, first column by column and then row by row.
 
         In case some spaces are empty, they will be skipped.
         """
-        for column in range(self.width):
+        for index, column in enumerate(self._columns[: self.width]):
             for row in range(self.height):
-                position = Position(row, column)
-
-                if self.has_node_at(position):
-                    yield position
+                if row in column.nodes:
+                    yield _get_position(column, row, index)
 
     def nodes(self) -> list[GraphNode]:
         """Retrieve all the nodes in the graph."""
         return list(self)
 
     def add_edge(self, name: EdgeName, start: Position, end: Position) -> None:
-        """Add a new edge to the graph."""
-        self._network.add_edge(start, end, name=name)
+        """Add a new edge to the graph, replacing any other edge between the same positions.
+
+        The nodes may be added later, but until then the edge is ignored by everything except their edge queries.
+        """
+        start_column = self._get_column(start.column)
+        end_column = self._get_column(end.column)
+        distance = end.column - start.column
+        links = start_column.links.setdefault(start.row, {})
+
+        if (end.row, distance) not in links:
+            self._count_long_link(start_column, distance, 1)
+
+        links[(end.row, distance)] = name
+        end_column.back_links.setdefault(end.row, {})[(start.row, -distance)] = None
 
     def add_bidirectional_edge(self, name: EdgeName, first: Position, second: Position) -> None:
         """Add a new bidirectional edge to the graph, as a pair of unidirectional edges."""
-        self._network.add_edge(first, second, name=name)
-        self._network.add_edge(second, first, name=name)
+        self.add_edge(name, first, second)
+        self.add_edge(name, second, first)
 
     def iter_edges(self) -> Iterator[GraphEdge]:
-        """Iterate over the edges in the graph."""
-        for start, end, data in self._network.edges(data=True):
-            yield GraphEdge(data["name"], self[start], self[end])
+        """Iterate over the edges in the graph, grouped by their starting node."""
+        for position in self._get_positions():
+            yield from self.iter_node_edges(position)
 
     def edges(self) -> list[GraphEdge]:
         """Retrieve all the edges in the graph."""
         return list(self.iter_edges())
 
     def iter_node_edges(self, position: Position) -> Iterator[GraphEdge]:
-        """Iterate over the edges of the node at the specified position."""
-        for _, end, data in self._network.out_edges(position, data=True):
-            yield GraphEdge(data["name"], self[position], self[end])
+        """Iterate over the edges of the node at the specified position.
+
+        The view of the starting node is created only if the node has any edges, and it's shared by all of them.
+        """
+        origin = None
+
+        for edge_name, end in self.iter_node_links(position):
+            if origin is None:
+                origin = self[position]
+
+            yield GraphEdge(edge_name, origin, self[end])
+
+    def iter_node_links(self, position: Position) -> Iterator[tuple[EdgeName, Position]]:
+        """Iterate over the names and end positions of the edges of a node, without creating views."""
+        column = self._find_column(position.column)
+        links = column.links.get(position.row) if column is not None else None
+
+        if not links:
+            return
+
+        for (row, distance), edge_name in links.items():
+            end_index = position.column + distance
+            yield edge_name, _get_position(self._columns[end_index], row, end_index)
+
+    def _iter_back_links(self, position: Position) -> Iterator[tuple[EdgeName, Position]]:
+        """Iterate over the names and start positions of the edges that end on a node."""
+        column = self._find_column(position.column)
+        back_links = column.back_links.get(position.row) if column is not None else None
+
+        if not back_links:
+            return
+
+        for row, distance in back_links:
+            start_index = position.column + distance
+            start_column = self._columns[start_index]
+            yield (
+                start_column.links[row][(position.row, -distance)],
+                _get_position(start_column, row, start_index),
+            )
 
     def node_edges(self, position: Position) -> list[GraphEdge]:
         """Retrieve all the edges of the node at the specified position."""
@@ -203,8 +437,7 @@ class QuantumGraph:
             EdgeName.WORKS_WITH.value: [],
         }
 
-        for _, end, data in self._network.out_edges(position, data=True):
-            edge_name = data["name"]
+        for edge_name, end in self.iter_node_links(position):
             destination_node = self[end]
 
             if edge_name in [
@@ -259,49 +492,236 @@ class QuantumGraph:
         if not isinstance(other, QuantumGraph):
             return NotImplemented
 
-        return networkx.utils.graphs_equal(self._network, other._network)
+        if len(self) != len(other) or self.width != other.width or self.height != other.height:
+            return False
+
+        for index in range(max(len(self._columns), len(other._columns))):
+            column = self._find_column(index)
+            other_column = other._find_column(index)
+
+            if self._column_contents(column, index) != other._column_contents(other_column, index):
+                return False
+
+        return True
+
+    @staticmethod
+    def _column_contents(
+        column: _Column | None, index: int
+    ) -> tuple[dict[int, NodeAttributes], dict[int, dict[Position, EdgeName]]]:
+        """Get the nodes of a column and the edges that start on them."""
+        if column is None:
+            return {}, {}
+
+        links = {
+            row: {
+                Position(end_row, index + distance): name
+                for (end_row, distance), name in ends.items()
+            }
+            for row, ends in column.links.items()
+            if ends
+        }
+        return column.nodes, links
 
     def has_node_at(self, position: Position) -> bool:
         """Check whether the graph has a node at the specified row and column."""
-        return position in self._network
+        return (
+            position.column < len(self._columns)
+            and position.row in self._columns[position.column].nodes
+        )
 
     def is_occupied(self, position: Position) -> bool:
         """Check whether the graph has a non-identity node at the specified row and column."""
-        return self.has_node_at(position) and self[position].name != GateName.ID
+        attributes = self.node_attributes(position)
+        return attributes is not None and attributes[0] != GateName.ID
 
     def insert_column(self, column_index: int) -> None:
-        """Insert an empty column at the given index by shifting all columns at or to the right of it rightward by one."""
+        """Insert an empty column at the given index by shifting all columns at or to the right of it rightward by one.
+
+        Only the new column and the edges that cross it are written, which takes O(rows) time in a clean graph.
+        The LEFT and RIGHT edges that crossed the gap keep linking the same nodes, so they span two columns until
+        the graph is filled, and finding the edges like them takes O(d) more time, where d is the longest span.
+        """
         if self.is_empty():
             raise ValueError("It's not possible to insert a column on an empty graph")
 
         if column_index < 0 or column_index > self.width:
             raise ValueError(f"Column index {column_index} is out of bounds")
 
-        for column in reversed(range(column_index, self.width)):
-            for row in range(self.height):
-                old_position = Position(row, column)
-                new_position = Position(row, column + 1)
+        self._own_columns()
+        crossing_links = self._find_crossing_links(column_index, is_inserting=True)
+        self._columns.insert(column_index, self._new_column())
 
-                if self.has_node_at(old_position):
-                    self.move_node(old_position, new_position)
+        for start_index, row, end_row, distance in crossing_links:
+            if start_index < column_index:
+                self._stretch_link(start_index, row, end_row, distance, distance + 1)
+            else:
+                self._stretch_link(start_index + 1, row, end_row, distance, distance - 1)
+
+        if column_index < self._width:
+            self._width += 1
 
         for row in range(self.height):
             self.add_node(GateName.ID, Position(row, column_index))
 
+    def remove_column(self, column_index: int) -> None:
+        """Remove the column at the given index with all its nodes and their edges, shifting all columns to the right of it leftward by one.
+
+        Like insert_column, it takes O(rows) time in a clean graph.
+        """
+        if column_index < 0 or column_index >= self.width:
+            raise ValueError(f"Column index {column_index} is out of bounds")
+
+        for row in list(self._columns[column_index].nodes):
+            self.remove_node(Position(row, column_index))
+
+        column = self._get_column(column_index)
+
+        for row in list(column.links.keys() | column.back_links.keys()):
+            self._unlink(column_index, row)
+
+        crossing_links = self._find_crossing_links(column_index, is_inserting=False)
+        del self._columns[column_index]
+
+        for start_index, row, end_row, distance in crossing_links:
+            if start_index < column_index:
+                self._stretch_link(start_index, row, end_row, distance, distance - 1)
+            else:
+                self._stretch_link(start_index - 1, row, end_row, distance, distance + 1)
+
+        if column_index < self._width:
+            self._width -= 1
+
+        while self._width > 0 and self._is_column_empty(self._width - 1):
+            self._width -= 1
+
+    def _find_crossing_links(self, column_index: int, is_inserting: bool) -> list[CrossingLink]:
+        """Find the edges that go over a column, or over the gap before it when inserting a new one there.
+
+        Each edge is returned as the index of its start column, its start row, its end row and its distance.
+        Edges between adjacent columns can only go over a gap, and the long edges can only start on the columns
+        that are within reach of the longest one.
+        They are sorted so that changing their distances one by one never turns an edge into another existing one:
+        the longest first when inserting, since they grow, and the shortest first when removing, since they shrink.
+        """
+        crossing_links = []
+        candidates = []
+
+        if is_inserting:
+            if column_index > 0:
+                candidates.append(column_index - 1)
+
+            if column_index < len(self._columns):
+                candidates.append(column_index)
+
+        if self._long_links:
+            reach = max(self._long_distances)
+            candidates.extend(
+                index
+                for index in range(
+                    max(column_index - reach, 0), min(column_index + reach, len(self._columns))
+                )
+                if self._columns[index].id in self._long_links and index not in candidates
+            )
+
+        for start_index in candidates:
+            for row, links in self._columns[start_index].links.items():
+                crossing_links.extend(
+                    (start_index, row, end_row, distance)
+                    for end_row, distance in links
+                    if _is_crossing(start_index, start_index + distance, column_index, is_inserting)
+                )
+
+        crossing_links.sort(key=lambda link: abs(link[3]), reverse=is_inserting)
+        return crossing_links
+
+    def _stretch_link(
+        self, start_index: int, row: int, end_row: int, distance: int, new_distance: int
+    ) -> None:
+        """Change the distance of an edge whose ends were moved apart or closer, keeping the order of the edges."""
+        start_column = self._get_column(start_index)
+        end_column = self._get_column(start_index + new_distance)
+        start_column.links[row] = {
+            ((end_row, new_distance) if link == (end_row, distance) else link): name
+            for link, name in start_column.links[row].items()
+        }
+        end_column.back_links[end_row] = {
+            ((row, -new_distance) if link == (row, -distance) else link): None
+            for link in end_column.back_links[end_row]
+        }
+        self._count_long_link(start_column, distance, -1)
+        self._count_long_link(start_column, new_distance, 1)
+
     def clear(self) -> None:
         """Remove all the nodes and edges from the graph."""
-        self._network.clear()
+        self._init_storage()
+        self._node_count = 0
+        self._reset_bounds()
 
     def clear_edges(self) -> None:
         """Remove all the edges from the graph."""
-        self._network.clear_edges()
+        for index, column in enumerate(self._columns):
+            if column.links or column.back_links:
+                column = self._get_column(index)
+                column.links.clear()
+                column.back_links.clear()
+
+        self._long_links = Counter()
+        self._long_distances = Counter()
 
     def __len__(self) -> int:
         """Get the total number of nodes in the graph."""
-        return len(self._network.nodes)
+        return self._node_count
 
     def copy(self) -> QuantumGraph:
-        """Create a copy of the graph."""
+        """Create a copy of the graph in constant time.
+
+        Both graphs share all their columns until they change them, so either one can be changed without affecting the other.
+        """
+        self._shares_columns = True
+        self._owned_columns = set()
+        self._shares_counts = True
+
         copy = QuantumGraph()
-        copy._network = self._network.copy()
+        copy._columns = self._columns
+        copy._shares_columns = True
+        copy._long_links = self._long_links
+        copy._long_distances = self._long_distances
+        copy._next_column_id = self._next_column_id
+        copy._node_count = self._node_count
+        copy._row_counts = self._row_counts
+        copy._bit_counts = self._bit_counts
+        copy._shares_counts = True
+        copy._width = self._width
+        copy._height = self._height
+        copy._bits = self._bits
         return copy
+
+
+def _get_position(column: _Column, row: int, index: int) -> Position:
+    """Get the position of a row of a column, reusing the one created before unless the column has moved."""
+    position = column.positions.get(row)
+
+    if position is None or position.column != index:
+        position = column.positions[row] = Position(row, index)
+
+    return position
+
+
+def _is_crossing(start: int, end: int, column_index: int, is_inserting: bool) -> bool:
+    """Check whether an edge goes over a column, or over the gap before it when inserting a new one there."""
+    if is_inserting:
+        return min(start, end) < column_index <= max(start, end)
+
+    return min(start, end) < column_index < max(start, end)
+
+
+def _discard_link(links: dict[int, dict[Link, object]], row: int, link: Link) -> None:
+    row_links = links.get(row)
+
+    if row_links is None:
+        return
+
+    row_links.pop(link, None)
+
+    if not row_links:
+        del links[row]
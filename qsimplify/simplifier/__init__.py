@@ -1,4 +1,16 @@
 from qsimplify.simplifier.graph_mappings import GraphMappings as GraphMappings
+from qsimplify.simplifier.optimization_level import OptimizationLevel as OptimizationLevel
 from qsimplify.simplifier.rule_parser import RuleParser as RuleParser
+from qsimplify.simplifier.rule_scheduler import RuleScheduler as RuleScheduler
+from qsimplify.simplifier.simplification_result import SimplificationResult as SimplificationResult
 from qsimplify.simplifier.simplification_rule import SimplificationRule as SimplificationRule
+from qsimplify.simplifier.simplification_statistics import RuleStatistics as RuleStatistics
+from qsimplify.simplifier.simplification_statistics import (
+    SimplificationStatistics as SimplificationStatistics,
+)
+from qsimplify.simplifier.simplification_trace import CandidateEvent as CandidateEvent
+from qsimplify.simplifier.simplification_trace import MatchEvent as MatchEvent
+from qsimplify.simplifier.simplification_trace import PermutationEvent as PermutationEvent
+from qsimplify.simplifier.simplification_trace import ReplacementEvent as ReplacementEvent
+from qsimplify.simplifier.simplification_trace import TraceEvent as TraceEvent
 from qsimplify.simplifier.simplifier import Simplifier as Simplifier
@@ -0,0 +1,55 @@
+from qsimplify.model import Position, QuantumGraph, graph_cleaner
+
+
+def append_columns(graph: QuantumGraph, columns: QuantumGraph) -> None:
+    """Copy every column of another graph after the last column of a graph, keeping their rows.
+
+    The graph is filled afterwards, but not cleaned up.
+    """
+    offset = graph.width
+    _copy_columns(columns, graph, 0, columns.width, offset)
+    graph_cleaner.fill(graph)
+
+
+def split_columns(graph: QuantumGraph, column: int) -> tuple[QuantumGraph, QuantumGraph]:
+    """Split a graph into the columns on the left of a column, and the rest of them.
+
+    Both graphs keep the rows of the original graph, and their first column is 0.
+    """
+    left = QuantumGraph()
+    right = QuantumGraph()
+    _copy_columns(graph, left, 0, column, 0)
+    _copy_columns(graph, right, column, graph.width, -column)
+
+    graph_cleaner.fill(left)
+    graph_cleaner.fill(right)
+    return left, right
+
+
+def _copy_columns(
+    source: QuantumGraph, target: QuantumGraph, start: int, end: int, offset: int
+) -> None:
+    """Copy the nodes of some columns and their non-positional edges, moving them by an offset."""
+    for row in range(source.height):
+        for column in range(start, end):
+            attributes = source.node_attributes(Position(row, column))
+
+            if attributes is None:
+                continue
+
+            name, angle, bit = attributes
+            target.add_node(name, Position(row, column + offset), angle, bit)
+
+    for row in range(source.height):
+        for column in range(start, end):
+            position = Position(row, column)
+
+            if not source.has_node_at(position):
+                continue
+
+            for edge_name, end_position in source.iter_node_links(position):
+                if edge_name.is_positional():
+                    continue
+
+                new_end = Position(end_position.row, end_position.column + offset)
+                target.add_edge(edge_name, Position(row, column + offset), new_end)
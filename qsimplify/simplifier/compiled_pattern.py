@@ -0,0 +1,197 @@
+import itertools
+from collections import Counter
+from dataclasses import dataclass
+
+from qsimplify.model import EdgeName, GateName, GraphNode, Position, QuantumGraph
+
+MAX_SYMMETRY_HEIGHT = 6
+
+
+@dataclass(frozen=True, slots=True)
+class PatternCell:
+    """A node of a compiled pattern.
+
+    Attributes:
+        name: The name of the gate.
+        angle: The rotation angle of the gate, if any.
+        bit: The classical bit of the gate, if any.
+        links: The non-positional edges that start on this node, as (name, row, column) tuples.
+
+    """
+
+    name: GateName
+    angle: float | None
+    bit: int | None
+    links: tuple[tuple[EdgeName, int, int], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledPattern:
+    """A description of a pattern that can be compared against a graph without building any subgraphs.
+
+    Attributes:
+        width: The number of columns in the pattern.
+        height: The number of rows in the pattern.
+        start: The first node of the pattern's first column, where every match starts.
+        cells: The nodes of the pattern, row by row.
+        mask: Whether each position of the pattern must be a real gate, row by row.
+            Identities are skipped while looking for those gates in a graph.
+        can_match: Whether the pattern can be found at all. Patterns with missing nodes, empty rows or
+            empty columns never match, because the windows extracted from a graph are always cleaned up.
+        has_measures: Whether the pattern has measurement gates, which need their bits to be compared.
+        symmetries: The row permutations that map the pattern onto itself, other than the identity.
+            Symmetric gates like CZ, CCZ and SWAP make row orderings equivalent,
+            and only the first ordering of each equivalence class needs to be compared against a graph.
+        required_gates: How many nodes of each gate, other than identities, a graph needs to contain the pattern.
+
+    """
+
+    width: int
+    height: int
+    start: GraphNode
+    cells: tuple[tuple[PatternCell | None, ...], ...]
+    mask: tuple[bool, ...]
+    can_match: bool
+    has_measures: bool
+    symmetries: tuple[tuple[int, ...], ...] = ()
+    required_gates: tuple[tuple[GateName, int], ...] = ()
+
+    def can_be_identity(self, row: int, column: int) -> bool:
+        """Check whether an identity in the graph can take the place of a position of the pattern."""
+        return not self.mask[row * self.width + column]
+
+    def is_first_ordering(self, rows: list[int]) -> bool:
+        """Check whether no symmetry of the pattern turns a row ordering into an earlier one."""
+        return all(
+            tuple(rows) <= tuple(rows[row] for row in symmetry) for symmetry in self.symmetries
+        )
+
+
+def compile_pattern(
+    pattern: QuantumGraph, mask: dict[Position, bool] | None = None
+) -> CompiledPattern:
+    """Compile a pattern, so it can be compared quickly against many windows of a graph.
+
+    The mask must have a value for every position of the pattern. If it's missing, identities are never skipped.
+    """
+    width = pattern.width
+    height = pattern.height
+    start = _find_start(pattern, height)
+    cells = tuple(
+        tuple(_compile_cell(pattern, Position(row, column)) for column in range(width))
+        for row in range(height)
+    )
+    flat_cells = [cell for row in cells for cell in row]
+
+    is_complete = None not in flat_cells
+    has_empty_rows = any(_is_empty(row) for row in cells)
+    has_empty_columns = any(_is_empty(column) for column in zip(*cells, strict=True))
+    has_measures = any(cell is not None and cell.name == GateName.MEASURE for cell in flat_cells)
+
+    if mask is None:
+        flat_mask = (True,) * (width * height)
+    else:
+        flat_mask = tuple(
+            mask[Position(row, column)] for row in range(height) for column in range(width)
+        )
+
+    return CompiledPattern(
+        width=width,
+        height=height,
+        start=start,
+        cells=cells,
+        mask=flat_mask,
+        can_match=height > 0 and is_complete and not has_empty_rows and not has_empty_columns,
+        has_measures=has_measures,
+        symmetries=_find_symmetries(cells, flat_mask, start.position.row),
+        required_gates=_count_required_gates(flat_cells),
+    )
+
+
+def _find_start(pattern: QuantumGraph, height: int) -> GraphNode:
+    for row in range(height):
+        potential_start = pattern[Position(row, 0)]
+
+        if potential_start is not None:
+            return potential_start
+
+    raise ValueError("Invalid pattern")
+
+
+def _find_symmetries(
+    cells: tuple[tuple[PatternCell | None, ...], ...], mask: tuple[bool, ...], start_row: int
+) -> tuple[tuple[int, ...], ...]:
+    """Find the row permutations that map every row onto an equivalent one.
+
+    A permutation maps row i onto row permutation[i], along with the rows of the edges that start on it.
+    The start row can only be moved onto a row linked to it in the first column, like the other qubit of a CZ
+    or a SWAP, because linked nodes share a column in a clean graph, so the equivalent ordering is found
+    from another start node on the same column.
+    Patterns taller than MAX_SYMMETRY_HEIGHT are never considered symmetric, to avoid trying too many permutations.
+    """
+    height = len(cells)
+
+    if height < 2 or height > MAX_SYMMETRY_HEIGHT or None in itertools.chain(*cells):
+        return ()
+
+    width = len(cells[0])
+    start_rows = {start_row} | {row for _, row, column in cells[start_row][0].links if column == 0}
+    symmetries = []
+
+    for permuted_rows in itertools.permutations(range(height)):
+        permutation = list(permuted_rows)
+
+        if permutation == list(range(height)) or permutation[start_row] not in start_rows:
+            continue
+
+        is_symmetry = all(
+            mask[row * width + column] == mask[permutation[row] * width + column]
+            and _are_cells_equivalent(
+                cells[row][column], cells[permutation[row]][column], permutation
+            )
+            for row in range(height)
+            for column in range(width)
+        )
+
+        if is_symmetry:
+            symmetries.append(tuple(permutation))
+
+    return tuple(symmetries)
+
+
+def _are_cells_equivalent(cell: PatternCell, other: PatternCell, permutation: list[int]) -> bool:
+    permuted_links = {
+        (edge_name, permutation[row], column) for edge_name, row, column in cell.links
+    }
+
+    return (
+        cell.name == other.name
+        and cell.angle == other.angle
+        and cell.bit == other.bit
+        and permuted_links == set(other.links)
+    )
+
+
+def _count_required_gates(cells: list[PatternCell | None]) -> tuple[tuple[GateName, int], ...]:
+    counts = Counter(cell.name for cell in cells if cell is not None and cell.name != GateName.ID)
+    return tuple(sorted(counts.items(), key=lambda item: item[0].value))
+
+
+def _compile_cell(pattern: QuantumGraph, position: Position) -> PatternCell | None:
+    attributes = pattern.node_attributes(position)
+
+    if attributes is None:
+        return None
+
+    name, angle, bit = attributes
+    links = tuple(
+        (edge_name, end.row, end.column)
+        for edge_name, end in pattern.iter_node_links(position)
+        if not edge_name.is_positional()
+    )
+
+    return PatternCell(name, angle, bit, links)
+
+
+def _is_empty(cells: tuple[PatternCell | None, ...]) -> bool:
+    return all(cell is None or cell.name == GateName.ID for cell in cells)
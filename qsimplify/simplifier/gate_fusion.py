@@ -0,0 +1,277 @@
+import math
+
+import numpy
+
+from qsimplify import math_utils
+from qsimplify.model import GateName, GraphNode, Position, QuantumGraph, graph_cleaner
+
+FusedGate = tuple[GateName, float | None]
+
+_SQRT_HALF = 1 / math.sqrt(2)
+_FIXED_MATRICES = {
+    GateName.X: numpy.array([[0, 1], [1, 0]], dtype=complex),
+    GateName.Y: numpy.array([[0, -1j], [1j, 0]], dtype=complex),
+    GateName.Z: numpy.array([[1, 0], [0, -1]], dtype=complex),
+    GateName.H: numpy.array([[1, 1], [1, -1]], dtype=complex) * _SQRT_HALF,
+    GateName.S: numpy.array([[1, 0], [0, 1j]], dtype=complex),
+    GateName.SDG: numpy.array([[1, 0], [0, -1j]], dtype=complex),
+    GateName.T: numpy.array([[1, 0], [0, numpy.exp(1j * numpy.pi / 4)]], dtype=complex),
+    GateName.TDG: numpy.array([[1, 0], [0, numpy.exp(-1j * numpy.pi / 4)]], dtype=complex),
+    GateName.SX: numpy.array([[1 + 1j, 1 - 1j], [1 - 1j, 1 + 1j]], dtype=complex) / 2,
+    GateName.SY: numpy.array([[1 + 1j, -1 - 1j], [1 + 1j, 1 + 1j]], dtype=complex) / 2,
+}
+_FIXED_NAMES = list(_FIXED_MATRICES)
+_FIXED_STACK = numpy.stack(list(_FIXED_MATRICES.values()))
+_IDENTITY = numpy.eye(2, dtype=complex)
+_IDENTITY_INDEX = -1
+_NO_FIXED_GATE_INDEX = -2
+_TOLERANCE = 1e-8
+_ROTATION_BASIS_CHANGES = {
+    GateName.RZ: _IDENTITY,
+    GateName.RX: _FIXED_MATRICES[GateName.H],
+    GateName.RY: _FIXED_MATRICES[GateName.S] @ _FIXED_MATRICES[GateName.H],
+}
+
+
+def fuse_single_qubit_gates(graph: QuantumGraph) -> int:
+    """Replace each run of single-qubit gates on a row with the shortest equivalent sequence of gates.
+
+    Runs can have identities in between, but no measurements or multi-qubit gates.
+    Gates are only equivalent up to a global phase, and runs are only replaced by strictly shorter sequences.
+    The replaced gates are kept on the same positions of the run, and the rest of the run is filled with identities.
+    Returns the number of replaced runs. The graph is filled afterwards, but not cleaned up.
+    """
+    runs = _find_runs(graph)
+
+    if len(runs) == 0:
+        return 0
+
+    replaced_runs = 0
+
+    for run, unitary in zip(runs, _multiply_runs(runs), strict=True):
+        gates = synthesize_unitary(unitary)
+
+        if len(gates) >= len(run):
+            continue
+
+        for node in run:
+            graph.remove_node(node.position)
+
+        for index, node in enumerate(run):
+            name, angle = gates[index] if index < len(gates) else (GateName.ID, None)
+            graph.add_node(name, node.position, angle=angle)
+
+        replaced_runs += 1
+
+    if replaced_runs > 0:
+        graph_cleaner.fill(graph)
+
+    return replaced_runs
+
+
+def _find_runs(graph: QuantumGraph) -> list[list[GraphNode]]:
+    """Find every sequence of at least two single-qubit gates that aren't interrupted by other gates."""
+    runs = []
+
+    for row in range(graph.height):
+        run: list[GraphNode] = []
+
+        for column in range(graph.width):
+            node = graph[Position(row, column)]
+
+            if node is None or node.name == GateName.ID:
+                continue
+
+            if _is_single_qubit_unitary(node.name):
+                run.append(node)
+                continue
+
+            if len(run) > 1:
+                runs.append(run)
+
+            run = []
+
+        if len(run) > 1:
+            runs.append(run)
+
+    return runs
+
+
+def _is_single_qubit_unitary(name: GateName) -> bool:
+    return name.number_of_qubits() == 1 and name != GateName.MEASURE
+
+
+def _multiply_runs(runs: list[list[GraphNode]]) -> numpy.ndarray:
+    """Multiply the matrices of the gates in each run, handling all the runs at once."""
+    longest_run = max(len(run) for run in runs)
+    matrices = numpy.tile(_IDENTITY, (len(runs), longest_run, 1, 1))
+
+    for run_index, run in enumerate(runs):
+        for gate_index, node in enumerate(run):
+            matrices[run_index, gate_index] = gate_matrix(node.name, node.angle)
+
+    products = numpy.tile(_IDENTITY, (len(runs), 1, 1))
+
+    for gate_index in range(longest_run):
+        products = numpy.matmul(matrices[:, gate_index], products)
+
+    return products
+
+
+def gate_matrix(name: GateName, angle: float | None = None) -> numpy.ndarray:
+    """Get the unitary matrix of a single-qubit gate."""
+    match name:
+        case GateName.ID:
+            return _IDENTITY
+        case GateName.P:
+            return numpy.array([[1, 0], [0, numpy.exp(1j * angle)]], dtype=complex)
+        case GateName.RX:
+            cos, sin = math.cos(angle / 2), math.sin(angle / 2)
+            return numpy.array([[cos, -1j * sin], [-1j * sin, cos]], dtype=complex)
+        case GateName.RY:
+            cos, sin = math.cos(angle / 2), math.sin(angle / 2)
+            return numpy.array([[cos, -sin], [sin, cos]], dtype=complex)
+        case GateName.RZ:
+            phase = numpy.exp(1j * angle / 2)
+            return numpy.array([[1 / phase, 0], [0, phase]], dtype=complex)
+        case _ if name in _FIXED_MATRICES:
+            return _FIXED_MATRICES[name]
+        case _:
+            raise ValueError(f"{name} is not a single-qubit unitary gate")
+
+
+def synthesize_unitary(unitary: numpy.ndarray) -> list[FusedGate]:
+    """Find a short sequence of gates equivalent to a single-qubit unitary, up to a global phase.
+
+    Single gates are tried first, then pairs made of a fixed gate and any other gate, preferring pairs of fixed gates.
+    Any other unitary is built with at most three rotations.
+    """
+    if _find_equivalent_fixed_gates(unitary[numpy.newaxis])[0] == _IDENTITY_INDEX:
+        return []
+
+    single_gate = _find_single_gates(unitary[numpy.newaxis])[0]
+
+    if single_gate is not None:
+        return [single_gate]
+
+    # Each fixed gate F is tried as both the first and the last gate, so the other gate is U F^-1 or F^-1 U
+    adjoints = _FIXED_STACK.conj().transpose(0, 2, 1)
+    remainders = numpy.concatenate([unitary @ adjoints, adjoints @ unitary])
+    fixed_indices = _find_equivalent_fixed_gates(remainders)
+    fixed_count = len(_FIXED_NAMES)
+
+    for allow_rotations in (False, True):
+        other_gates = _find_single_gates(remainders, fixed_indices, allow_rotations)
+
+        for fixed_index in range(fixed_count):
+            fixed_gate = (_FIXED_NAMES[fixed_index], None)
+
+            if other_gates[fixed_index] is not None:
+                return [fixed_gate, other_gates[fixed_index]]
+
+            if other_gates[fixed_count + fixed_index] is not None:
+                return [other_gates[fixed_count + fixed_index], fixed_gate]
+
+    first_z_angle, y_angle, second_z_angle = _decompose_zyz(unitary)
+    rotations = [
+        (GateName.RZ, second_z_angle),
+        (GateName.RY, y_angle),
+        (GateName.RZ, first_z_angle),
+    ]
+
+    return [_simplify_rotation(name, angle) for name, angle in rotations if not _is_zero(angle)]
+
+
+def _find_single_gates(
+    unitaries: numpy.ndarray,
+    fixed_indices: numpy.ndarray | None = None,
+    allow_rotations: bool = True,
+) -> list[FusedGate | None]:
+    """Find a single gate (other than the identity) equivalent to each unitary, if there's one."""
+    if fixed_indices is None:
+        fixed_indices = _find_equivalent_fixed_gates(unitaries)
+
+    gates: list[FusedGate | None] = [
+        (_FIXED_NAMES[index], None) if index > _IDENTITY_INDEX else None for index in fixed_indices
+    ]
+
+    if not allow_rotations:
+        return gates
+
+    for name, basis_change in _ROTATION_BASIS_CHANGES.items():
+        angles = _find_z_rotation_angles(basis_change.conj().T @ unitaries @ basis_change)
+
+        for index, angle in enumerate(angles):
+            is_identity = fixed_indices[index] == _IDENTITY_INDEX
+
+            if gates[index] is None and not is_identity and angle is not None:
+                gates[index] = (name, angle)
+
+    return gates
+
+
+def _find_equivalent_fixed_gates(unitaries: numpy.ndarray) -> numpy.ndarray:
+    """Find the index of the fixed gate equivalent to each unitary, up to a global phase.
+
+    The identity has the index -1, and unitaries without any equivalent fixed gate have the index -2.
+    """
+    candidates = numpy.concatenate([_IDENTITY[numpy.newaxis], _FIXED_STACK])
+    overlaps = numpy.einsum("kij,nij->nk", candidates.conj(), unitaries)
+    magnitudes = numpy.abs(overlaps)
+    phases = numpy.divide(
+        overlaps, magnitudes, out=numpy.zeros_like(overlaps), where=magnitudes > _TOLERANCE
+    )
+    aligned_candidates = phases[:, :, numpy.newaxis, numpy.newaxis] * candidates
+    differences = unitaries[:, numpy.newaxis] - aligned_candidates
+    matches = numpy.abs(differences).max(axis=(2, 3)) < _TOLERANCE
+
+    return numpy.where(matches.any(axis=1), matches.argmax(axis=1) - 1, _NO_FIXED_GATE_INDEX)
+
+
+def _find_z_rotation_angles(unitaries: numpy.ndarray) -> list[float | None]:
+    """Find the angle of the Z rotation equivalent to each unitary, if it's diagonal."""
+    is_diagonal = (numpy.abs(unitaries[:, 0, 1]) < _TOLERANCE) & (
+        numpy.abs(unitaries[:, 1, 0]) < _TOLERANCE
+    )
+    angles = numpy.angle(unitaries[:, 1, 1]) - numpy.angle(unitaries[:, 0, 0])
+
+    return [
+        _reduce_angle(angle) if diagonal else None
+        for angle, diagonal in zip(angles, is_diagonal, strict=True)
+    ]
+
+
+def _decompose_zyz(unitary: numpy.ndarray) -> tuple[float, float, float]:
+    """Find the angles of RZ(first) * RY(y) * RZ(second), equivalent to a unitary up to a global phase."""
+    special_unitary = unitary / numpy.sqrt(numpy.linalg.det(unitary))
+    y_angle = 2 * math.atan2(abs(special_unitary[1, 0]), abs(special_unitary[0, 0]))
+    angle_sum = 0.0
+    angle_difference = 0.0
+
+    if not _is_zero(abs(special_unitary[1, 1])):
+        angle_sum = 2 * numpy.angle(special_unitary[1, 1])
+
+    if not _is_zero(abs(special_unitary[1, 0])):
+        angle_difference = 2 * numpy.angle(special_unitary[1, 0])
+
+    first_angle = _reduce_angle((angle_sum + angle_difference) / 2)
+    second_angle = _reduce_angle((angle_sum - angle_difference) / 2)
+    return first_angle, _reduce_angle(y_angle), second_angle
+
+
+def _simplify_rotation(name: GateName, angle: float) -> FusedGate:
+    index = _find_equivalent_fixed_gates(gate_matrix(name, angle)[numpy.newaxis])[0]
+
+    if index > _IDENTITY_INDEX:
+        return _FIXED_NAMES[index], None
+
+    return name, angle
+
+
+def _reduce_angle(angle: float) -> float:
+    """Get an equivalent angle in [-pi, pi], since rotations by 2pi only change the global phase."""
+    return math.remainder(float(angle), 2 * math.pi)
+
+
+def _is_zero(value: float) -> bool:
+    return math_utils.are_floats_similar(value, 0)
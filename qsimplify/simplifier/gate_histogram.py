@@ -0,0 +1,29 @@
+from collections import Counter
+from typing import Iterable
+
+from qsimplify.model import GateName, QuantumGraph
+from qsimplify.simplifier.compiled_pattern import CompiledPattern
+
+
+class GateHistogram:
+    """Counts the nodes of each gate in a graph, to rule out patterns without searching for them.
+
+    Identities are never counted, since patterns don't need any.
+    """
+
+    def __init__(self, graph: QuantumGraph) -> None:
+        """Count the gates of a graph."""
+        self._counts = Counter(node.name for node in graph if node.name != GateName.ID)
+
+    def can_contain(self, pattern: CompiledPattern) -> bool:
+        """Check whether the graph has enough gates of each kind for the pattern to be in it."""
+        return all(self._counts[name] >= count for name, count in pattern.required_gates)
+
+    def replace(self, removed: Iterable[GateName], added: Iterable[GateName]) -> None:
+        """Update the counts after some nodes of the graph are replaced."""
+        self._counts.subtract(name for name in removed if name != GateName.ID)
+        self._counts.update(name for name in added if name != GateName.ID)
+
+    def __getitem__(self, name: GateName) -> int:
+        """Get the number of nodes of a gate."""
+        return self._counts[name]
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import heapq
+from typing import Iterator
+
+from qsimplify.model import Position, QuantumGraph
+from qsimplify.simplifier.graph_mappings import GraphMappings
+
+
+class MatchWorklist:
+    """Keeps track of the positions that still have to be checked while searching for a pattern.
+
+    Positions are visited in the same order as QuantumGraph.iter_positions_by_row.
+    Everything before the frontier is known to not match, except for the dirty positions,
+    which were touched (directly or through their neighbours) by a replacement and must be checked again.
+    When the initial positions are known, nothing else can match, so only they and the dirty positions are visited.
+    """
+
+    def __init__(
+        self,
+        pattern_width: int,
+        pattern_height: int,
+        initial_positions: list[Position] | None = None,
+        is_graph_clean: bool = False,
+    ) -> None:
+        """Create a worklist for a pattern with the given dimensions, starting from the top-left corner.
+
+        If the initial positions are known (sorted row by row), only those will be visited, along with the regions
+        marked by later replacements. If the graph isn't known to be clean, the first replacement may clean up
+        the whole graph, so the search restarts from scratch over every position.
+        """
+        self._pattern_width = pattern_width
+        self._pattern_height = pattern_height
+        self._initial_positions = initial_positions
+        self._next_initial = 0
+        self._frontier = (0, 0)
+        self._dirty: list[tuple[int, int]] = []
+        self._dirty_set: set[tuple[int, int]] = set()
+        self._is_graph_clean = is_graph_clean
+
+    @classmethod
+    def after_search(
+        cls, pattern_width: int, pattern_height: int, graph: QuantumGraph
+    ) -> MatchWorklist:
+        """Create a worklist for a pattern that is known to not match anywhere in a clean graph.
+
+        Only the regions marked by later replacements will be visited.
+        """
+        worklist = cls(pattern_width, pattern_height)
+        worklist._frontier = (graph.height, 0)
+        worklist._is_graph_clean = True
+        return worklist
+
+    def iter_candidates(self, graph: QuantumGraph) -> Iterator[Position]:
+        """Iterate over the positions that may contain the start of a match, in row by row order.
+
+        The graph must not be modified while iterating.
+        """
+        if self._initial_positions is not None:
+            yield from self._iter_initial_positions(graph, self._initial_positions)
+            return
+
+        while self._dirty:
+            dirty_position = heapq.heappop(self._dirty)
+            self._dirty_set.discard(dirty_position)
+            position = Position(*dirty_position)
+
+            if graph.has_node_at(position):
+                yield position
+
+        start_row, start_column = self._frontier
+        width = graph.width
+
+        for row in range(start_row, graph.height):
+            for column in range(start_column if row == start_row else 0, width):
+                self._frontier = (row, column)
+                position = Position(row, column)
+
+                if graph.has_node_at(position):
+                    yield position
+
+        self._frontier = (graph.height, 0)
+
+    def _iter_initial_positions(
+        self, graph: QuantumGraph, initial_positions: list[Position]
+    ) -> Iterator[Position]:
+        """Merge the remaining initial positions with the dirty ones, visiting each position once."""
+        while self._next_initial < len(initial_positions) or self._dirty:
+            initial = None
+
+            if self._next_initial < len(initial_positions):
+                initial = initial_positions[self._next_initial]
+
+            if initial is not None and (not self._dirty or tuple(initial) < self._dirty[0]):
+                position = initial
+                self._next_initial += 1
+            else:
+                dirty_position = heapq.heappop(self._dirty)
+                self._dirty_set.discard(dirty_position)
+                position = Position(*dirty_position)
+
+                if position == initial:
+                    self._next_initial += 1
+
+            if graph.has_node_at(position):
+                yield position
+
+    def update(
+        self,
+        graph: QuantumGraph,
+        mappings: GraphMappings,
+        old_width: int,
+        old_height: int,
+    ) -> None:
+        """Mark the region touched by a replacement as dirty.
+
+        The graph must have been cleaned up after the replacement.
+        If the graph wasn't known to be clean, the first replacement may have cleaned up the whole graph,
+        so the search restarts from scratch. The same happens when a row is removed,
+        because every position below it is shifted.
+        """
+        if not self._is_graph_clean or graph.height != old_height:
+            self._is_graph_clean = True
+            self._initial_positions = None
+            self._frontier = (0, 0)
+            self._dirty.clear()
+            self._dirty_set.clear()
+            return
+
+        changed_rows = {position.row for position in mappings}
+        changed_columns = [position.column for position in mappings]
+        first_column = min(changed_columns)
+        last_column = max(changed_columns)
+        removed_columns = old_width - graph.width
+
+        if removed_columns > 0:
+            changed_rows = set(range(graph.height))
+            self._shift_columns(first_column, last_column, removed_columns)
+
+        # When every changed column was removed, the region collapses into the seam between its neighbours
+        last_column = max(last_column - removed_columns, first_column - 1)
+        left_column = self._find_leftmost_affected_column(graph, changed_rows, first_column)
+        region_rows = changed_rows if self._pattern_height == 1 else range(graph.height)
+
+        for row in region_rows:
+            for column in range(left_column, min(last_column, graph.width - 1) + 1):
+                self._mark_dirty((row, column))
+
+    def _shift_columns(self, first_column: int, last_column: int, removed_columns: int) -> None:
+        """Adjust the tracked positions after some columns inside [first_column, last_column] were removed.
+
+        Positions inside that range are dropped, because they become part of the dirty region anyway.
+        """
+        if self._initial_positions is not None:
+            self._initial_positions = [
+                Position(position.row, position.column - removed_columns)
+                if position.column > last_column
+                else position
+                for position in self._initial_positions[self._next_initial :]
+                if not first_column <= position.column <= last_column
+            ]
+            self._next_initial = 0
+
+        shifted = []
+
+        for row, column in self._dirty:
+            if column > last_column:
+                shifted.append((row, column - removed_columns))
+            elif column < first_column:
+                shifted.append((row, column))
+
+        heapq.heapify(shifted)
+        self._dirty = shifted
+        self._dirty_set = set(shifted)
+
+        frontier_row, frontier_column = self._frontier
+
+        if frontier_column > last_column:
+            self._frontier = (frontier_row, frontier_column - removed_columns)
+        elif frontier_column >= first_column:
+            self._frontier = (frontier_row, first_column)
+
+    def _find_leftmost_affected_column(
+        self, graph: QuantumGraph, changed_rows: set[int], first_column: int
+    ) -> int:
+        """Find the leftmost column where a match could start and still reach the changed region.
+
+        A match consumes exactly one node per pattern column and can only skip identities,
+        so it can't reach the changed region if there are too many gates in the way.
+        """
+        left_column = first_column
+
+        for row in changed_rows:
+            gates_found = 0
+            column = first_column - 1
+
+            while column >= 0:
+                if graph.is_occupied(Position(row, column)):
+                    gates_found += 1
+
+                    if gates_found == self._pattern_width:
+                        break
+
+                column -= 1
+
+            left_column = min(left_column, column + 1)
+
+        return left_column
+
+    def _mark_dirty(self, position: tuple[int, int]) -> None:
+        """Mark a position to be checked again, unless the frontier will reach it anyway.
+
+        The initial positions only cover the nodes that could match before the replacement,
+        so every changed position is marked when they are known.
+        """
+        is_ahead = self._initial_positions is None and position >= self._frontier
+
+        if is_ahead or position in self._dirty_set:
+            return
+
+        self._dirty_set.add(position)
+        heapq.heappush(self._dirty, position)
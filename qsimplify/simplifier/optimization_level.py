@@ -0,0 +1,22 @@
+from enum import IntEnum
+
+
+class OptimizationLevel(IntEnum):
+    """Preset amounts of effort to spend simplifying a graph, like the optimization levels of a compiler.
+
+    The costs are given for a graph with n nodes, h rows, r rules and m replacements. Searching for a rule checks
+    every node at most once per pass, plus the nodes around each replacement. Every replacement cleans up the
+    columns it changed in O(h), after looking for a gate on each row it changed, which usually stops early.
+    If one of those rows is empty, the whole graph is cleaned up in O(n) instead.
+    Patterns have at most 3 rows, so there are only a few row orderings per node.
+    """
+
+    NONE = 0
+    """Only clean up the graph, without searching for any rule. O(n), plus O(n) for every removed row."""
+    SINGLE_QUBIT = 1
+    """A single pass of the default rules that only use one qubit, such as cancellations. O(r * n + m * h)."""
+    DEFAULT = 2
+    """A single pass of every default rule. O(r * n + m * h)."""
+    FULL = 3
+    """Gate fusion, rotation merging and the default rules, until the graph stops changing.
+    Each pass is O(r * n + m * h), and there are at most MAX_FIXPOINT_ITERATIONS passes."""
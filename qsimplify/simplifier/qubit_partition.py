@@ -0,0 +1,108 @@
+from qsimplify.model import Position, QuantumGraph, graph_cleaner
+
+
+def find_qubit_partitions(graph: QuantumGraph) -> list[list[int]]:
+    """Group the rows of a graph into sets of qubits that never interact with each other.
+
+    Two rows interact when any multi-qubit gate spans both of them, or when both write the same classical bit,
+    since simplifying them apart could change which measurement writes it last.
+    Each partition is sorted, and partitions are sorted by their first row.
+    """
+    parents = list(range(graph.height))
+    bit_rows: dict[int, int] = {}
+
+    for position in graph.iter_positions_by_row():
+        for edge_name, end in graph.iter_node_links(position):
+            if not edge_name.is_positional():
+                _join_rows(parents, position.row, end.row)
+
+        bit = graph.node_attributes(position)[2]
+
+        if bit is not None:
+            _join_rows(parents, position.row, bit_rows.setdefault(bit, position.row))
+
+    partitions: dict[int, list[int]] = {}
+
+    for row in range(graph.height):
+        partitions.setdefault(_find_root(parents, row), []).append(row)
+
+    return list(partitions.values())
+
+
+def _join_rows(parents: list[int], first_row: int, second_row: int) -> None:
+    first_root = _find_root(parents, first_row)
+    second_root = _find_root(parents, second_row)
+
+    if first_root != second_root:
+        parents[max(first_root, second_root)] = min(first_root, second_root)
+
+
+def _find_root(parents: list[int], row: int) -> int:
+    while parents[row] != row:
+        parents[row] = parents[parents[row]]
+        row = parents[row]
+
+    return row
+
+
+def extract_partition(graph: QuantumGraph, rows: list[int]) -> QuantumGraph:
+    """Copy some rows of a graph into a new graph, keeping their columns and their relative order.
+
+    The rows must not have any multi-qubit gates that reach outside of them.
+    The new graph has the same type as the original one.
+    """
+    partition = type(graph)()
+    new_rows = {row: new_row for new_row, row in enumerate(rows)}
+
+    for new_row, row in enumerate(rows):
+        for column in range(graph.width):
+            position = Position(row, column)
+            attributes = graph.node_attributes(position)
+
+            if attributes is None:
+                continue
+
+            name, angle, bit = attributes
+            partition.add_node(name, Position(new_row, column), angle, bit)
+
+    for new_row, row in enumerate(rows):
+        for column in range(graph.width):
+            position = Position(row, column)
+
+            if not graph.has_node_at(position):
+                continue
+
+            for edge_name, end in graph.iter_node_links(position):
+                if edge_name.is_positional():
+                    continue
+
+                new_end = Position(new_rows[end.row], end.column)
+                partition.add_edge(edge_name, Position(new_row, column), new_end)
+
+    graph_cleaner.fill(partition)
+    return partition
+
+
+def merge_partitions(partitions: list[tuple[list[int], QuantumGraph]]) -> QuantumGraph:
+    """Put together graphs extracted from the provided rows of a larger graph, and clean up the result.
+
+    The graphs must keep all of their rows, even if they are empty, so each one can be placed back on its original rows.
+    The result has the same type as the first graph.
+    """
+    result = type(partitions[0][1])() if partitions else QuantumGraph()
+
+    for rows, partition in partitions:
+        for node in partition:
+            position = Position(rows[node.position.row], node.position.column)
+            result.add_node(node.name, position, node.angle, node.bit)
+
+        for edge in partition.iter_edges():
+            if edge.name.is_positional():
+                continue
+
+            start = Position(rows[edge.start.position.row], edge.start.position.column)
+            end = Position(rows[edge.end.position.row], edge.end.position.column)
+            result.add_edge(edge.name, start, end)
+
+    graph_cleaner.clean_and_fill(result)
+    return result
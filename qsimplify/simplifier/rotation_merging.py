@@ -0,0 +1,140 @@
+import math
+
+from qsimplify import math_utils
+from qsimplify.model import EdgeName, GateName, Position, QuantumGraph, graph_cleaner
+
+_MERGEABLE_GATES = {GateName.RX, GateName.RY, GateName.RZ, GateName.P}
+
+
+def merge_rotations(graph: QuantumGraph) -> int:
+    """Merge chains of rotations and phase gates by adding up their angles, in a single sweep over the graph.
+
+    Consecutive RX, RY, RZ or P gates of the same type on a row are merged, even with identities in between.
+    Consecutive CP gates on the same pair of rows are merged too, whichever row is the control.
+    The merged gate stays on the position of the first gate of the chain.
+    Afterwards, every rotation or phase gate whose angle adds up to a full cycle is removed.
+    Returns the number of removed gates, counting each CP gate once. The graph is filled afterwards, but not cleaned up.
+    """
+    # The last gate seen on each row, since the gates on its left can't be merged anymore
+    last_positions: dict[int, Position] = {}
+    removed_gates = 0
+
+    for column in range(graph.width):
+        for row in range(graph.height):
+            position = Position(row, column)
+            attributes = graph.node_attributes(position)
+
+            if attributes is None or attributes[0] == GateName.ID:
+                continue
+
+            name, angle, _ = attributes
+
+            if name in _MERGEABLE_GATES:
+                removed_gates += _merge_single_gate(graph, last_positions, position, name, angle)
+            elif name == GateName.CP:
+                removed_gates += _merge_controlled_phase(graph, last_positions, position)
+            else:
+                last_positions[row] = position
+
+    for position in _find_zero_angle_gates(graph):
+        _clear_gate(graph, position)
+        removed_gates += 1
+
+    if removed_gates > 0:
+        graph_cleaner.fill(graph)
+
+    return removed_gates
+
+
+def _merge_single_gate(
+    graph: QuantumGraph,
+    last_positions: dict[int, Position],
+    position: Position,
+    name: GateName,
+    angle: float,
+) -> int:
+    last_position = last_positions.get(position.row)
+    last_attributes = graph.node_attributes(last_position) if last_position is not None else None
+
+    if last_attributes is None or last_attributes[0] != name:
+        last_positions[position.row] = position
+        return 0
+
+    graph.set_angle(last_position, last_attributes[1] + angle)
+    graph.clear_node(position)
+    return 1
+
+
+def _merge_controlled_phase(
+    graph: QuantumGraph, last_positions: dict[int, Position], position: Position
+) -> int:
+    partner = _find_partner(graph, position)
+
+    if partner.row < position.row:
+        # Both halves of the gate are handled when visiting the one on the upper row
+        return 0
+
+    last_position = last_positions.get(position.row)
+    last_partner = last_positions.get(partner.row)
+    is_mergeable = (
+        last_position is not None
+        and last_partner is not None
+        and graph.node_attributes(last_position)[0] == GateName.CP
+        and _find_partner(graph, last_position) == last_partner
+    )
+
+    if not is_mergeable:
+        last_positions[position.row] = position
+        last_positions[partner.row] = partner
+        return 0
+
+    last_target = _find_angle_holder(graph, last_position, last_partner)
+    target = _find_angle_holder(graph, position, partner)
+    _, last_angle, _ = graph.node_attributes(last_target)
+    _, angle, _ = graph.node_attributes(target)
+
+    graph.set_angle(last_target, last_angle + angle)
+    graph.clear_node(position)
+    graph.clear_node(partner)
+    return 1
+
+
+def _find_partner(graph: QuantumGraph, position: Position) -> Position:
+    """Find the other node of a two-qubit gate."""
+    for edge_name, end in graph.iter_node_links(position):
+        if edge_name in (EdgeName.TARGETS, EdgeName.CONTROLLED_BY):
+            return end
+
+    raise ValueError(f"The gate at {position} is missing its control or target")
+
+
+def _find_angle_holder(graph: QuantumGraph, first: Position, second: Position) -> Position:
+    """Find which of the two nodes of a CP gate stores its angle, which is the target."""
+    return first if graph.node_attributes(first)[1] is not None else second
+
+
+def _find_zero_angle_gates(graph: QuantumGraph) -> list[Position]:
+    """Find the rotations and phase gates that do nothing, because their angle is a full cycle."""
+    positions = []
+
+    for node in graph:
+        if not (node.name.is_rotation() or node.name.is_phase()) or node.angle is None:
+            continue
+
+        full_cycle = 2 * math.pi if node.name.is_phase() else 4 * math.pi
+        angle = graph_cleaner.normalize_node_angle(node.name, node.angle)
+
+        if math_utils.are_floats_similar(angle, 0) or math_utils.are_floats_similar(
+            angle, full_cycle
+        ):
+            positions.append(node.position)
+
+    return positions
+
+
+def _clear_gate(graph: QuantumGraph, position: Position) -> None:
+    """Replace a gate with identities, including the other node of a CP gate."""
+    if graph.node_attributes(position)[0] == GateName.CP:
+        graph.clear_node(_find_partner(graph, position))
+
+    graph.clear_node(position)
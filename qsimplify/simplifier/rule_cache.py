@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import tempfile
+from functools import cache
+from pathlib import Path
+
+from qsimplify.model import EdgeName, GateName, GraphNode, Position, QuantumGraph
+from qsimplify.simplifier.compiled_pattern import CompiledPattern, PatternCell
+from qsimplify.simplifier.rule_parser import RuleParser
+from qsimplify.simplifier.simplification_rule import SimplificationRule
+from qsimplify.utils import setup_logger
+
+# Increase it whenever parsing, compiling or encoding the rules changes, to invalidate the old caches.
+CACHE_VERSION = 5
+DEFAULT_RULES_PATH = Path(__file__).parent / "default_rules.json"
+
+_logger = setup_logger("RuleCache")
+
+
+@cache
+def load_default_rules() -> list[SimplificationRule]:
+    """Load the default rules once per process. The rules are shared, so they must not be modified."""
+    return load_rules_with_cache(DEFAULT_RULES_PATH)
+
+
+def get_cache_directory() -> Path:
+    """Get the directory of the compiled rules, which can be changed with the QSIMPLIFY_CACHE_DIR variable."""
+    return Path(os.getenv("QSIMPLIFY_CACHE_DIR", Path.home() / ".cache" / "qsimplify"))
+
+
+def load_rules_with_cache(
+    path: Path, cache_directory: Path | None = None
+) -> list[SimplificationRule]:
+    """Load the rules from a JSON file, reusing a previous compilation of the same file if possible.
+
+    Compiled rules are stored as JSON in the cache directory, under a name derived from the file's path,
+    the file's content and the cache version, so changing the rules or the version invalidates the cache.
+    Writing a new compilation of a file deletes the previous ones.
+    Problems with the cache are never fatal, the rules are parsed again instead.
+    """
+    if cache_directory is None:
+        cache_directory = get_cache_directory()
+
+    content = path.read_bytes()
+    prefix = f"rules-{hashlib.sha256(str(path.resolve()).encode()).hexdigest()[:16]}"
+    cache_path = cache_directory / f"{prefix}-{_compute_cache_key(content)}.json"
+    rules = _read_cache(cache_path)
+
+    if rules is not None:
+        return rules
+
+    rules = RuleParser().load_rules(content.decode())
+    _write_cache(cache_path, rules)
+    _remove_stale_entries(cache_path, prefix)
+    return rules
+
+
+def _compute_cache_key(content: bytes) -> str:
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    digest.update(content)
+    return digest.hexdigest()
+
+
+def _read_cache(cache_path: Path) -> list[SimplificationRule] | None:
+    try:
+        with cache_path.open("r") as file:
+            return [_decode_rule(rule_data) for rule_data in json.load(file)]
+    except FileNotFoundError:
+        return None
+    except Exception:
+        _logger.warning("Ignoring unreadable rule cache %s", cache_path, exc_info=True)
+        return None
+
+
+def _write_cache(cache_path: Path, rules: list[SimplificationRule]) -> None:
+    temporary_path = None
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile(
+            "w", dir=cache_path.parent, suffix=".tmp", delete=False
+        ) as file:
+            temporary_path = Path(file.name)
+            json.dump([_encode_rule(rule) for rule in rules], file)
+
+        temporary_path.replace(cache_path)
+    except (OSError, TypeError, ValueError):
+        _logger.debug("Couldn't write the rule cache %s", cache_path, exc_info=True)
+
+        if temporary_path is not None:
+            temporary_path.unlink(missing_ok=True)
+
+
+def _remove_stale_entries(cache_path: Path, prefix: str) -> None:
+    """Delete the previous compilations of the same rules file, leaving any other file in the directory alone."""
+    for stale_path in cache_path.parent.glob(f"{prefix}-*.json"):
+        if stale_path != cache_path:
+            try:
+                stale_path.unlink(missing_ok=True)
+            except OSError:
+                _logger.debug("Couldn't remove the rule cache %s", stale_path, exc_info=True)
+
+
+def _encode_rule(rule: SimplificationRule) -> dict:
+    compiled_pattern = rule.compiled_pattern
+
+    return {
+        "pattern": _encode_graph(rule.pattern),
+        "replacement": _encode_graph(rule.replacement),
+        "compiled_pattern": {
+            "width": compiled_pattern.width,
+            "height": compiled_pattern.height,
+            "start": _encode_node(compiled_pattern.start),
+            "cells": [[_encode_cell(cell) for cell in row] for row in compiled_pattern.cells],
+            "mask": compiled_pattern.mask,
+            "can_match": compiled_pattern.can_match,
+            "has_measures": compiled_pattern.has_measures,
+            "symmetries": compiled_pattern.symmetries,
+            "required_gates": [
+                (name.value, count) for name, count in compiled_pattern.required_gates
+            ],
+        },
+    }
+
+
+def _decode_rule(rule_data: dict) -> SimplificationRule:
+    compiled_data = rule_data["compiled_pattern"]
+    compiled_pattern = CompiledPattern(
+        width=compiled_data["width"],
+        height=compiled_data["height"],
+        start=_decode_node(compiled_data["start"]),
+        cells=tuple(tuple(_decode_cell(cell) for cell in row) for row in compiled_data["cells"]),
+        mask=tuple(compiled_data["mask"]),
+        can_match=compiled_data["can_match"],
+        has_measures=compiled_data["has_measures"],
+        symmetries=tuple(tuple(symmetry) for symmetry in compiled_data["symmetries"]),
+        required_gates=tuple(
+            (GateName(name), count) for name, count in compiled_data["required_gates"]
+        ),
+    )
+
+    return SimplificationRule.from_compiled(
+        _decode_graph(rule_data["pattern"]),
+        _decode_graph(rule_data["replacement"]),
+        compiled_pattern,
+    )
+
+
+def _encode_graph(graph: QuantumGraph) -> dict:
+    return {
+        "nodes": [_encode_node(node) for node in graph],
+        "edges": [
+            (edge_name.value, *node.position, *end)
+            for node in graph
+            for edge_name, end in graph.iter_node_links(node.position)
+        ],
+    }
+
+
+def _decode_graph(graph_data: dict) -> QuantumGraph:
+    graph = QuantumGraph()
+
+    for node_data in graph_data["nodes"]:
+        node = _decode_node(node_data)
+        graph.add_node(node.name, node.position, node.angle, node.bit)
+
+    for name, start_row, start_column, end_row, end_column in graph_data["edges"]:
+        graph.add_edge(
+            EdgeName(name), Position(start_row, start_column), Position(end_row, end_column)
+        )
+
+    return graph
+
+
+def _encode_node(node: GraphNode) -> tuple:
+    return node.name.value, node.position.row, node.position.column, node.angle, node.bit
+
+
+def _decode_node(node_data: list) -> GraphNode:
+    name, row, column, angle, bit = node_data
+    return GraphNode(GateName(name), Position(row, column), angle=angle, bit=bit)
+
+
+def _encode_cell(cell: PatternCell | None) -> tuple | None:
+    if cell is None:
+        return None
+
+    links = [(edge_name.value, row, column) for edge_name, row, column in cell.links]
+    return cell.name.value, cell.angle, cell.bit, links
+
+
+def _decode_cell(cell_data: list | None) -> PatternCell | None:
+    if cell_data is None:
+        return None
+
+    name, angle, bit, links = cell_data
+    return PatternCell(
+        GateName(name),
+        angle,
+        bit,
+        tuple((EdgeName(edge_name), row, column) for edge_name, row, column in links),
+    )
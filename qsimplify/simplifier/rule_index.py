@@ -0,0 +1,43 @@
+from typing import TypeAlias
+
+from qsimplify.model import GateName, GraphNode, Position, QuantumGraph
+
+NodeKey: TypeAlias = tuple[GateName, bool, int | None]
+"""The gate name, whether there's an angle or not, and the bit of a node."""
+
+
+class RuleIndex:
+    """Groups a list of rules by the node that starts their pattern.
+
+    A single sweep over a graph is enough to know which rules could match and where.
+    Angles are only classified by their presence, because they have to be compared with some tolerance.
+    """
+
+    def __init__(self, pattern_starts: list[GraphNode]) -> None:
+        """Build an index from the start nodes of each rule's pattern, in the same order as the rules."""
+        self._rules_by_key: dict[NodeKey, list[int]] = {}
+
+        for rule_index, start in enumerate(pattern_starts):
+            self._rules_by_key.setdefault(node_key(start), []).append(rule_index)
+
+    def find_candidates(self, graph: QuantumGraph) -> dict[int, list[Position]]:
+        """Find the positions where each rule could start matching, sorted row by row.
+
+        The results are indexed by the position of the rule in the original list.
+        Rules without any candidates are left out.
+        """
+        candidates: dict[int, list[Position]] = {}
+
+        for node in graph:
+            for rule_index in self._rules_by_key.get(node_key(node), ()):
+                candidates.setdefault(rule_index, []).append(node.position)
+
+        for positions in candidates.values():
+            positions.sort(key=tuple)
+
+        return candidates
+
+
+def node_key(node: GraphNode) -> NodeKey:
+    """Get the key used to look up the rules that could start on a node."""
+    return node.name, node.angle is not None, node.bit
@@ -0,0 +1,97 @@
+import json
+import threading
+from pathlib import Path
+
+import networkx
+
+from qsimplify.model import GateName
+from qsimplify.simplifier.simplification_rule import SimplificationRule
+from qsimplify.simplifier.simplification_statistics import (
+    RuleStatistics,
+    SimplificationStatistics,
+)
+
+PRIOR_MATCHES = 1.0
+PRIOR_TIME = 0.001
+
+
+class RuleScheduler:
+    """Decides the order in which a list of rules is applied, based on how useful they were in the past.
+
+    Rules are sorted by their matches per second, so rules that rarely fire don't delay the ones that do.
+    A rule whose replacement creates the gate that starts another rule's pattern is always applied before it,
+    unless both rules can create each other's starting gates.
+    The order only depends on the statistics recorded so far, which are shared by every simplification
+    that uses the same scheduler.
+    """
+
+    def __init__(self, rules: list[SimplificationRule]) -> None:
+        """Create a scheduler for a list of rules, with no statistics."""
+        self.rules = rules
+        self._statistics = SimplificationStatistics.for_rules(len(rules))
+        self._dependencies = self._build_dependencies(rules)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _build_dependencies(rules: list[SimplificationRule]) -> networkx.DiGraph:
+        dependencies = networkx.DiGraph()
+        dependencies.add_nodes_from(range(len(rules)))
+        created_gates = [
+            {node.name for node in rule.replacement if node.name != GateName.ID} for rule in rules
+        ]
+
+        for rule_index, gates in enumerate(created_gates):
+            for other_index, other_rule in enumerate(rules):
+                if rule_index != other_index and other_rule.compiled_pattern.start.name in gates:
+                    dependencies.add_edge(rule_index, other_index)
+
+        return dependencies
+
+    def order(self) -> list[int]:
+        """Get the indices of the rules in the order they should be applied."""
+        with self._lock:
+            scores = [self._score(rule_statistics) for rule_statistics in self._statistics.rules]
+
+        components = networkx.condensation(self._dependencies)
+        members = {
+            component: sorted(data["members"], key=lambda member: (-scores[member], member))
+            for component, data in components.nodes(data=True)
+        }
+        ordered_components = networkx.lexicographical_topological_sort(
+            components,
+            key=lambda component: (-scores[members[component][0]], members[component][0]),
+        )
+
+        return [rule_index for component in ordered_components for rule_index in members[component]]
+
+    @staticmethod
+    def _score(rule_statistics: RuleStatistics) -> float:
+        total_time = rule_statistics.find_time + rule_statistics.replace_time
+        return (rule_statistics.matches + PRIOR_MATCHES) / (total_time + PRIOR_TIME)
+
+    def record(self, statistics: SimplificationStatistics) -> None:
+        """Add the statistics of a simplification that used these rules."""
+        with self._lock:
+            self._statistics.add(statistics)
+
+    @property
+    def statistics(self) -> SimplificationStatistics:
+        """A copy of the statistics recorded so far."""
+        with self._lock:
+            rules = [RuleStatistics(**vars(statistics)) for statistics in self._statistics.rules]
+
+        return SimplificationStatistics(rules)
+
+    def save(self, path: Path) -> None:
+        """Store the statistics recorded so far in a JSON file."""
+        rules = [vars(rule_statistics) for rule_statistics in self.statistics.rules]
+        path.write_text(json.dumps(rules))
+
+    def load(self, path: Path) -> None:
+        """Add the statistics stored in a JSON file by a scheduler with the same rules."""
+        rules = [RuleStatistics(**rule_data) for rule_data in json.loads(path.read_text())]
+
+        if len(rules) != len(self.rules):
+            raise ValueError(f"Expected statistics for {len(self.rules)} rules, found {len(rules)}")
+
+        self.record(SimplificationStatistics(rules))
@@ -0,0 +1,73 @@
+from qsimplify.model import GateName, Position, QuantumGraph
+from qsimplify.simplifier.graph_mappings import GraphMappings
+from qsimplify.simplifier.simplification_rule import SimplificationRule
+
+
+class RuleTriggers:
+    """Finds the rules that could match again after a replacement, so only those are searched for again.
+
+    A new match must contain a gate created by the replacement, or the closest gate on either side of the
+    replaced nodes on one of their rows, since those are the only gates whose surroundings changed.
+    The rules whose patterns have those gates are worked out beforehand for every gate.
+    When whole rows or columns are removed while cleaning up the graph, every rule is triggered,
+    because the alignment of every row may have changed.
+    """
+
+    def __init__(self, rules: list[SimplificationRule]) -> None:
+        """Find the gates used by the pattern and the replacement of each rule."""
+        self._consumers: dict[GateName, list[int]] = {}
+
+        for rule_index, rule in enumerate(rules):
+            for name, _ in rule.compiled_pattern.required_gates:
+                self._consumers.setdefault(name, []).append(rule_index)
+
+        self._all_rules = frozenset(range(len(rules)))
+        self._created_triggers = [
+            self._find_consumers({node.name for node in rule.replacement}) for rule in rules
+        ]
+
+    def _find_consumers(self, names: set[GateName]) -> frozenset[int]:
+        return frozenset(
+            rule_index for name in names for rule_index in self._consumers.get(name, ())
+        )
+
+    def find_triggered_rules(
+        self,
+        rule_index: int,
+        graph: QuantumGraph,
+        mappings: GraphMappings,
+        is_layout_changed: bool,
+    ) -> frozenset[int]:
+        """Find the rules that could match after a rule replaced some nodes, and the graph was cleaned up.
+
+        The layout is changed when the cleanup removed any rows or columns, which moves the replaced nodes.
+        """
+        if is_layout_changed:
+            return self._all_rules
+
+        return self._created_triggers[rule_index] | self._find_consumers(
+            self._find_neighbour_gates(graph, mappings)
+        )
+
+    @staticmethod
+    def _find_neighbour_gates(graph: QuantumGraph, mappings: GraphMappings) -> set[GateName]:
+        """Find the closest gates on the left and on the right of the replaced nodes, on each of their rows."""
+        columns_by_row: dict[int, list[int]] = {}
+
+        for position in mappings:
+            columns_by_row.setdefault(position.row, []).append(position.column)
+
+        names = set()
+
+        for row, columns in columns_by_row.items():
+            for column, step in ((min(columns) - 1, -1), (max(columns) + 1, 1)):
+                while 0 <= column < graph.width:
+                    attributes = graph.node_attributes(Position(row, column))
+
+                    if attributes is not None and attributes[0] != GateName.ID:
+                        names.add(attributes[0])
+                        break
+
+                    column += step
+
+        return names
@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+
+from qsimplify.model import QuantumGraph
+from qsimplify.simplifier.simplification_statistics import SimplificationStatistics
+
+
+@dataclass(frozen=True)
+class SimplificationResult:
+    """The outcome of simplifying a quantum graph.
+
+    Attributes:
+        graph: The simplified graph.
+        iterations: Number of passes that were run over the rules.
+        converged: Whether the last pass left the graph unchanged, so more passes wouldn't change it either.
+        statistics: Per-rule statistics, only if they were requested.
+        partial: Whether the time budget ran out before finishing, so the graph may be simplified further.
+
+    """
+
+    graph: QuantumGraph
+    iterations: int
+    converged: bool
+    statistics: SimplificationStatistics | None = None
+    partial: bool = False
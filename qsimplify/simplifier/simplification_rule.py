@@ -1,4 +1,7 @@
-from qsimplify.model import GateName, QuantumGraph
+from __future__ import annotations
+
+from qsimplify.model import GateName, Position, QuantumGraph
+from qsimplify.simplifier.compiled_pattern import CompiledPattern, compile_pattern
 
 
 class SimplificationRule:
@@ -8,12 +11,26 @@ class SimplificationRule:
         """Create a new simplification rule.
 
         Neither the pattern nor the replacement can have measurement gates.
+        The pattern is compiled right away, so it must not be modified afterwards.
         """
         self.pattern = pattern
         self.replacement = replacement
         self._validate_graphs()
         self._fill_replacement()
-        self._generate_mask()
+        self.mask = _generate_mask(self.replacement)
+        self.compiled_pattern = compile_pattern(self.pattern, self.mask)
+
+    @classmethod
+    def from_compiled(
+        cls, pattern: QuantumGraph, replacement: QuantumGraph, compiled_pattern: CompiledPattern
+    ) -> SimplificationRule:
+        """Restore a rule that was already compiled, whose replacement was already filled."""
+        rule = cls.__new__(cls)
+        rule.pattern = pattern
+        rule.replacement = replacement
+        rule.mask = _generate_mask(replacement)
+        rule.compiled_pattern = compiled_pattern
+        return rule
 
     def _validate_graphs(self) -> None:
         if any(gate.name == GateName.MEASURE for gate in self.pattern):
@@ -27,9 +44,10 @@ class SimplificationRule:
             if not self.replacement.has_node_at(position):
                 self.replacement.add_node(GateName.ID, position)
 
-    def _generate_mask(self) -> None:
-        self.mask = {node.position: node.name != GateName.ID for node in self.replacement}
-
     def __str__(self) -> str:
         """Get a string representation of this rule."""
         return f"Replace\n{self.pattern.draw_grid()}\nWith\n{self.replacement.draw_grid()}"
+
+
+def _generate_mask(replacement: QuantumGraph) -> dict[Position, bool]:
+    return {node.position: node.name != GateName.ID for node in replacement}
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+
+
+@dataclass
+class RuleStatistics:
+    """Counters collected while applying a single simplification rule.
+
+    Attributes:
+        candidates: Number of graph positions checked as the start of the rule's pattern.
+        row_permutations: Number of row orderings compared against the pattern.
+        matches: Number of times the pattern was found, and therefore replaced.
+        find_time: Seconds spent looking for the pattern.
+        replace_time: Seconds spent replacing the pattern.
+
+    """
+
+    candidates: int = 0
+    row_permutations: int = 0
+    matches: int = 0
+    find_time: float = 0.0
+    replace_time: float = 0.0
+
+    def add(self, other: RuleStatistics) -> None:
+        """Add the counters of another set of statistics to this one."""
+        self.candidates += other.candidates
+        self.row_permutations += other.row_permutations
+        self.matches += other.matches
+        self.find_time += other.find_time
+        self.replace_time += other.replace_time
+
+
+@dataclass
+class SimplificationStatistics:
+    """Per-rule statistics collected while simplifying a graph.
+
+    Attributes:
+        rules: The statistics of each rule, in the same order as the rules.
+
+    """
+
+    rules: list[RuleStatistics] = field(default_factory=list)
+
+    @classmethod
+    def for_rules(cls, rule_count: int) -> SimplificationStatistics:
+        """Create empty statistics for the given number of rules."""
+        return cls([RuleStatistics() for _ in range(rule_count)])
+
+    def add(self, other: SimplificationStatistics) -> None:
+        """Add the counters of statistics collected with the same rules to this one."""
+        for rule_statistics, other_rule_statistics in zip(self.rules, other.rules, strict=True):
+            rule_statistics.add(other_rule_statistics)
+
+    def to_dict(self) -> list[dict]:
+        """Get the statistics of each rule that was tried at least once, along with the rule's index."""
+        return [
+            {"rule": rule_index, **asdict(rule_statistics)}
+            for rule_index, rule_statistics in enumerate(self.rules)
+            if rule_statistics.candidates > 0
+        ]
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from typing import Callable
+
+from qsimplify.model import Position
+from qsimplify.simplifier.compiled_pattern import CompiledPattern
+from qsimplify.simplifier.graph_mappings import GraphMappings
+from qsimplify.simplifier.simplification_rule import SimplificationRule
+
+
+@dataclass(frozen=True, slots=True)
+class CandidateEvent:
+    """A graph position was checked as the start of a pattern.
+
+    Attributes:
+        pattern: The pattern being searched, which is the compiled_pattern of its rule.
+        position: The position of the graph that was checked.
+        is_similar: Whether the node on that position is the same gate as the start of the pattern.
+
+    """
+
+    pattern: CompiledPattern
+    position: Position
+    is_similar: bool
+
+
+@dataclass(frozen=True, slots=True)
+class PermutationEvent:
+    """An ordering of the graph's rows was compared against a pattern.
+
+    Attributes:
+        pattern: The pattern being searched, which is the compiled_pattern of its rule.
+        start: The position of the graph where the pattern starts.
+        rows: The rows of the graph matched against each row of the pattern.
+
+    """
+
+    pattern: CompiledPattern
+    start: Position
+    rows: tuple[int, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class MatchEvent:
+    """A pattern was found in the graph.
+
+    Attributes:
+        pattern: The pattern that was found, which is the compiled_pattern of its rule.
+        mappings: The positions of the graph matched against each position of the pattern.
+
+    """
+
+    pattern: CompiledPattern
+    mappings: GraphMappings
+
+
+@dataclass(frozen=True, slots=True)
+class ReplacementEvent:
+    """A rule replaced a match of its pattern.
+
+    Attributes:
+        rule: The rule that was applied.
+        mappings: The positions of the graph that were replaced.
+
+    """
+
+    rule: SimplificationRule
+    mappings: GraphMappings
+
+
+TraceEvent = CandidateEvent | PermutationEvent | MatchEvent | ReplacementEvent
+TraceSink = Callable[[TraceEvent], None]
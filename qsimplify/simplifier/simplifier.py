@@ -1,67 +1,817 @@
-import itertools
-from pathlib import Path
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import partial
+from itertools import chain, repeat
+from typing import Callable, Iterable, Iterator, Literal
 
 from qsimplify import math_utils
-from qsimplify.model import GateName, GraphNode, Position, QuantumGraph, graph_cleaner
+from qsimplify.model import EdgeName, GateName, GraphNode, Position, QuantumGraph, graph_cleaner
+from qsimplify.simplifier import (
+    column_window,
+    gate_fusion,
+    qubit_partition,
+    rotation_merging,
+    rule_cache,
+)
+from qsimplify.simplifier.compiled_pattern import CompiledPattern, compile_pattern
+from qsimplify.simplifier.gate_histogram import GateHistogram
 from qsimplify.simplifier.graph_mappings import GraphMappings
-from qsimplify.simplifier.rule_parser import RuleParser
+from qsimplify.simplifier.match_worklist import MatchWorklist
+from qsimplify.simplifier.optimization_level import OptimizationLevel
+from qsimplify.simplifier.rule_index import RuleIndex
+from qsimplify.simplifier.rule_scheduler import RuleScheduler
+from qsimplify.simplifier.rule_triggers import RuleTriggers
+from qsimplify.simplifier.simplification_result import SimplificationResult
 from qsimplify.simplifier.simplification_rule import SimplificationRule
+from qsimplify.simplifier.simplification_statistics import (
+    RuleStatistics,
+    SimplificationStatistics,
+)
+from qsimplify.simplifier.simplification_trace import (
+    CandidateEvent,
+    MatchEvent,
+    PermutationEvent,
+    ReplacementEvent,
+    TraceSink,
+)
 from qsimplify.utils import setup_logger
 
+FIXPOINT = "fixpoint"
+MAX_FIXPOINT_ITERATIONS = 100
+DEFAULT_STREAM_WINDOW = 64
+
+
+@dataclass(frozen=True)
+class _SimplificationOptions:
+    """The settings shared by every pass of a simplification."""
+
+    iterations: int
+    incremental: bool
+    collect_statistics: bool
+    rule_order: tuple[int, ...] | None = None
+    deadline: float | None = None
+    fuse_gates: bool = False
+    merge_rotations: bool = False
+    batch_matches: bool = False
+    keep_rows: bool = False
+
+
+@dataclass
+class _RuleApplication:
+    """The settings and the state shared with the rest of the pass while applying a single rule.
+
+    Attributes:
+        options: The settings of the whole simplification.
+        candidates: The positions where the rule may start, sorted row by row, or None to search the whole graph.
+            If the graph is clean, later searches are limited to them and the regions changed by the replacements.
+            Otherwise, only the first search is.
+        statistics: The statistics of the rule, which are updated with the work done by it.
+        histogram: A histogram of the graph, which is kept up to date. The rule stops being applied as soon as
+            the graph doesn't have enough gates for its pattern, without searching for it.
+        worklist: An existing worklist to continue a search instead of starting it, in the incremental mode.
+        on_replacement: Called after each replacement with the graph, the replaced positions,
+            and the width and height of the graph before the replacement.
+        is_graph_clean: Whether the graph is known to be clean, so each replacement only needs to clean up
+            the columns it changed. Otherwise, the first replacement cleans up the whole graph.
+
+    """
+
+    options: _SimplificationOptions
+    candidates: list[Position] | None = None
+    statistics: RuleStatistics | None = None
+    histogram: GateHistogram | None = None
+    worklist: MatchWorklist | None = None
+    on_replacement: Callable[[QuantumGraph, GraphMappings, int, int], None] | None = None
+    is_graph_clean: bool = False
+
+    def can_match(self, pattern: CompiledPattern) -> bool:
+        """Check whether the graph may still contain the pattern, according to its histogram."""
+        return self.histogram is None or self.histogram.can_contain(pattern)
+
+    def start_worklist(self, pattern: CompiledPattern) -> MatchWorklist | None:
+        """Get the worklist to search for the pattern with, which is None if the search isn't incremental."""
+        if not self.options.incremental:
+            return None
+
+        if self.worklist is not None:
+            return self.worklist
+
+        return MatchWorklist(
+            pattern.width, pattern.height, self.candidates, is_graph_clean=self.is_graph_clean
+        )
+
+
+def _is_past(deadline: float | None) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
+
+@dataclass
+class _RowSearch:
+    """The state shared while matching a pattern from a single start node."""
+
+    graph: QuantumGraph
+    pattern: CompiledPattern
+    column: int
+    first_positions: dict[tuple[int, bool], Position | None] = field(default_factory=dict)
+
+    def pattern_edge_name(self, start_row: int, end_row: int) -> EdgeName | None:
+        """Get the name of the edge between two nodes of the pattern's first column, if any."""
+        cell = self.pattern.cells[start_row][0]
+
+        if cell is None:
+            return None
+
+        for edge_name, row, column in cell.links:
+            if row == end_row and column == 0:
+                return edge_name
+
+        return None
+
+    def graph_edge_name(self, start: Position, end: Position) -> EdgeName | None:
+        """Get the name of the non-positional edge between two nodes of the graph, if any."""
+        for edge_name, position in self.graph.iter_node_links(start):
+            if position == end and not edge_name.is_positional():
+                return edge_name
+
+        return None
+
+
+@dataclass
+class _RuleSchedule:
+    """The rules left to apply during a pass, and the ones that will be applied again in the next pass.
+
+    Each scheduled rule has a worklist with the regions where it could match, or None to search the whole graph.
+    """
+
+    rules: list[SimplificationRule]
+    triggers: RuleTriggers
+    steps: dict[int, int]
+    incremental: bool
+    is_full_pass: bool
+    current: dict[int, MatchWorklist | None]
+    following: dict[int, MatchWorklist | None] = field(default_factory=dict)
+    step: int = 0
+
+    def record_replacement(
+        self,
+        rule_index: int,
+        graph: QuantumGraph,
+        mappings: GraphMappings,
+        old_width: int,
+        old_height: int,
+    ) -> None:
+        """Schedule the rules triggered by a replacement, after the graph was cleaned up.
+
+        Rules that come later in this pass are applied again in it, and the rest in the next pass.
+        In a full pass, rules that come later search the whole graph anyway, so they're left alone.
+        """
+        for worklist in chain(self.current.values(), self.following.values()):
+            if worklist is not None:
+                worklist.update(graph, mappings, old_width, old_height)
+
+        is_layout_changed = graph.width != old_width or graph.height != old_height
+        triggered_rules = self.triggers.find_triggered_rules(
+            rule_index, graph, mappings, is_layout_changed
+        )
+
+        for other_index in triggered_rules:
+            if other_index == rule_index or other_index in self.current:
+                continue
+
+            if other_index in self.following:
+                continue
+
+            is_later = self.steps[other_index] > self.step
+
+            if is_later and self.is_full_pass:
+                continue
+
+            worklist = None
+
+            if self.incremental:
+                pattern = self.rules[other_index].compiled_pattern
+                worklist = MatchWorklist.after_search(pattern.width, pattern.height, graph)
+                worklist.update(graph, mappings, old_width, old_height)
+
+            if is_later:
+                self.current[other_index] = worklist
+            else:
+                self.following[other_index] = worklist
+
 
 class Simplifier:
     """Simplifies a quantum graph using a set of rules."""
 
     _default_rules: list[SimplificationRule]
 
-    def __init__(self) -> None:
-        """Create a new simplifier."""
-        self._logger = setup_logger("Simplifier")
+    def __init__(self, trace_sink: TraceSink | None = None) -> None:
+        """Create a new simplifier.
 
-        parser = RuleParser()
-        script_path = Path(__file__).parent
-        default_rules_path = script_path / "default_rules.json"
+        A trace sink can be provided to receive an event for every candidate, row permutation, match and
+        replacement found while applying rules. Without one, no events are created at all.
+        It can also be changed later through the trace_sink attribute.
+        Events are only emitted by the calling process, so graphs split across several workers aren't traced.
+        """
+        self._logger = setup_logger("Simplifier")
+        self.trace_sink = trace_sink
 
-        self._default_rules = parser.load_rules_from_file(default_rules_path)
+        self._default_rules = rule_cache.load_default_rules()
+        self._single_qubit_rules = [
+            rule for rule in self._default_rules if rule.pattern.height == 1
+        ]
+        self._precompiled_rules = [
+            (rules, self._build_index(rules), RuleTriggers(rules))
+            for rules in (self._default_rules, self._single_qubit_rules)
+        ]
 
     def simplify_graph(
         self,
         graph: QuantumGraph,
         rules: list[SimplificationRule] | None = None,
-        iterations: int = 1,
+        iterations: int | Literal["fixpoint"] = 1,
+        incremental: bool = True,
+        max_iterations: int = MAX_FIXPOINT_ITERATIONS,
+        workers: int | None = 1,
+        scheduler: RuleScheduler | None = None,
+        time_budget: float | None = None,
+        fuse_gates: bool = False,
+        merge_rotations: bool = False,
+        batch_matches: bool = False,
+        executor: Executor | None = None,
     ) -> QuantumGraph:
         """Simplify a quantum graph using a set of rules.
 
         A custom set of rules can be provided. If not, the default rules will be used.
         The graph will be cleaned up after applying all the rules.
+        Setting iterations to "fixpoint" keeps applying the rules until they stop changing the graph,
+        up to max_iterations times.
+        Setting incremental to False rescans the whole graph after every replacement, which is slower but
+        gives the same results, so it's kept as a reference.
+        Setting workers to anything other than 1 simplifies each group of qubits that never interact with the others
+        in its own process, using as many processes as there are CPUs when it's None.
+        A process pool is created for each call, unless an executor is provided, which is used instead and
+        can be shared by many calls. Passing an executor also splits the graph, regardless of workers.
+        A scheduler can be provided to apply its rules in the order it decides, instead of the order of the list.
+        A time budget, in seconds, stops applying rules once it runs out, returning the graph simplified so far.
+        Setting fuse_gates to True replaces runs of single-qubit gates by shorter equivalent ones before each pass.
+        Setting merge_rotations to True adds up the angles of consecutive rotations and phase gates before each pass.
+        Setting batch_matches to True replaces all the non-overlapping matches of a rule at once, as explained
+        in apply_simplification_rule.
         """
-        if iterations <= 0:
+        return self.simplify(
+            graph,
+            rules,
+            iterations=iterations,
+            incremental=incremental,
+            max_iterations=max_iterations,
+            workers=workers,
+            scheduler=scheduler,
+            time_budget=time_budget,
+            fuse_gates=fuse_gates,
+            merge_rotations=merge_rotations,
+            batch_matches=batch_matches,
+            executor=executor,
+        ).graph
+
+    def simplify(
+        self,
+        graph: QuantumGraph,
+        rules: list[SimplificationRule] | None = None,
+        iterations: int | Literal["fixpoint"] = 1,
+        incremental: bool = True,
+        max_iterations: int = MAX_FIXPOINT_ITERATIONS,
+        workers: int | None = 1,
+        collect_statistics: bool = False,
+        scheduler: RuleScheduler | None = None,
+        time_budget: float | None = None,
+        fuse_gates: bool = False,
+        merge_rotations: bool = False,
+        batch_matches: bool = False,
+        executor: Executor | None = None,
+    ) -> SimplificationResult:
+        """Simplify a quantum graph like simplify_graph, also reporting how many passes were needed.
+
+        Only the first pass searches for every rule in the whole graph. Each replacement schedules the rules
+        it could make match again, only around the replaced nodes, and the next pass only applies those.
+        Passes stop early as soon as no rule is scheduled, since any further pass would leave the graph unchanged.
+        Setting collect_statistics to True also reports how much work each rule needed.
+        When using several workers, the times of every process are added up.
+        The statistics are always recorded by the scheduler, if there's one.
+        The budget is checked before applying each rule and after each replacement, so it can be exceeded
+        by the time a single search takes. The result is marked as partial when the budget runs out.
+        """
+        rules, rule_order = self._find_scheduled_rules(rules, scheduler)
+        options = _SimplificationOptions(
+            self._count_iterations(iterations, max_iterations),
+            incremental,
+            collect_statistics or scheduler is not None,
+            rule_order,
+            self._find_deadline(time_budget),
+            fuse_gates,
+            merge_rotations,
+            batch_matches,
+        )
+        result = None
+
+        if workers != 1 or executor is not None:
+            partitions = qubit_partition.find_qubit_partitions(graph)
+
+            if len(partitions) > 1:
+                result = self._simplify_partitions(
+                    graph, partitions, rules, options, workers, executor
+                )
+
+        if result is None:
+            result = self._simplify_in_place(graph.copy(), rules, options)
+
+        if scheduler is not None and result.statistics is not None:
+            scheduler.record(result.statistics)
+
+        if not collect_statistics:
+            result = replace(result, statistics=None)
+
+        return result
+
+    @staticmethod
+    def _count_iterations(iterations: int | Literal["fixpoint"], max_iterations: int) -> int:
+        if iterations == FIXPOINT:
+            iterations = max_iterations
+
+        if not isinstance(iterations, int) or iterations <= 0:
             raise ValueError("Number of iterations must be greater than 0")
 
+        return iterations
+
+    @staticmethod
+    def _find_deadline(time_budget: float | None) -> float | None:
+        if time_budget is None:
+            return None
+
+        if time_budget < 0:
+            raise ValueError("Time budget can't be negative")
+
+        return time.monotonic() + time_budget
+
+    @staticmethod
+    def _find_scheduled_rules(
+        rules: list[SimplificationRule] | None, scheduler: RuleScheduler | None
+    ) -> tuple[list[SimplificationRule] | None, tuple[int, ...] | None]:
+        """Get the rules to apply and the order to apply them in, which is decided by the scheduler if there's one."""
+        if scheduler is None:
+            return rules, None
+
+        if rules is not None:
+            raise ValueError("A scheduler can't be used along with a different set of rules")
+
+        return scheduler.rules, tuple(scheduler.order())
+
+    def simplify_at_level(
+        self,
+        graph: QuantumGraph,
+        level: OptimizationLevel | int,
+        collect_statistics: bool = False,
+        time_budget: float | None = None,
+    ) -> SimplificationResult:
+        """Simplify a quantum graph with one of the preset optimization levels, like simplify.
+
+        The rules of every level are compiled in advance, when the simplifier is created.
+        """
+        level = OptimizationLevel(level)
+        rules = self._default_rules
+
+        if level == OptimizationLevel.NONE:
+            rules = []
+        elif level == OptimizationLevel.SINGLE_QUBIT:
+            rules = self._single_qubit_rules
+
+        is_full = level == OptimizationLevel.FULL
+
+        return self.simplify(
+            graph,
+            rules,
+            iterations=FIXPOINT if is_full else 1,
+            collect_statistics=collect_statistics,
+            time_budget=time_budget,
+            fuse_gates=is_full,
+            merge_rotations=is_full,
+        )
+
+    def simplify_stream(
+        self,
+        chunks: Iterable[QuantumGraph],
+        rules: list[SimplificationRule] | None = None,
+        iterations: int | Literal["fixpoint"] = 1,
+        incremental: bool = True,
+        window_width: int = DEFAULT_STREAM_WINDOW,
+    ) -> Iterator[QuantumGraph]:
+        """Simplify a circuit provided as consecutive chunks of columns, yielding its simplified columns in order.
+
+        Chunks must keep all of their rows, such as graphs built with clean_up set to False.
+        Columns are buffered until there are at least window_width of them, and then the buffer is simplified.
+        Every column of the buffer except the last ones is yielded as soon as that happens, while the last ones
+        are kept for the next window, as many as the widest pattern of the rules.
+        Memory is bounded by the window width and the size of the chunks, instead of the length of the circuit.
+        Matches that span more columns than the widest pattern, skipping identities, can be missed across windows.
+        Empty rows and unused bits are never removed, since later chunks could still use them.
+        """
+        iterations = self._count_iterations(iterations, MAX_FIXPOINT_ITERATIONS)
+
         if rules is None:
             rules = self._default_rules
 
-        result = graph.copy()
+        overlap = max((rule.pattern.width for rule in rules), default=0)
 
-        for _ in range(iterations):
-            for rule in rules:
-                self.apply_simplification_rule(result, rule)
+        if window_width <= overlap:
+            raise ValueError(f"Window width must be greater than the widest pattern ({overlap})")
 
-            graph_cleaner.clean_and_fill(result)
+        options = _SimplificationOptions(iterations, incremental, False, keep_rows=True)
+        window = QuantumGraph()
 
-        return result
+        for chunk in chunks:
+            column_window.append_columns(window, chunk)
+
+            if window.width < window_width:
+                continue
+
+            window = self._simplify_in_place(window, rules, options).graph
+
+            if window.width > overlap:
+                finished_columns, window = column_window.split_columns(
+                    window, window.width - overlap
+                )
+                yield finished_columns
+
+        if not window.is_empty():
+            yield self._simplify_in_place(window, rules, options).graph
+
+    def _simplify_in_place(
+        self,
+        graph: QuantumGraph,
+        rules: list[SimplificationRule] | None,
+        options: _SimplificationOptions,
+    ) -> SimplificationResult:
+        if rules is None:
+            rules = self._default_rules
+
+        index, triggers = self._find_rule_tables(rules)
+
+        statistics = None
+
+        if options.collect_statistics:
+            statistics = SimplificationStatistics.for_rules(len(rules))
+
+        graph_cleaner.clean_and_fill(graph, keep_rows=options.keep_rows)
+        scheduled_rules = None
+
+        for iteration in range(1, options.iterations + 1):
+            changes = 0
+
+            if options.fuse_gates:
+                changes += gate_fusion.fuse_single_qubit_gates(graph)
+
+            if options.merge_rotations:
+                changes += rotation_merging.merge_rotations(graph)
+
+            if changes > 0:
+                graph_cleaner.clean_and_fill(graph, keep_rows=options.keep_rows)
+                scheduled_rules = None
+
+            scheduled_rules = self._apply_rules(
+                graph, rules, index, triggers, options, statistics, scheduled_rules
+            )
+
+            if _is_past(options.deadline):
+                self._logger.debug("Time budget ran out during iteration %s", iteration)
+                return SimplificationResult(graph, iteration, False, statistics, partial=True)
+
+            if len(scheduled_rules) == 0 and changes == 0:
+                self._logger.debug("Graph is stable after %s iterations", iteration)
+                return SimplificationResult(graph, iteration, True, statistics)
+
+        return SimplificationResult(graph, options.iterations, False, statistics)
+
+    def _find_rule_tables(self, rules: list[SimplificationRule]) -> tuple[RuleIndex, RuleTriggers]:
+        for precompiled_rules, index, triggers in self._precompiled_rules:
+            if rules is precompiled_rules:
+                return index, triggers
+
+        return self._build_index(rules), RuleTriggers(rules)
+
+    @staticmethod
+    def _simplify_partitions(
+        graph: QuantumGraph,
+        partitions: list[list[int]],
+        rules: list[SimplificationRule] | None,
+        options: _SimplificationOptions,
+        workers: int | None,
+        executor: Executor | None,
+    ) -> SimplificationResult:
+        """Simplify each group of rows in the executor, or in a new process pool, then merge them back into a single graph."""
+        subgraphs = [qubit_partition.extract_partition(graph, rows) for rows in partitions]
+        tasks = (
+            _simplify_partition,
+            subgraphs,
+            repeat(rules),
+            repeat(replace(options, keep_rows=True)),
+        )
+
+        if executor is not None:
+            results = list(executor.map(*tasks))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as new_executor:
+                results = list(new_executor.map(*tasks))
+
+        merged_graph = qubit_partition.merge_partitions(
+            [(rows, result.graph) for rows, result in zip(partitions, results, strict=True)]
+        )
+
+        statistics = None
+
+        for result in results:
+            if statistics is None:
+                statistics = result.statistics
+            elif result.statistics is not None:
+                statistics.add(result.statistics)
+
+        return SimplificationResult(
+            merged_graph,
+            max(result.iterations for result in results),
+            all(result.converged for result in results),
+            statistics,
+            any(result.partial for result in results),
+        )
+
+    def _apply_rules(
+        self,
+        graph: QuantumGraph,
+        rules: list[SimplificationRule],
+        index: RuleIndex,
+        triggers: RuleTriggers,
+        options: _SimplificationOptions,
+        statistics: SimplificationStatistics | None = None,
+        scheduled_rules: dict[int, MatchWorklist | None] | None = None,
+    ) -> dict[int, MatchWorklist | None]:
+        """Apply the scheduled rules once, in order, returning the rules scheduled for the next pass.
+
+        The graph must be clean. Without any scheduled rules, every rule is searched for in the whole graph.
+        Each replacement only schedules the rules it triggers, around the replaced nodes.
+        """
+        candidates = None
+        rule_order = options.rule_order if options.rule_order is not None else range(len(rules))
+        histogram = GateHistogram(graph)
+        schedule = _RuleSchedule(
+            rules,
+            triggers,
+            {rule_index: step for step, rule_index in enumerate(rule_order)},
+            options.incremental,
+            is_full_pass=scheduled_rules is None,
+            current=dict(scheduled_rules or {}),
+        )
+
+        for step, rule_index in enumerate(rule_order):
+            if _is_past(options.deadline):
+                break
+
+            schedule.step = step
+            worklist = None
+            rule_candidates = None
+
+            if not schedule.is_full_pass:
+                if rule_index not in schedule.current:
+                    continue
 
-    def apply_simplification_rule(self, graph: QuantumGraph, rule: SimplificationRule) -> None:
-        """Apply a single simplification rule to a graph.
+                worklist = schedule.current.pop(rule_index)
+
+            if not histogram.can_contain(rules[rule_index].compiled_pattern):
+                continue
+
+            if schedule.is_full_pass:
+                if candidates is None:
+                    candidates = index.find_candidates(graph)
+
+                if rule_index not in candidates:
+                    continue
+
+                rule_candidates = candidates[rule_index]
+
+            application = _RuleApplication(
+                options,
+                candidates=rule_candidates,
+                statistics=statistics.rules[rule_index] if statistics is not None else None,
+                histogram=histogram,
+                worklist=worklist,
+                on_replacement=partial(schedule.record_replacement, rule_index),
+                is_graph_clean=True,
+            )
+            replacements = self._apply_rule(graph, rules[rule_index], application)
+
+            if replacements > 0:
+                candidates = None
+
+        return schedule.following
+
+    @staticmethod
+    def _build_index(rules: list[SimplificationRule]) -> RuleIndex:
+        return RuleIndex([rule.compiled_pattern.start for rule in rules])
+
+    def apply_simplification_rule(
+        self,
+        graph: QuantumGraph,
+        rule: SimplificationRule,
+        incremental: bool = True,
+        keep_rows: bool = False,
+        batch_matches: bool = False,
+    ) -> int:
+        """Apply a single simplification rule to a graph, returning how many times it was applied.
 
         Note that the graph is not cleaned up after the rule is applied.
+        By default, only the region around each replacement is searched again, instead of the whole graph.
+        Setting keep_rows to True never removes empty rows, like graph_cleaner.clean_and_fill.
+        Setting batch_matches to True replaces every non-overlapping match found in a sweep over the graph at once,
+        cleaning the graph once per sweep instead of once per match. Sweeps go column by column, and matches
+        that overlap an earlier one are left for the next sweep. The results can differ from the default mode.
+        Every sweep after the first one goes over the whole graph, even in the incremental mode, since a match
+        left for the next sweep may start far from the replacements that blocked it.
+        """
+        options = _SimplificationOptions(
+            1, incremental, False, keep_rows=keep_rows, batch_matches=batch_matches
+        )
+        return self._apply_rule(graph, rule, _RuleApplication(options))
+
+    def _apply_rule(
+        self, graph: QuantumGraph, rule: SimplificationRule, application: _RuleApplication
+    ) -> int:
+        """Apply a rule like apply_simplification_rule, sharing the state of the current pass."""
+        if application.options.batch_matches:
+            return self._apply_rule_in_batches(graph, rule, application)
+
+        pattern = rule.compiled_pattern
+        worklist = application.start_worklist(pattern)
+        replacements = 0
+
+        while application.can_match(pattern):
+            if worklist is not None:
+                positions = worklist.iter_candidates(graph)
+            else:
+                positions = graph.iter_positions_by_row()
+
+            find_start_time = time.perf_counter()
+            mappings = self._find_pattern_in_positions(
+                graph, pattern, positions, application.statistics
+            )
+            self._record_find_time(application.statistics, find_start_time)
+
+            if mappings is None:
+                break
+
+            old_width, old_height = graph.width, graph.height
+            self._replace_matches(graph, rule, [mappings], application)
+            replacements += 1
+
+            if _is_past(application.options.deadline):
+                break
+
+            if worklist is not None:
+                worklist.update(graph, mappings, old_width, old_height)
+
+        return replacements
+
+    def _apply_rule_in_batches(
+        self, graph: QuantumGraph, rule: SimplificationRule, application: _RuleApplication
+    ) -> int:
+        pattern = rule.compiled_pattern
+        replacements = 0
+
+        if application.candidates is not None:
+            positions = sorted(
+                application.candidates, key=lambda position: (position.column, position.row)
+            )
+        else:
+            positions = graph.iter_positions_by_column()
+
+        while application.can_match(pattern):
+            find_start_time = time.perf_counter()
+            matches = self._find_independent_matches(
+                graph, pattern, positions, application.statistics
+            )
+            self._record_find_time(application.statistics, find_start_time)
+
+            if len(matches) == 0:
+                break
+
+            self._replace_matches(graph, rule, matches, application)
+            replacements += len(matches)
+
+            if _is_past(application.options.deadline):
+                break
+
+            positions = graph.iter_positions_by_column()
+
+        return replacements
+
+    @staticmethod
+    def _record_find_time(statistics: RuleStatistics | None, find_start_time: float) -> None:
+        if statistics is not None:
+            statistics.find_time += time.perf_counter() - find_start_time
+
+    def _replace_matches(
+        self,
+        graph: QuantumGraph,
+        rule: SimplificationRule,
+        matches: list[GraphMappings],
+        application: _RuleApplication,
+    ) -> None:
+        """Replace some non-overlapping matches of a rule, and then clean up the graph once.
+
+        Once the graph is clean, only the columns of the replaced nodes are cleaned up,
+        since rules never touch measurements, whose bits would have to be renumbered across the whole graph.
         """
-        self._logger.debug("Applying rule with mask %s", rule.mask)
-        mappings = self.find_pattern(graph, rule.pattern, mask=rule.mask)
+        replace_start_time = time.perf_counter()
+        old_width, old_height = graph.width, graph.height
+
+        for mappings in matches:
+            if application.histogram is not None:
+                self._update_histogram(application.histogram, graph, rule.replacement, mappings)
+
+            self._replace_nodes(graph, rule.replacement, mappings)
+
+            if self.trace_sink is not None:
+                self.trace_sink(ReplacementEvent(rule, mappings))
+
+        keep_rows = application.options.keep_rows
+
+        if application.is_graph_clean:
+            changed_positions = [position for mappings in matches for position in mappings]
+            graph_cleaner.clean_and_fill_columns(graph, changed_positions, keep_rows=keep_rows)
+        else:
+            graph_cleaner.clean_and_fill(graph, keep_rows=keep_rows)
+            application.is_graph_clean = True
+
+        if application.on_replacement is not None:
+            merged_mappings = {
+                position: match for mappings in matches for position, match in mappings.items()
+            }
+            application.on_replacement(graph, merged_mappings, old_width, old_height)
 
-        while mappings is not None:
-            self.replace_pattern(graph, rule.replacement, mappings)
-            mappings = self.find_pattern(graph, rule.pattern, mask=rule.mask)
+        if application.statistics is not None:
+            application.statistics.matches += len(matches)
+            application.statistics.replace_time += time.perf_counter() - replace_start_time
+
+    @staticmethod
+    def _update_histogram(
+        histogram: GateHistogram,
+        graph: QuantumGraph,
+        replacement: QuantumGraph,
+        mappings: GraphMappings,
+    ) -> None:
+        """Count the gates replaced by a match, before the graph is changed."""
+        removed_nodes = (graph.node_attributes(position) for position in mappings)
+        added_nodes = (
+            replacement.node_attributes(match) for match in mappings.values() if match is not None
+        )
+        histogram.replace(
+            (attributes[0] for attributes in removed_nodes if attributes is not None),
+            (attributes[0] for attributes in added_nodes if attributes is not None),
+        )
+
+    def _find_independent_matches(
+        self,
+        graph: QuantumGraph,
+        pattern: CompiledPattern,
+        positions: Iterable[Position],
+        statistics: RuleStatistics | None,
+    ) -> list[GraphMappings]:
+        """Find the matches of a pattern that can be replaced together, giving priority to the first ones.
+
+        Each match claims every position between its first and last node on each of its rows, since the
+        identities in between were skipped while matching it, so later matches can't touch any of them.
+        """
+        claimed: set[Position] = set()
+        matches = []
+        unclaimed_positions = (position for position in positions if position not in claimed)
+
+        for mappings in self._iter_pattern_matches(graph, pattern, unclaimed_positions, statistics):
+            span = self._find_match_span(mappings)
+
+            if claimed.isdisjoint(span):
+                matches.append(mappings)
+                claimed.update(span)
+
+        return matches
+
+    @staticmethod
+    def _find_match_span(mappings: GraphMappings) -> list[Position]:
+        columns_by_row: dict[int, list[int]] = {}
+
+        for position in mappings:
+            columns_by_row.setdefault(position.row, []).append(position.column)
+
+        return [
+            Position(row, column)
+            for row, columns in columns_by_row.items()
+            for column in range(min(columns), max(columns) + 1)
+        ]
 
     def find_pattern(
         self,
@@ -70,40 +820,53 @@ class Simplifier:
         mask: dict[Position, bool] | None = None,
     ) -> GraphMappings | None:
         """Try finding a pattern in a graph."""
-        pattern_start = self._find_start(pattern)
-        self._logger.debug("Pattern start found at %s", pattern_start.position)
+        compiled_pattern = compile_pattern(pattern, mask)
+
+        return self._find_pattern_in_positions(
+            graph, compiled_pattern, graph.iter_positions_by_row()
+        )
 
-        for position in graph.iter_positions_by_row():
-            self._logger.debug("Checking graph on position %s", position)
+    def _find_pattern_in_positions(
+        self,
+        graph: QuantumGraph,
+        pattern: CompiledPattern,
+        positions: Iterable[Position],
+        statistics: RuleStatistics | None = None,
+    ) -> GraphMappings | None:
+        return next(self._iter_pattern_matches(graph, pattern, positions, statistics), None)
+
+    def _iter_pattern_matches(
+        self,
+        graph: QuantumGraph,
+        pattern: CompiledPattern,
+        positions: Iterable[Position],
+        statistics: RuleStatistics | None = None,
+    ) -> Iterator[GraphMappings]:
+        """Find the first match of a pattern starting on each of the positions, lazily."""
+        if not pattern.can_match:
+            return
+
+        for position in positions:
             node = graph[position]
 
-            if not self._are_nodes_similar(node, pattern_start):
-                self._logger.debug(
-                    "No similarities found when comparing %s and %s",
-                    node,
-                    pattern_start,
-                )
+            if node is None:
                 continue
 
-            mappings = self._match_pattern(graph, pattern, node, pattern_start, mask=mask)
-
-            if mappings is not None:
-                return mappings
+            is_similar = self._are_nodes_similar(node, pattern.start)
 
-        return None
+            if statistics is not None:
+                statistics.candidates += 1
 
-    @staticmethod
-    def _find_start(pattern: QuantumGraph) -> GraphNode:
-        if pattern.height == 0:
-            raise ValueError("Invalid pattern")
+            if self.trace_sink is not None:
+                self.trace_sink(CandidateEvent(pattern, position, is_similar))
 
-        for row_index in range(pattern.height):
-            potential_start = pattern[Position(row_index, 0)]
+            if not is_similar:
+                continue
 
-            if potential_start is not None:
-                return potential_start
+            mappings = self._match_pattern(graph, pattern, node, statistics)
 
-        raise ValueError("Invalid pattern")
+            if mappings is not None:
+                yield mappings
 
     @staticmethod
     def _are_nodes_similar(start: GraphNode, end: GraphNode) -> bool:
@@ -127,49 +890,285 @@ class Simplifier:
     def _match_pattern(
         self,
         graph: QuantumGraph,
-        pattern: QuantumGraph,
+        pattern: CompiledPattern,
         start: GraphNode,
-        pattern_start: GraphNode,
-        mask: dict[Position, bool] | None = None,
+        statistics: RuleStatistics | None = None,
     ) -> GraphMappings | None:
-        for row_permutation in self._calculate_row_permutations(
-            graph, pattern, start, pattern_start
-        ):
-            self._logger.debug("Trying row permutation %s on start %s", row_permutation, start)
-            subgraph, mappings = self.extract_subgraph(
-                graph, row_permutation, start.position.column, pattern.width, mask=mask
-            )
+        search = _RowSearch(graph, pattern, start.position.column)
+
+        for row_permutation in self._iter_row_permutations(search, start):
+            if not pattern.is_first_ordering(row_permutation):
+                continue
+
+            if statistics is not None:
+                statistics.row_permutations += 1
+
+            if self.trace_sink is not None:
+                self.trace_sink(PermutationEvent(pattern, start.position, tuple(row_permutation)))
+
+            mappings = self._match_window(search, row_permutation)
+
+            if mappings is not None:
+                if self.trace_sink is not None:
+                    self.trace_sink(MatchEvent(pattern, mappings))
 
-            if subgraph is not None and subgraph == pattern:
-                self._logger.debug("Match found with mappings %s", mappings)
                 return mappings
 
-        self._logger.debug("No matches found")
         return None
 
+    def _match_window(self, search: _RowSearch, rows: list[int]) -> GraphMappings | None:
+        """Compare the pattern against the window of the graph that starts on the provided rows.
+
+        The window is walked in the same way as when extracting a subgraph, but every node is compared
+        against the pattern as soon as it's found, so the comparison stops at the first difference.
+        """
+        graph = search.graph
+        pattern = search.pattern
+        window: list[list[Position]] = []
+
+        for pattern_row, row in enumerate(rows):
+            window_row = []
+            column = search.column
+
+            for pattern_column, cell in enumerate(pattern.cells[pattern_row]):
+                can_be_identity = pattern.can_be_identity(pattern_row, pattern_column)
+                position = self._find_next_right_position(
+                    graph, Position(row, column), can_be_identity
+                )
+
+                if position is None:
+                    return None
+
+                attributes = graph.node_attributes(position)
+
+                if attributes is None or cell is None or attributes[0] != cell.name:
+                    return None
+
+                name, angle, bit = attributes
+
+                if name != GateName.MEASURE and (
+                    bit != cell.bit or graph_cleaner.normalize_node_angle(name, angle) != cell.angle
+                ):
+                    return None
+
+                window_row.append(position)
+                column = position.column + 1
+
+            window.append(window_row)
+
+        if not self._are_window_links_equal(search, window):
+            return None
+
+        if pattern.has_measures and not self._are_window_bits_equal(search, window):
+            return None
+
+        return {
+            position: Position(pattern_row, pattern_column)
+            for pattern_row, window_row in enumerate(window)
+            for pattern_column, position in enumerate(window_row)
+        }
+
     @staticmethod
-    def _calculate_row_permutations(
-        graph: QuantumGraph,
-        pattern: QuantumGraph,
-        start: GraphNode,
-        pattern_start: GraphNode,
-    ) -> list[list[int]]:
-        pattern_height = pattern.height
-        row = start.position.row
-
-        if pattern_height == 1:
-            return [[row]]
-
-        other_rows = [row_index for row_index in range(graph.height) if row_index != row]
-        permutations = [
-            list(permutation)
-            for permutation in itertools.permutations(other_rows, pattern.height - 1)
-        ]
+    def _are_window_links_equal(search: _RowSearch, window: list[list[Position]]) -> bool:
+        for pattern_row, window_row in enumerate(window):
+            for pattern_column, position in enumerate(window_row):
+                cell = search.pattern.cells[pattern_row][pattern_column]
+                expected_links = cell.links if cell is not None else ()
+                link_count = 0
+
+                for edge_name, end in search.graph.iter_node_links(position):
+                    if edge_name.is_positional():
+                        continue
+
+                    link_count += 1
+
+                    if not any(
+                        edge_name == expected_name and end == window[end_row][end_column]
+                        for expected_name, end_row, end_column in expected_links
+                    ):
+                        return False
+
+                if link_count != len(expected_links):
+                    return False
 
-        for permutation in permutations:
-            permutation.insert(pattern_start.position.row, row)
+        return True
 
-        return permutations
+    @staticmethod
+    def _are_window_bits_equal(search: _RowSearch, window: list[list[Position]]) -> bool:
+        """Compare measurement bits, which are renumbered in order when a graph is cleaned up."""
+        measures = []
+
+        for pattern_row, window_row in enumerate(window):
+            for pattern_column, position in enumerate(window_row):
+                cell = search.pattern.cells[pattern_row][pattern_column]
+                attributes = search.graph.node_attributes(position)
+
+                if cell is not None and attributes is not None and cell.name == GateName.MEASURE:
+                    measures.append((cell, attributes[2]))
+
+        bits = sorted({bit for _, bit in measures if bit is not None})
+        bit_ranks = {bit: rank for rank, bit in enumerate(bits)}
+
+        return all(cell.bit == bit_ranks.get(bit) for cell, bit in measures)
+
+    def _iter_row_permutations(self, search: _RowSearch, start: GraphNode) -> Iterator[list[int]]:
+        """Iterate over the row orderings where the pattern could be found, in lexicographic order.
+
+        Each pattern row is assigned to a graph row whose first node has the same gate as the pattern's first column.
+        Rows linked by an edge of the pattern to an already assigned row are taken from the edges of the graph.
+        Any ordering that contradicts the edges of the pattern's first column is skipped.
+        """
+        start_row = start.position.row
+
+        if search.pattern.height == 1:
+            yield [start_row]
+            return
+
+        start_pattern_row = search.pattern.start.position.row
+
+        if not self._is_first_node_valid(search, start_row, start_pattern_row):
+            return
+
+        rows: list[int | None] = [None] * search.pattern.height
+        rows[start_pattern_row] = start_row
+        pattern_rows = [row for row in range(search.pattern.height) if row != start_pattern_row]
+
+        yield from self._assign_rows(search, rows, pattern_rows, 0)
+
+    def _assign_rows(
+        self,
+        search: _RowSearch,
+        rows: list[int | None],
+        pattern_rows: list[int],
+        depth: int,
+    ) -> Iterator[list[int]]:
+        if depth == len(pattern_rows):
+            yield [row for row in rows if row is not None]
+            return
+
+        pattern_row = pattern_rows[depth]
+
+        for row in self._find_candidate_rows(search, rows, pattern_row):
+            if row in rows or not self._is_first_node_valid(search, row, pattern_row):
+                continue
+
+            if not self._are_first_edges_consistent(search, rows, pattern_row, row):
+                continue
+
+            rows[pattern_row] = row
+            yield from self._assign_rows(search, rows, pattern_rows, depth + 1)
+            rows[pattern_row] = None
+
+    def _find_candidate_rows(
+        self,
+        search: _RowSearch,
+        rows: list[int | None],
+        pattern_row: int,
+    ) -> Iterable[int]:
+        """Find the graph rows that could be assigned to a pattern row, in ascending order.
+
+        If the pattern links the row to an already assigned one, in any column, the rows are taken from
+        the edges of the graph node found in that column. Otherwise, every row of the graph is a candidate.
+        """
+        for linked_pattern_row, linked_row in enumerate(rows):
+            if linked_row is None:
+                continue
+
+            for pattern_column, cell in enumerate(search.pattern.cells[linked_pattern_row]):
+                if cell is None:
+                    continue
+
+                for edge_name, end_row, _ in cell.links:
+                    if end_row != pattern_row:
+                        continue
+
+                    linked_position = self._find_window_position(
+                        search, linked_row, linked_pattern_row, pattern_column
+                    )
+
+                    if linked_position is None:
+                        return ()
+
+                    return sorted(
+                        end.row
+                        for name, end in search.graph.iter_node_links(linked_position)
+                        if name == edge_name
+                    )
+
+        return range(search.graph.height)
+
+    def _find_window_position(
+        self, search: _RowSearch, row: int, pattern_row: int, pattern_column: int
+    ) -> Position | None:
+        """Find the node of a graph row that would be compared against a pattern cell, like _match_window."""
+        position = self._find_first_position(search, row, pattern_row)
+
+        for column in range(1, pattern_column + 1):
+            if position is None:
+                return None
+
+            position = self._find_next_right_position(
+                search.graph,
+                Position(row, position.column + 1),
+                search.pattern.can_be_identity(pattern_row, column),
+            )
+
+        return position
+
+    def _is_first_node_valid(self, search: _RowSearch, row: int, pattern_row: int) -> bool:
+        position = self._find_first_position(search, row, pattern_row)
+
+        if position is None:
+            return False
+
+        attributes = search.graph.node_attributes(position)
+        cell = search.pattern.cells[pattern_row][0]
+        return attributes is not None and cell is not None and attributes[0] == cell.name
+
+    def _are_first_edges_consistent(
+        self,
+        search: _RowSearch,
+        rows: list[int | None],
+        pattern_row: int,
+        row: int,
+    ) -> bool:
+        position = self._find_first_position(search, row, pattern_row)
+
+        if position is None:
+            return False
+
+        for other_pattern_row, other_row in enumerate(rows):
+            if other_row is None:
+                continue
+
+            other_position = self._find_first_position(search, other_row, other_pattern_row)
+
+            if other_position is None:
+                return False
+
+            outgoing = search.graph_edge_name(position, other_position)
+            incoming = search.graph_edge_name(other_position, position)
+
+            if outgoing != search.pattern_edge_name(pattern_row, other_pattern_row):
+                return False
+
+            if incoming != search.pattern_edge_name(other_pattern_row, pattern_row):
+                return False
+
+        return True
+
+    def _find_first_position(
+        self, search: _RowSearch, row: int, pattern_row: int
+    ) -> Position | None:
+        can_be_identity = search.pattern.can_be_identity(pattern_row, 0)
+        key = (row, can_be_identity)
+
+        if key not in search.first_positions:
+            search.first_positions[key] = self._find_next_right_position(
+                search.graph, Position(row, search.column), can_be_identity
+            )
+
+        return search.first_positions[key]
 
     def extract_subgraph(
         self,
@@ -186,16 +1185,18 @@ class Simplifier:
             mask = self._generate_full_mask(width, len(rows))
 
         mappings = self._extract_subgraph_mappings(graph, rows, starting_column, width, mask)
-        self._logger.debug("Extracting mappings for width %s", width)
 
         if mappings is None:
-            self._logger.debug("Mappings couldn't be extracted")
             return None, None
 
         subgraph = QuantumGraph()
 
         for old_position, new_position in mappings.items():
             node = graph[old_position]
+
+            if node is None:
+                continue
+
             subgraph.add_node(
                 node.name,
                 new_position,
@@ -213,7 +1214,6 @@ class Simplifier:
                     mappings[edge.end.position],
                 )
 
-        self._logger.debug("Mappings are valid, filling the subgraph")
         graph_cleaner.clean_and_fill(subgraph)
         return subgraph, mappings
 
@@ -237,7 +1237,6 @@ class Simplifier:
         mask: dict[Position, bool],
     ) -> GraphMappings | None:
         mappings: GraphMappings = {}
-        self._logger.debug("Starting mapping extraction")
 
         for new_row, old_row in enumerate(rows):
             new_column = 0
@@ -247,11 +1246,6 @@ class Simplifier:
                 if new_column == width:
                     break
 
-                self._logger.debug(
-                    "Trying to map %s into %s",
-                    Position(old_row, old_column),
-                    Position(new_row, new_column),
-                )
                 node = self._find_next_right_node(
                     graph,
                     Position(old_row, old_column),
@@ -259,11 +1253,9 @@ class Simplifier:
                 )
 
                 if node is None:
-                    self._logger.debug("No node found at the right side")
                     return None
 
                 mappings[node.position] = Position(new_row, new_column)
-                self._logger.debug("Mappings updated to %s", mappings)
                 old_column = node.position.column + 1
                 new_column += 1
 
@@ -284,40 +1276,70 @@ class Simplifier:
         start: Position,
         can_be_identity: bool,
     ) -> GraphNode | None:
-        edge_data = graph.node_edge_data(start)
-        self._logger.debug("Going to the right starting from edge %s", edge_data)
-        self._logger.debug("Can it be identity? %s", can_be_identity)
+        position = self._find_next_right_position(graph, start, can_be_identity)
 
-        if edge_data is None:
-            self._logger.debug("No edge data found at position %s", start)
+        if position is None:
             return None
 
-        while True:
-            origin = edge_data.origin
+        return graph[position]
 
-            if can_be_identity or origin.name != GateName.ID:
-                self._logger.debug("The origin %s can be accepted, finishing exploration", origin)
-                return origin
+    @staticmethod
+    def _find_next_right_position(
+        graph: QuantumGraph,
+        start: Position,
+        can_be_identity: bool,
+    ) -> Position | None:
+        position = start
+        attributes = graph.node_attributes(position)
+
+        while attributes is not None:
+            name, _, _ = attributes
+
+            if can_be_identity or name != GateName.ID:
+                return position
+
+            position = next(
+                (
+                    end
+                    for edge_name, end in graph.iter_node_links(position)
+                    if edge_name == EdgeName.RIGHT
+                ),
+                None,
+            )
 
-            if edge_data.right is None:
-                self._logger.debug("Reached the rightmost node, no origin found")
+            if position is None:
                 return None
 
-            edge_data = graph.node_edge_data(edge_data.right.position)
+            attributes = graph.node_attributes(position)
+
+        return None
 
     def replace_pattern(
+        self,
+        graph: QuantumGraph,
+        replacement: QuantumGraph,
+        mappings: GraphMappings,
+        keep_rows: bool = False,
+    ) -> None:
+        self._replace_nodes(graph, replacement, mappings)
+        graph_cleaner.clean_and_fill(graph, keep_rows=keep_rows)
+
+    def _replace_nodes(
         self, graph: QuantumGraph, replacement: QuantumGraph, mappings: GraphMappings
     ) -> None:
-        self._logger.debug("Removing nodes with mappings %s", mappings)
+        """Replace the matched nodes without cleaning up the graph, which breaks its positional edges."""
         for original_position in mappings:
             graph.clear_node(original_position)
 
         mappings = {key: value for key, value in mappings.items() if value is not None}
         reverse_mappings = self._invert_mappings(mappings)
-        self._logger.debug("Reversed mappings are %s", reverse_mappings)
 
         for original, match in mappings.items():
             node = replacement[match]
+
+            if node is None:
+                continue
+
             graph.add_node(node.name, original, angle=node.angle, bit=node.bit)
 
             for edge in replacement.node_edges(match):
@@ -326,8 +1348,27 @@ class Simplifier:
 
                 graph.add_edge(edge.name, original, reverse_mappings[edge.end.position])
 
-        graph_cleaner.clean_and_fill(graph)
-
     @staticmethod
     def _invert_mappings(mappings: GraphMappings) -> GraphMappings:
         return {value: key for key, value in mappings.items()}
+
+
+_partition_simplifier: Simplifier | None = None
+
+
+def _simplify_partition(
+    graph: QuantumGraph,
+    rules: list[SimplificationRule] | None,
+    options: _SimplificationOptions,
+) -> SimplificationResult:
+    """Simplify one of the groups of qubits split by simplify, in place, with the options of the whole graph.
+
+    This runs in the worker processes, which create their own simplifier the first time, and keep it for later calls.
+    """
+    global _partition_simplifier
+
+    if _partition_simplifier is None:
+        _partition_simplifier = Simplifier()
+
+    # The partitions are simplified like the whole graph, but without going through the public options.
+    return _partition_simplifier._simplify_in_place(graph, rules, options)  # noqa: SLF001
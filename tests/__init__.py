@@ -9,6 +9,8 @@ P = GateName.P
 RX = GateName.RX
 RY = GateName.RY
 RZ = GateName.RZ
+S = GateName.S
+T = GateName.T
 SWAP = GateName.SWAP
 CH = GateName.CH
 CX = GateName.CX
@@ -0,0 +1,17 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+
+_cache_directory = tempfile.mkdtemp(prefix="qsimplify-tests-")
+
+
+def pytest_configure(config: pytest.Config) -> None:  # noqa: ARG001
+    """Compile the rules into a temporary directory, since some modules load them when imported."""
+    os.environ["QSIMPLIFY_CACHE_DIR"] = _cache_directory
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:  # noqa: ARG001
+    """Remove the compiled rules of the test session."""
+    shutil.rmtree(_cache_directory, ignore_errors=True)
@@ -1,13 +1,82 @@
+from typing import Iterator
+
 import pytest
 from flask import Flask
+from flask.testing import FlaskClient
 
 from qsimplify.controller.circuit_controller import circuit_controller
 
+GATES = [{"name": "h", "qubit": 0}, {"name": "h", "qubit": 0}, {"name": "x", "qubit": 1}]
+
 
 @pytest.fixture
-def _client():
+def client() -> Iterator[FlaskClient]:
     app = Flask(__name__)
     app.register_blueprint(circuit_controller, url_prefix="/api/circuit")
     app.testing = True
     with app.test_client() as client:
         yield client
+
+
+def test_simplify_at_level(client: FlaskClient):
+    response = client.post("/api/circuit/simplify", json={"gates": GATES, "level": 0})
+
+    assert response.status_code == 200
+    assert len(response.json["gates"]) == 3
+
+    response = client.post("/api/circuit/simplify", json={"gates": GATES, "level": 2})
+
+    assert response.status_code == 200
+    assert response.json["gates"] == [{"name": "x", "qubit": 0}]
+
+
+@pytest.mark.parametrize("level", [7, -1, "2", 2.0, True])
+def test_simplify_at_invalid_level(client: FlaskClient, level: object):
+    response = client.post("/api/circuit/simplify", json={"gates": GATES, "level": level})
+
+    assert response.status_code == 400
+    assert list(response.json["errors"]) == ["level"]
+
+
+def test_simplify_with_time_budget(client: FlaskClient):
+    response = client.post("/api/circuit/simplify", json={"gates": GATES, "time_budget": 10})
+
+    assert response.status_code == 200
+    assert response.json["partial"] is False
+
+    response = client.post("/api/circuit/simplify", json={"gates": GATES, "time_budget": 0})
+
+    assert response.status_code == 200
+    assert response.json["partial"] is True
+
+
+@pytest.mark.parametrize("time_budget", [-1, "10", True, [1]])
+def test_simplify_with_invalid_time_budget(client: FlaskClient, time_budget: object):
+    response = client.post(
+        "/api/circuit/simplify", json={"gates": GATES, "time_budget": time_budget}
+    )
+
+    assert response.status_code == 400
+    assert list(response.json["errors"]) == ["time_budget"]
+
+
+def test_simplify_with_statistics(client: FlaskClient):
+    response = client.post("/api/circuit/simplify", json={"gates": GATES})
+
+    assert "statistics" not in response.json
+
+    response = client.post("/api/circuit/simplify", json={"gates": GATES, "statistics": True})
+    statistics = response.json["statistics"]
+
+    assert response.status_code == 200
+    assert len(statistics) > 0
+    assert sum(rule_statistics["matches"] for rule_statistics in statistics) == 1
+    assert all(rule_statistics["candidates"] > 0 for rule_statistics in statistics)
+
+
+@pytest.mark.parametrize("statistics", ["true", 1, None])
+def test_simplify_with_invalid_statistics(client: FlaskClient, statistics: object):
+    response = client.post("/api/circuit/simplify", json={"gates": GATES, "statistics": statistics})
+
+    assert response.status_code == 400
+    assert list(response.json["errors"]) == ["statistics"]
@@ -0,0 +1,230 @@
+import inspect
+import re
+
+import pytest
+
+from qsimplify.analyzer.analyzer import calculate_metrics
+from qsimplify.converter import GatesConverter
+from qsimplify.model import (
+    DenseQuantumGraph,
+    GraphBuilder,
+    GraphEdge,
+    GraphNode,
+    Position,
+    QuantumGraph,
+    graph_cleaner,
+)
+from qsimplify.simplifier import Simplifier
+from tests import *
+
+_COLUMN_ACCESS = re.compile(
+    r"self\._(?:columns|column_indices|owned_columns|shares_columns|next_column_id)\b"
+)
+
+
+def _build_sample_graph() -> QuantumGraph:
+    return (
+        GraphBuilder()
+        .push_h(0)
+        .push_cx(0, 1)
+        .push_rz(0.5, 2)
+        .push_swap(1, 2)
+        .push_ccx(0, 1, 2)
+        .push_x(0)
+        .push_x(0)
+        .push_measure(0, 1)
+        .build()
+    )
+
+
+def _find_inherited_column_methods() -> set[str]:
+    """Find the methods inherited from QuantumGraph that use its columns, directly or through another one."""
+    sources = {
+        name: inspect.getsource(method)
+        for name, method in vars(QuantumGraph).items()
+        if inspect.isfunction(method) and name not in vars(DenseQuantumGraph)
+    }
+    column_methods = {name for name, source in sources.items() if _COLUMN_ACCESS.search(source)}
+
+    while True:
+        callers = {
+            name
+            for name, source in sources.items()
+            if any(f"self.{method}(" in source for method in column_methods)
+        }
+
+        if callers <= column_methods:
+            return column_methods
+
+        column_methods |= callers
+
+
+def test_dense_graph_replaces_the_column_storage():
+    column_methods = _find_inherited_column_methods()
+    dense_sources = [
+        inspect.getsource(method)
+        for method in vars(DenseQuantumGraph).values()
+        if inspect.isfunction(method)
+    ]
+
+    assert not hasattr(DenseQuantumGraph(), "_columns")
+    assert all(name.startswith("_") and not name.startswith("__") for name in column_methods)
+    assert not any(
+        f"self.{method}(" in source for method in column_methods for source in dense_sources
+    )
+
+
+def test_from_graph_equals_original():
+    graph = _build_sample_graph()
+    dense = DenseQuantumGraph.from_graph(graph)
+
+    assert dense == graph
+    assert graph == dense
+    assert dense.width == graph.width
+    assert dense.height == graph.height
+    assert dense.bits == graph.bits
+    assert len(dense) == len(graph)
+    assert sorted(dense.edges(), key=str) == sorted(graph.edges(), key=str)
+
+
+def test_different_graphs_are_not_equal():
+    graph = _build_sample_graph()
+    other = GraphBuilder().push_h(0).build()
+
+    assert DenseQuantumGraph.from_graph(graph) != other
+    assert DenseQuantumGraph.from_graph(graph) != DenseQuantumGraph.from_graph(other)
+
+
+def test_node_attributes():
+    dense = DenseQuantumGraph()
+
+    dense.add_node(RZ, Position(1, 2), angle=0.25)
+    dense.add_node(MEASURE, Position(0, 3), bit=4)
+
+    assert dense.node_attributes(Position(1, 2)) == (RZ, 0.25, None)
+    assert dense[Position(0, 3)] == GraphNode(MEASURE, Position(0, 3), bit=4)
+    assert dense[Position(0, 0)] is None
+    assert dense[Position(5, 5)] is None
+    assert dense.bits == 5
+
+
+def test_dimensions_shrink_after_removing_nodes():
+    dense = DenseQuantumGraph()
+
+    dense.add_node(X, Position(0, 0))
+    dense.add_node(Y, Position(3, 5))
+    assert (dense.height, dense.width) == (4, 6)
+
+    dense.remove_node(Position(3, 5))
+    assert (dense.height, dense.width) == (1, 1)
+
+    dense.remove_node(Position(0, 0))
+    assert dense.is_empty()
+    assert (dense.height, dense.width) == (0, 0)
+
+
+def test_remove_node_removes_its_edges():
+    dense = DenseQuantumGraph.from_graph(GraphBuilder().push_h(0).push_cx(0, 1).build())
+
+    dense.remove_node(Position(0, 1))
+
+    assert list(dense.iter_node_links(Position(0, 0))) == []
+    assert list(dense.iter_node_links(Position(1, 1))) == [(LEFT, Position(1, 0))]
+
+
+def test_move_node_preserves_edges():
+    dense = DenseQuantumGraph()
+
+    dense.add_node(H, Position(0, 1))
+    dense.add_node(Y, Position(1, 1))
+    dense.add_node(CX, Position(0, 0))
+    dense.add_node(CX, Position(1, 0))
+
+    dense.add_edge(RIGHT, Position(0, 0), Position(0, 1))
+    dense.add_edge(LEFT, Position(0, 1), Position(0, 0))
+    dense.add_edge(TARGETS, Position(0, 0), Position(1, 0))
+    dense.add_edge(CONTROLLED_BY, Position(1, 0), Position(0, 0))
+
+    dense.move_node(Position(0, 0), Position(4, 0))
+
+    hadamard = GraphNode(H, Position(0, 1))
+    cx_controller = GraphNode(CX, Position(4, 0))
+    cx_target = GraphNode(CX, Position(1, 0))
+
+    edges = dense.edges()
+    assert len(edges) == 4
+    assert GraphEdge(RIGHT, cx_controller, hadamard) in edges
+    assert GraphEdge(LEFT, hadamard, cx_controller) in edges
+    assert GraphEdge(TARGETS, cx_controller, cx_target) in edges
+    assert GraphEdge(CONTROLLED_BY, cx_target, cx_controller) in edges
+
+
+def test_move_nonexistent_node():
+    dense = DenseQuantumGraph()
+
+    with pytest.raises(ValueError, match=r"Node at position \(0, 3\) does not exist"):
+        dense.move_node(Position(0, 3), Position(1, 3))
+
+
+def test_insert_column():
+    graph = _build_sample_graph()
+    dense = DenseQuantumGraph.from_graph(graph)
+
+    graph.insert_column(2)
+    dense.insert_column(2)
+
+    assert dense == graph
+
+
+def test_copy_is_independent():
+    dense = DenseQuantumGraph.from_graph(_build_sample_graph())
+    copy = dense.copy()
+
+    copy.clear_node(Position(0, 0))
+
+    assert isinstance(copy, DenseQuantumGraph)
+    assert copy != dense
+    assert dense == _build_sample_graph()
+
+
+def test_clean_and_fill():
+    graph = GraphBuilder().put_x(0, 1).put_cx(0, 2, 3).put_h(4, 0).build(False)
+    dense = DenseQuantumGraph.from_graph(graph)
+
+    graph_cleaner.clean_and_fill(graph)
+    graph_cleaner.clean_and_fill(dense)
+
+    assert dense == graph
+    assert dense.draw_grid() == graph.draw_grid()
+
+
+def test_simplify():
+    graph = _build_sample_graph()
+    dense = DenseQuantumGraph.from_graph(graph)
+    simplifier = Simplifier()
+
+    simplified_graph = simplifier.simplify_graph(graph)
+    simplified_dense = simplifier.simplify_graph(dense)
+
+    assert isinstance(simplified_dense, DenseQuantumGraph)
+    assert simplified_dense == simplified_graph
+
+
+def test_convert_and_analyze():
+    graph = _build_sample_graph()
+    dense = DenseQuantumGraph.from_graph(graph)
+    converter = GatesConverter()
+
+    assert converter.to_graph(converter.from_graph(dense)) == graph
+    assert calculate_metrics(dense) == calculate_metrics(graph)
+
+
+def test_remove_column():
+    graph = _build_sample_graph()
+    dense = DenseQuantumGraph.from_graph(graph)
+
+    graph.remove_column(3)
+    dense.remove_column(3)
+
+    assert dense == graph
+    assert sorted(dense.edges(), key=str) == sorted(graph.edges(), key=str)
@@ -1,6 +1,13 @@
 import numpy
 
-from qsimplify.model import GraphEdge, GraphNode, Position, QuantumGraph, graph_cleaner
+from qsimplify.model import (
+    GraphBuilder,
+    GraphEdge,
+    GraphNode,
+    Position,
+    QuantumGraph,
+    graph_cleaner,
+)
 from tests import *
 
 
@@ -61,6 +68,26 @@ def test_remove_empty_columns():
     assert graph.width == 2
 
 
+def test_clean_and_fill_columns():
+    graph = GraphBuilder().push_h(0).push_x(0).push_cx(0, 1).push_rz(5 * numpy.pi, 1).build()
+    expected = GraphBuilder().push_h(0).push_cx(0, 1).push_z(0).push_rz(numpy.pi, 1).build()
+
+    graph.clear_node(Position(0, 1))
+    graph.add_node(Z, Position(0, 3))
+    graph_cleaner.clean_and_fill_columns(graph, [Position(0, 1), Position(0, 3)])
+
+    assert graph == expected
+
+
+def test_clean_and_fill_columns_with_an_empty_row():
+    graph = GraphBuilder().push_x(0).push_h(1).push_x(2).build()
+
+    graph.clear_node(Position(1, 0))
+    graph_cleaner.clean_and_fill_columns(graph, [Position(1, 0)])
+
+    assert graph == GraphBuilder().push_x(0).push_x(1).build()
+
+
 def test_normalize_phase_angles():
     graph = QuantumGraph()
 
@@ -0,0 +1,39 @@
+import pickle
+
+import pytest
+
+from qsimplify.model import Position
+
+
+def test_positions_are_equal_by_coordinates():
+    first = Position(3, 7)
+    second = Position(3, 7)
+
+    assert first is not second
+    assert first == second
+    assert hash(first) == hash(second)
+    assert first != Position(7, 3)
+    # Only unpickles data that was pickled in this same test.
+    assert pickle.loads(pickle.dumps(first)) == first  # noqa: S301
+
+
+def test_negative_position():
+    with pytest.raises(ValueError, match=r"Position '\(-1, 2\)' can't have negative coordinates"):
+        Position(-1, 2)
+
+
+def test_position_is_immutable():
+    position = Position(1, 2)
+
+    with pytest.raises(AttributeError):
+        position.row = 3
+
+    assert position == Position(1, 2)
+
+
+def test_unpack_position():
+    row, column = Position(4, 5)
+
+    assert (row, column) == (4, 5)
+    assert str(Position(4, 5)) == "(4, 5)"
+    assert repr(Position(4, 5)) == "Position(row=4, column=5)"
@@ -1,3 +1,5 @@
+import operator
+
 import pytest
 
 from qsimplify.model import GraphBuilder, GraphEdge, GraphNode, Position, QuantumGraph
@@ -32,6 +34,47 @@ def test_graph_height():
     assert graph.height == 6
 
 
+def test_dimensions_after_removing_nodes():
+    graph = QuantumGraph()
+
+    graph.add_node(X, Position(0, 0))
+    graph.add_node(Y, Position(2, 1))
+    graph.add_node(Z, Position(4, 5))
+
+    graph.remove_node(Position(2, 1))
+    assert (graph.height, graph.width) == (5, 6)
+
+    graph.remove_node(Position(4, 5))
+    assert (graph.height, graph.width) == (1, 1)
+
+
+def test_dimensions_after_moving_nodes():
+    graph = QuantumGraph()
+
+    graph.add_node(X, Position(0, 0))
+    graph.add_node(Y, Position(1, 3))
+
+    graph.move_node(Position(1, 3), Position(3, 1))
+    assert (graph.height, graph.width) == (4, 2)
+
+    graph.insert_column(0)
+    assert (graph.height, graph.width) == (4, 3)
+
+
+def test_graph_bits():
+    graph = QuantumGraph()
+
+    graph.add_node(MEASURE, Position(0, 0), bit=0)
+    graph.add_node(MEASURE, Position(1, 0), bit=3)
+    assert graph.bits == 4
+
+    graph.add_node(X, Position(1, 0))
+    assert graph.bits == 1
+
+    graph.remove_node(Position(0, 0))
+    assert graph.bits == 0
+
+
 def test_empty_dimensions():
     graph = QuantumGraph()
 
@@ -214,3 +257,99 @@ def test_insert_column_at_empty_space():
     assert graph[Position(0, 1)] == GraphNode(ID, Position(0, 1))
     assert not graph.has_node_at(Position(0, 2))
     assert graph[Position(0, 3)] == GraphNode(Y, Position(0, 3))
+
+
+def test_insert_column_keeps_edges():
+    graph = GraphBuilder().push_cx(0, 1).push_h(0).build()
+
+    graph.insert_column(1)
+
+    controller = GraphNode(CX, Position(0, 0))
+    target = GraphNode(CX, Position(1, 0))
+    hadamard = GraphNode(H, Position(0, 2))
+
+    edges = graph.edges()
+    assert GraphEdge(TARGETS, controller, target) in edges
+    assert GraphEdge(RIGHT, controller, hadamard) in edges
+    assert GraphEdge(LEFT, hadamard, controller) in edges
+
+
+def test_graph_reuses_its_positions():
+    graph = GraphBuilder().push_h(0).push_x(0).build()
+
+    positions = [node.position for node in graph]
+    assert positions == [Position(0, 0), Position(0, 1)]
+    assert all(map(operator.is_, positions, graph.iter_positions_by_column()))
+    assert next(graph.iter_node_links(positions[0])) == (RIGHT, positions[1])
+    assert next(graph.iter_node_links(positions[0]))[1] is positions[1]
+
+    graph.insert_column(0)
+    assert list(graph.iter_positions_by_row()) == [
+        Position(0, 0),
+        Position(0, 1),
+        Position(0, 2),
+    ]
+
+
+def test_remove_column_shortens_crossing_edges():
+    graph = GraphBuilder().push_h(0).push_x(0).build()
+
+    graph.insert_column(1)
+    graph.insert_column(1)
+    graph.remove_column(2)
+
+    hadamard = GraphNode(H, Position(0, 0))
+    x = GraphNode(X, Position(0, 2))
+
+    assert graph.width == 3
+    assert GraphEdge(RIGHT, hadamard, x) in graph.edges()
+    assert GraphEdge(LEFT, x, hadamard) in graph.edges()
+
+
+def test_remove_out_of_range_column():
+    graph = QuantumGraph()
+
+    graph.add_node(X, Position(0, 0))
+
+    with pytest.raises(ValueError, match=r"Column index 1 is out of bounds"):
+        graph.remove_column(1)
+
+
+def test_remove_column():
+    graph = GraphBuilder().push_h(0).push_x(0).push_cx(0, 1).build()
+
+    graph.remove_column(1)
+
+    controller = GraphNode(CX, Position(0, 1))
+    target = GraphNode(CX, Position(1, 1))
+
+    assert graph.width == 2
+    assert graph[Position(0, 0)] == GraphNode(H, Position(0, 0))
+    assert graph.edges() == [
+        GraphEdge(TARGETS, controller, target),
+        GraphEdge(CONTROLLED_BY, target, controller),
+    ]
+
+
+def test_remove_last_column():
+    graph = GraphBuilder().push_h(0).push_x(0).push_x(0).build()
+
+    graph.remove_column(2)
+
+    assert graph.width == 2
+    assert graph == GraphBuilder().push_h(0).push_x(0).build()
+
+
+def test_copy_is_independent():
+    graph = GraphBuilder().push_h(0).push_cx(0, 1).push_measure(1, 0).build()
+    copy = graph.copy()
+
+    copy.clear_node(Position(0, 0))
+    copy.insert_column(1)
+    graph.remove_node(Position(1, 2))
+
+    assert copy[Position(0, 0)] == GraphNode(ID, Position(0, 0))
+    assert copy[Position(1, 3)] == GraphNode(MEASURE, Position(1, 3), bit=0)
+    assert (copy.width, copy.bits) == (4, 1)
+    assert graph[Position(0, 0)] == GraphNode(H, Position(0, 0))
+    assert (graph.width, graph.bits) == (3, 0)
@@ -0,0 +1,26 @@
+from qsimplify.model import GraphBuilder, Position, QuantumGraph
+from qsimplify.simplifier import column_window
+from tests import *
+
+
+def test_split_columns():
+    graph = GraphBuilder().push_h(0).push_cx(0, 1).push_x(2).push_z(0).build()
+
+    left, right = column_window.split_columns(graph, 1)
+
+    assert left == GraphBuilder().push_h(0).push_x(2).build(False)
+    assert right.width == 2
+    assert right[Position(0, 0)].name == CX
+    assert right[Position(2, 0)].name == ID
+    assert right.node_edge_data(Position(0, 0)).targets[0].position == Position(1, 0)
+
+
+def test_append_columns_restores_split():
+    graph = GraphBuilder().push_h(0).push_cx(0, 1).push_measure(1, 0).push_z(0).build()
+    left, right = column_window.split_columns(graph, 2)
+    joined = QuantumGraph()
+
+    column_window.append_columns(joined, left)
+    column_window.append_columns(joined, right)
+
+    assert joined == graph
@@ -0,0 +1,62 @@
+from qsimplify.model import EdgeName, GraphBuilder, Position, QuantumGraph
+from qsimplify.simplifier.compiled_pattern import PatternCell, compile_pattern
+from tests import *
+
+
+def test_compile_pattern():
+    pattern = GraphBuilder().push_cx(0, 1).push_rx(0.5, 0).build()
+
+    compiled = compile_pattern(pattern)
+
+    assert compiled.width == 2
+    assert compiled.height == 2
+    assert compiled.can_match
+    assert not compiled.has_measures
+    assert compiled.cells[0] == (
+        PatternCell(CX, None, None, ((EdgeName.TARGETS, 1, 0),)),
+        PatternCell(RX, 0.5, None, ()),
+    )
+    assert compiled.cells[1] == (
+        PatternCell(CX, None, None, ((EdgeName.CONTROLLED_BY, 0, 0),)),
+        PatternCell(ID, None, None, ()),
+    )
+
+
+def test_compile_pattern_with_measures():
+    pattern = GraphBuilder().push_measure(0, 0).build()
+
+    assert compile_pattern(pattern).has_measures
+
+
+def test_compile_pattern_with_empty_column():
+    pattern = QuantumGraph()
+    pattern.add_node(H, Position(0, 0))
+    pattern.add_node(ID, Position(0, 1))
+
+    assert not compile_pattern(pattern).can_match
+
+
+def test_compile_pattern_symmetries():
+    symmetric = GraphBuilder().push_ccz(0, 1, 2).push_h(1).push_h(2).build()
+    asymmetric = GraphBuilder().push_ccz(0, 1, 2).push_h(1).push_x(2).build()
+
+    compiled = compile_pattern(symmetric)
+
+    assert compiled.symmetries == ((0, 2, 1),)
+    assert compiled.is_first_ordering([3, 4, 5])
+    assert not compiled.is_first_ordering([3, 5, 4])
+    assert compile_pattern(asymmetric).symmetries == ()
+
+
+def test_compile_pattern_symmetric_gates():
+    cz_pattern = GraphBuilder().push_cz(0, 1).push_h(0).push_h(1).build()
+    swap_pattern = GraphBuilder().push_swap(0, 1).push_swap(1, 0).build()
+    cx_pattern = GraphBuilder().push_cx(0, 1).push_cx(0, 1).build()
+
+    compiled = compile_pattern(cz_pattern)
+
+    assert compiled.symmetries == ((1, 0),)
+    assert compiled.is_first_ordering([3, 4])
+    assert not compiled.is_first_ordering([4, 3])
+    assert compile_pattern(swap_pattern).symmetries == ((1, 0),)
+    assert compile_pattern(cx_pattern).symmetries == ()
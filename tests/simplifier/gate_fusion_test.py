@@ -0,0 +1,58 @@
+import numpy
+
+from qsimplify.model import GraphBuilder, Position
+from qsimplify.simplifier import gate_fusion
+from tests import *
+
+
+def test_synthesize_fixed_gates():
+    unitary = gate_fusion.gate_matrix(S) @ gate_fusion.gate_matrix(S)
+
+    assert gate_fusion.synthesize_unitary(unitary) == [(Z, None)]
+    assert gate_fusion.synthesize_unitary(gate_fusion.gate_matrix(X) @ unitary) == [(Y, None)]
+
+
+def test_synthesize_identity():
+    unitary = gate_fusion.gate_matrix(H) @ gate_fusion.gate_matrix(H)
+
+    assert gate_fusion.synthesize_unitary(unitary) == []
+
+
+def test_synthesize_rotations():
+    unitary = gate_fusion.gate_matrix(P, 0.25) @ gate_fusion.gate_matrix(RZ, 0.5)
+    ((name, angle),) = gate_fusion.synthesize_unitary(unitary)
+
+    assert name == RZ
+    assert numpy.isclose(angle, 0.75)
+
+
+def test_fuse_runs():
+    graph = (
+        GraphBuilder()
+        .push_h(0)
+        .push_s(0)
+        .push_s(0)
+        .push_h(0)
+        .push_cx(0, 1)
+        .push_t(0)
+        .push_t(0)
+        .push_t(1)
+        .build()
+    )
+
+    fused_runs = gate_fusion.fuse_single_qubit_gates(graph)
+
+    assert fused_runs == 2
+    assert graph[Position(0, 0)].name == X
+    assert [graph[Position(0, column)].name for column in range(1, 4)] == [ID, ID, ID]
+    assert graph[Position(0, 4)].name == CX
+    assert graph[Position(0, 5)].name == S
+    assert graph[Position(0, 6)].name == ID
+    assert graph[Position(1, 5)].name == T
+
+
+def test_fuse_keeps_runs_without_shorter_equivalent():
+    graph = GraphBuilder().push_h(0).push_t(0).build()
+
+    assert gate_fusion.fuse_single_qubit_gates(graph) == 0
+    assert graph == GraphBuilder().push_h(0).push_t(0).build()
@@ -0,0 +1,26 @@
+from qsimplify.model import GraphBuilder
+from qsimplify.simplifier.compiled_pattern import compile_pattern
+from qsimplify.simplifier.gate_histogram import GateHistogram
+from tests import *
+
+
+def test_required_gates():
+    pattern = GraphBuilder().push_cx(0, 1).push_cx(0, 2).push_h(0).build()
+
+    assert compile_pattern(pattern).required_gates == ((CX, 4), (H, 1))
+
+
+def test_histogram_can_contain():
+    pattern = compile_pattern(GraphBuilder().push_cx(0, 1).push_cx(0, 1).build())
+    graph = GraphBuilder().push_cx(0, 1).push_h(2).build()
+
+    histogram = GateHistogram(graph)
+
+    assert histogram[CX] == 2
+    assert histogram[ID] == 0
+    assert not histogram.can_contain(pattern)
+
+    histogram.replace([H, ID], [CX, CX])
+
+    assert histogram[H] == 0
+    assert histogram.can_contain(pattern)
@@ -0,0 +1,36 @@
+from qsimplify.model import GraphBuilder, Position
+from qsimplify.simplifier import qubit_partition
+from tests import *
+
+
+def test_find_qubit_partitions():
+    graph = GraphBuilder().push_cx(0, 2).push_h(1).push_cz(3, 2).push_x(4).push_swap(1, 4).build()
+
+    assert qubit_partition.find_qubit_partitions(graph) == [[0, 2, 3], [1, 4]]
+
+
+def test_find_qubit_partitions_joins_rows_sharing_a_bit():
+    graph = (
+        GraphBuilder().push_measure(0, 1).push_h(1).push_measure(2, 1).push_measure(3, 0).build()
+    )
+
+    assert qubit_partition.find_qubit_partitions(graph) == [[0, 2], [1], [3]]
+
+
+def test_extract_partition():
+    graph = GraphBuilder().push_h(1).push_cx(0, 2).push_x(1).build()
+
+    partition = qubit_partition.extract_partition(graph, [0, 2])
+
+    assert partition == GraphBuilder().push_cx(0, 1).put_id(0, 1).put_id(1, 1).build(False)
+
+
+def test_merge_partitions():
+    graph = GraphBuilder().push_h(1).push_cx(0, 2).push_x(1).build()
+    first = qubit_partition.extract_partition(graph, [0, 2])
+    second = qubit_partition.extract_partition(graph, [1])
+
+    merged = qubit_partition.merge_partitions([([0, 2], first), ([1], second)])
+
+    assert merged == graph
+    assert merged[Position(1, 1)].name == X
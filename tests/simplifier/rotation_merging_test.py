@@ -0,0 +1,55 @@
+import math
+
+import numpy
+
+from qsimplify.model import GraphBuilder, Position
+from qsimplify.simplifier import rotation_merging
+from tests import *
+
+
+def test_merge_rotations_on_same_row():
+    graph = GraphBuilder().push_rz(0.25, 0).push_rz(0.5, 0).push_rx(1, 1).push_rz(1, 0).build()
+
+    removed_gates = rotation_merging.merge_rotations(graph)
+
+    assert removed_gates == 2
+    assert graph[Position(0, 0)].name == RZ
+    assert numpy.isclose(graph[Position(0, 0)].angle, 1.75)
+    assert graph[Position(0, 1)].name == ID
+    assert graph[Position(0, 2)].name == ID
+    assert graph[Position(1, 0)].name == RX
+
+
+def test_merge_stops_at_other_gates():
+    graph = GraphBuilder().push_p(0.25, 0).push_h(0).push_p(0.5, 0).push_rz(0.5, 0).build()
+
+    assert rotation_merging.merge_rotations(graph) == 0
+    assert [graph[Position(0, column)].name for column in range(4)] == [P, H, P, RZ]
+
+
+def test_merge_removes_full_cycles():
+    graph = GraphBuilder().push_p(math.pi, 0).push_p(math.pi, 0).push_ry(4 * math.pi, 1).build()
+
+    assert rotation_merging.merge_rotations(graph) == 3
+    assert all(node.name == ID for node in graph)
+
+
+def test_merge_controlled_phases():
+    graph = (
+        GraphBuilder()
+        .push_cp(0.25, 0, 1)
+        .push_cp(0.5, 1, 0)
+        .push_cp(1, 0, 2)
+        .push_cp(1, 0, 1)
+        .build()
+    )
+
+    removed_gates = rotation_merging.merge_rotations(graph)
+
+    assert removed_gates == 1
+    assert graph[Position(1, 0)].name == CP
+    assert numpy.isclose(graph[Position(1, 0)].angle, 0.75)
+    assert graph[Position(0, 1)].name == ID
+    assert graph[Position(1, 1)].name == ID
+    assert graph[Position(0, 3)].name == CP
+    assert graph[Position(1, 3)].name == CP
@@ -0,0 +1,105 @@
+from pathlib import Path
+
+import pytest
+
+from qsimplify.simplifier import rule_cache
+from qsimplify.simplifier.rule_parser import RuleParser
+
+RULES_JSON = """
+[
+    {
+        "pattern": [{"name": "h", "qubit": 0}, {"name": "h", "qubit": 0}],
+        "replacement": []
+    }
+]
+"""
+
+
+@pytest.fixture
+def rules_path(tmp_path: Path) -> Path:
+    path = tmp_path / "rules.json"
+    path.write_text(RULES_JSON)
+    return path
+
+
+def test_rules_are_cached(rules_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    cache_directory = tmp_path / "cache"
+    rules = rule_cache.load_rules_with_cache(rules_path, cache_directory)
+
+    def _fail(*_args: object) -> None:
+        raise AssertionError("Rules shouldn't be parsed again")
+
+    monkeypatch.setattr(RuleParser, "load_rules", _fail)
+    cached_rules = rule_cache.load_rules_with_cache(rules_path, cache_directory)
+
+    assert len(list(cache_directory.iterdir())) == 1
+    assert str(cached_rules[0]) == str(rules[0])
+    assert cached_rules[0].compiled_pattern == rules[0].compiled_pattern
+
+
+def test_cache_changes_with_rules(rules_path: Path, tmp_path: Path):
+    cache_directory = tmp_path / "cache"
+    rule_cache.load_rules_with_cache(rules_path, cache_directory)
+    rules_path.write_text(RULES_JSON.replace('"h"', '"x"'))
+
+    rules = rule_cache.load_rules_with_cache(rules_path, cache_directory)
+
+    assert len(list(cache_directory.iterdir())) == 1
+    assert rules[0].compiled_pattern.start.name.value == "x"
+
+
+def test_broken_cache_is_ignored(rules_path: Path, tmp_path: Path):
+    cache_directory = tmp_path / "cache"
+    rule_cache.load_rules_with_cache(rules_path, cache_directory)
+
+    for cache_path in cache_directory.iterdir():
+        cache_path.write_bytes(b"broken")
+
+    rules = rule_cache.load_rules_with_cache(rules_path, cache_directory)
+
+    assert len(rules) == 1
+
+
+def test_default_rules_are_shared():
+    assert rule_cache.load_default_rules() is rule_cache.load_default_rules()
+
+
+def test_unrelated_files_are_kept(rules_path: Path, tmp_path: Path):
+    cache_directory = tmp_path / "cache"
+    cache_directory.mkdir()
+    (cache_directory / "other.pickle").write_bytes(b"other")
+    (cache_directory / "rules-0123-456.json").write_text("[]")
+
+    rule_cache.load_rules_with_cache(rules_path, cache_directory)
+
+    assert len(list(cache_directory.iterdir())) == 3
+
+
+def test_cache_changes_with_version(
+    rules_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    cache_directory = tmp_path / "cache"
+    rule_cache.load_rules_with_cache(rules_path, cache_directory)
+    old_paths = list(cache_directory.iterdir())
+    monkeypatch.setattr(rule_cache, "CACHE_VERSION", rule_cache.CACHE_VERSION + 1)
+
+    rule_cache.load_rules_with_cache(rules_path, cache_directory)
+
+    new_paths = list(cache_directory.iterdir())
+    assert len(new_paths) == 1
+    assert new_paths != old_paths
+
+
+def test_unwritable_cache_is_ignored(rules_path: Path, tmp_path: Path):
+    cache_directory = tmp_path / "cache"
+    cache_directory.write_text("not a directory")
+
+    rules = rule_cache.load_rules_with_cache(rules_path, cache_directory)
+
+    assert len(rules) == 1
+
+
+def test_default_cache_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("QSIMPLIFY_CACHE_DIR", str(tmp_path))
+
+    assert rule_cache.get_cache_directory() == tmp_path
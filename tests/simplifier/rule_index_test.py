@@ -0,0 +1,35 @@
+from qsimplify.model import GraphBuilder, GraphNode, Position
+from qsimplify.simplifier.rule_index import RuleIndex
+from tests import *
+
+
+def test_find_candidates_by_start_node():
+    index = RuleIndex([GraphNode(H, Position(0, 0)), GraphNode(X, Position(0, 0))])
+    graph = GraphBuilder().push_x(1).push_h(0).push_x(0).push_z(1).build()
+
+    candidates = index.find_candidates(graph)
+
+    assert candidates == {
+        0: [Position(0, 0)],
+        1: [Position(0, 1), Position(1, 0)],
+    }
+
+
+def test_find_candidates_skips_rules_without_matches():
+    index = RuleIndex([GraphNode(CX, Position(0, 0)), GraphNode(H, Position(0, 0))])
+    graph = GraphBuilder().push_h(0).push_h(0).build()
+
+    assert index.find_candidates(graph) == {1: [Position(0, 0), Position(0, 1)]}
+
+
+def test_find_candidates_distinguishes_angles_and_bits():
+    index = RuleIndex(
+        [
+            GraphNode(RX, Position(0, 0), angle=0.5),
+            GraphNode(RX, Position(0, 0)),
+            GraphNode(MEASURE, Position(0, 0), bit=1),
+        ]
+    )
+    graph = GraphBuilder().push_rx(0.25, 0).push_measure(0, 0).push_measure(1, 1).build()
+
+    assert index.find_candidates(graph) == {0: [Position(0, 0)], 2: [Position(1, 0)]}
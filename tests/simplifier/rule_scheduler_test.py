@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from qsimplify.model import GraphBuilder
+from qsimplify.simplifier import SimplificationRule, SimplificationStatistics
+from qsimplify.simplifier.rule_scheduler import RuleScheduler
+from qsimplify.simplifier.simplification_statistics import RuleStatistics
+
+
+def _build_rules() -> list[SimplificationRule]:
+    return [
+        SimplificationRule(GraphBuilder().push_x(0).push_x(0).build(), GraphBuilder().build()),
+        SimplificationRule(GraphBuilder().push_z(0).push_z(0).build(), GraphBuilder().build()),
+        SimplificationRule(
+            GraphBuilder().push_h(0).push_z(0).push_h(0).build(),
+            GraphBuilder().push_x(0).build(False),
+        ),
+    ]
+
+
+def test_order_without_statistics_respects_dependencies():
+    scheduler = RuleScheduler(_build_rules())
+
+    assert scheduler.order() == [1, 2, 0]
+
+
+def test_order_prefers_rules_with_more_matches():
+    scheduler = RuleScheduler(_build_rules())
+    scheduler.record(
+        SimplificationStatistics(
+            [RuleStatistics(matches=0, find_time=1.0), RuleStatistics(matches=5), RuleStatistics()]
+        )
+    )
+
+    assert scheduler.order() == [1, 2, 0]
+    assert scheduler.order() == scheduler.order()
+
+
+def test_order_moves_rules_that_never_match_to_the_end():
+    scheduler = RuleScheduler(_build_rules())
+    scheduler.record(
+        SimplificationStatistics(
+            [RuleStatistics(matches=5), RuleStatistics(find_time=1.0), RuleStatistics()]
+        )
+    )
+
+    assert scheduler.order() == [2, 0, 1]
+
+
+def test_save_and_load_statistics(tmp_path: Path):
+    path = tmp_path / "statistics.json"
+    scheduler = RuleScheduler(_build_rules())
+    scheduler.record(SimplificationStatistics([RuleStatistics(matches=2)] * 3))
+    scheduler.save(path)
+
+    other_scheduler = RuleScheduler(_build_rules())
+    other_scheduler.load(path)
+
+    assert other_scheduler.statistics == scheduler.statistics
+    assert other_scheduler.order() == scheduler.order()
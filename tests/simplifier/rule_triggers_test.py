@@ -0,0 +1,40 @@
+from qsimplify.model import GraphBuilder, Position
+from qsimplify.simplifier import SimplificationRule
+from qsimplify.simplifier.rule_triggers import RuleTriggers
+
+RULES = [
+    SimplificationRule(GraphBuilder().push_x(0).push_x(0).build(), GraphBuilder().build()),
+    SimplificationRule(GraphBuilder().push_h(0).push_h(0).build(), GraphBuilder().build()),
+    SimplificationRule(
+        GraphBuilder().push_h(0).push_z(0).push_h(0).build(),
+        GraphBuilder().push_x(0).build(False),
+    ),
+    SimplificationRule(GraphBuilder().push_z(0).push_z(0).build(), GraphBuilder().build()),
+]
+
+
+def test_created_gates_trigger_rules():
+    graph = GraphBuilder().push_x(0).push_y(0).build()
+    mappings = {Position(0, 0): Position(0, 0), Position(0, 1): Position(0, 1)}
+
+    triggered_rules = RuleTriggers(RULES).find_triggered_rules(2, graph, mappings, False)
+
+    assert triggered_rules == {0}
+
+
+def test_neighbour_gates_trigger_rules():
+    graph = GraphBuilder().push_h(0).put_h(0, 3).build(False)
+    mappings = {Position(0, 1): Position(0, 0), Position(0, 2): Position(0, 1)}
+
+    triggered_rules = RuleTriggers(RULES).find_triggered_rules(0, graph, mappings, False)
+
+    assert triggered_rules == {1, 2}
+
+
+def test_layout_changes_trigger_every_rule():
+    graph = GraphBuilder().push_z(0).build()
+    mappings = {Position(0, 1): Position(0, 0), Position(0, 2): Position(0, 1)}
+
+    triggered_rules = RuleTriggers(RULES).find_triggered_rules(0, graph, mappings, True)
+
+    assert triggered_rules == {0, 1, 2, 3}
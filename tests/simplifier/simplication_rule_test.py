@@ -1,5 +1,6 @@
 from qsimplify.model import GraphBuilder, Position
 from qsimplify.simplifier import SimplificationRule
+from qsimplify.simplifier.compiled_pattern import compile_pattern
 
 
 def test_rule_mask():
@@ -16,3 +17,19 @@ def test_rule_mask():
     }
 
     assert rule.mask == expected
+
+
+def test_rule_compiled_pattern():
+    pattern = GraphBuilder().push_id(0).push_cx(1, 0).push_x(0).build()
+    replacement = GraphBuilder().push_cx(1, 0).build(False)
+
+    rule = SimplificationRule(pattern, replacement)
+    compiled_pattern = rule.compiled_pattern
+
+    assert compiled_pattern.width == rule.pattern.width
+    assert compiled_pattern.height == rule.pattern.height
+    assert compiled_pattern.start == rule.pattern[Position(0, 0)]
+    assert compiled_pattern.mask == tuple(
+        rule.mask[position] for position in rule.pattern.iter_positions_by_row()
+    )
+    assert compiled_pattern == compile_pattern(pattern, rule.mask)
@@ -0,0 +1,29 @@
+from qsimplify.simplifier.simplification_statistics import (
+    RuleStatistics,
+    SimplificationStatistics,
+)
+
+
+def test_add_statistics():
+    statistics = SimplificationStatistics([RuleStatistics(1, 2, 1, 0.5, 0.25), RuleStatistics()])
+    other = SimplificationStatistics([RuleStatistics(3, 1, 0, 0.5, 0.0), RuleStatistics(2, 0, 0)])
+
+    statistics.add(other)
+
+    assert statistics.rules == [RuleStatistics(4, 3, 1, 1.0, 0.25), RuleStatistics(2, 0, 0)]
+
+
+def test_statistics_to_dict_skips_unused_rules():
+    statistics = SimplificationStatistics.for_rules(3)
+    statistics.rules[1].candidates = 2
+
+    assert statistics.to_dict() == [
+        {
+            "rule": 1,
+            "candidates": 2,
+            "row_permutations": 0,
+            "matches": 0,
+            "find_time": 0.0,
+            "replace_time": 0.0,
+        }
+    ]
@@ -1,6 +1,20 @@
-from qsimplify.model import GraphBuilder, Position
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+
+import pytest
+
+from qsimplify.model import GateName, GraphBuilder, Position, graph_cleaner
 from qsimplify.model.quantum_graph import QuantumGraph
-from qsimplify.simplifier import Simplifier
+from qsimplify.simplifier import (
+    CandidateEvent,
+    MatchEvent,
+    OptimizationLevel,
+    PermutationEvent,
+    ReplacementEvent,
+    RuleScheduler,
+    SimplificationRule,
+    Simplifier,
+)
 
 simplifier = Simplifier()
 
@@ -501,3 +515,420 @@ def test_replace_adds_identities():
     expected_graph = GraphBuilder().push_y(0).push_y(0).push_z(1).push_cz(0, 1).push_z(0).build()
 
     assert graph == expected_graph
+
+
+def test_incremental_simplification_revisits_earlier_positions():
+    graph = GraphBuilder().push_x(0).push_h(0).push_h(0).push_x(0).push_z(1).build()
+
+    simplified_graph = simplifier.simplify_graph(graph)
+    expected = GraphBuilder().push_z(0).build()
+
+    assert simplified_graph == expected
+
+
+def test_incremental_simplification_matches_full_rescan():
+    graph = (
+        GraphBuilder()
+        .push_h(0)
+        .push_cx(0, 1)
+        .push_s(1)
+        .push_s(1)
+        .push_cx(0, 1)
+        .push_x(2)
+        .push_t(0)
+        .push_tdg(0)
+        .push_x(2)
+        .push_cz(1, 2)
+        .push_h(0)
+        .push_cz(2, 1)
+        .push_y(1)
+        .push_sdg(0)
+        .push_s(0)
+        .push_y(1)
+        .push_cx(2, 0)
+        .push_cx(2, 0)
+        .build()
+    )
+
+    incremental = simplifier.simplify_graph(graph, iterations=2)
+    full_rescan = simplifier.simplify_graph(graph, iterations=2, incremental=False)
+
+    assert incremental == full_rescan
+
+
+def test_find_pattern_on_distant_rows():
+    pattern = GraphBuilder().push_ccx(0, 1, 2).push_ccx(0, 1, 2).build()
+
+    builder = GraphBuilder()
+    for row in range(20):
+        builder.push_h(row)
+    graph = builder.push_ccx(17, 3, 11).push_ccx(17, 3, 11).build()
+
+    mappings = simplifier.find_pattern(graph, pattern)
+
+    assert mappings == {
+        Position(3, 1): Position(0, 0),
+        Position(3, 2): Position(0, 1),
+        Position(17, 1): Position(1, 0),
+        Position(17, 2): Position(1, 1),
+        Position(11, 1): Position(2, 0),
+        Position(11, 2): Position(2, 1),
+    }
+
+
+def test_find_pattern_skips_rows_with_inconsistent_edges():
+    pattern = GraphBuilder().push_cx(0, 1).push_h(0).push_x(1).build()
+
+    graph = GraphBuilder().push_cx(0, 1).push_cx(0, 2).push_h(0).push_x(2).build()
+
+    mappings = simplifier.find_pattern(graph, pattern)
+
+    assert mappings == {
+        Position(0, 1): Position(0, 0),
+        Position(0, 2): Position(0, 1),
+        Position(2, 1): Position(1, 0),
+        Position(2, 2): Position(1, 1),
+    }
+
+
+def test_find_pattern_rejects_links_outside_window():
+    graph = GraphBuilder().push_cx(0, 1).push_h(0).build()
+    pattern = GraphBuilder().push_h(0).build()
+    linked_pattern = GraphBuilder().push_cx(0, 1).build()
+    single_row_pattern = QuantumGraph()
+    single_row_pattern.add_node(GateName.CX, Position(0, 0))
+
+    assert simplifier.find_pattern(graph, pattern) == {Position(0, 1): Position(0, 0)}
+    assert simplifier.find_pattern(graph, linked_pattern) == {
+        Position(0, 0): Position(0, 0),
+        Position(1, 0): Position(1, 0),
+    }
+    assert simplifier.find_pattern(graph, single_row_pattern) is None
+
+
+def test_simplify_until_stable():
+    graph = GraphBuilder().push_x(0).push_h(0).push_h(0).push_x(0).push_z(1).build()
+
+    result = simplifier.simplify(graph, iterations="fixpoint")
+
+    assert result.converged
+    assert result.iterations == 2
+    assert result.graph == GraphBuilder().push_z(0).build()
+
+
+def test_simplify_stops_at_max_iterations():
+    graph = GraphBuilder().push_x(0).push_h(0).push_h(0).push_x(0).push_z(1).build()
+
+    result = simplifier.simplify(graph, iterations="fixpoint", max_iterations=1)
+
+    assert not result.converged
+    assert result.iterations == 1
+
+
+def test_simplify_with_invalid_iterations():
+    graph = GraphBuilder().push_x(0).build()
+
+    with pytest.raises(ValueError, match=r"Number of iterations must be greater than 0"):
+        simplifier.simplify_graph(graph, iterations=0)
+
+
+def test_simplify_independent_qubits_in_parallel():
+    graph = (
+        GraphBuilder()
+        .push_h(0)
+        .push_x(2)
+        .push_cx(0, 1)
+        .push_x(2)
+        .push_h(0)
+        .push_measure(3, 1)
+        .push_measure(2, 0)
+        .build()
+    )
+
+    result = simplifier.simplify(graph, workers=2)
+
+    assert result.graph == (
+        GraphBuilder()
+        .push_h(0)
+        .push_measure(2, 0)
+        .push_measure(3, 1)
+        .push_cx(0, 1)
+        .push_h(0)
+        .build()
+    )
+
+
+def test_simplify_in_parallel_keeps_emptied_rows_in_place():
+    graph = GraphBuilder().push_cx(0, 2).push_cx(0, 2).push_h(2).push_x(1).build()
+
+    result = simplifier.simplify(graph, workers=2)
+
+    assert result.graph == GraphBuilder().push_x(0).push_h(1).build()
+
+
+def test_simplify_in_parallel_reuses_the_executor():
+    graph = GraphBuilder().push_cx(0, 2).push_cx(0, 2).push_h(2).push_x(1).push_x(1).build()
+    rule = SimplificationRule(GraphBuilder().push_x(0).push_x(0).build(), GraphBuilder().build())
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        first = simplifier.simplify_graph(graph, executor=executor)
+        second = simplifier.simplify_graph(graph, [rule], executor=executor)
+
+    assert first == simplifier.simplify_graph(graph)
+    assert second == simplifier.simplify_graph(graph, [rule])
+
+
+def test_simplify_in_parallel_keeps_the_order_of_measurements_into_a_bit():
+    graph = GraphBuilder().push_measure(1, 0).push_h(0).push_h(0).push_measure(0, 0).build()
+
+    result = simplifier.simplify(graph, workers=2)
+
+    assert result.graph == simplifier.simplify(graph).graph
+    assert result.graph.node_attributes(Position(0, 1)) == (GateName.MEASURE, None, 0)
+
+
+def test_simplify_collects_rule_statistics():
+    graph = GraphBuilder().push_x(0).push_h(0).push_h(0).push_x(0).push_z(1).build()
+
+    result = simplifier.simplify(graph, collect_statistics=True)
+    report = result.statistics.to_dict()
+
+    assert sum(rule["matches"] for rule in report) == 2
+    assert all(rule["candidates"] >= rule["row_permutations"] >= rule["matches"] for rule in report)
+    assert all(rule["find_time"] >= 0 and rule["replace_time"] >= 0 for rule in report)
+    assert simplifier.simplify(graph).statistics is None
+
+
+def test_simplify_emits_trace_events():
+    rule = SimplificationRule(GraphBuilder().push_x(0).push_x(0).build(), GraphBuilder().build())
+    graph = GraphBuilder().push_h(0).push_x(0).push_x(0).build()
+    events = []
+
+    Simplifier(trace_sink=events.append).simplify_graph(graph, [rule])
+    event_types = [type(event) for event in events]
+
+    assert event_types.count(CandidateEvent) == 1
+    assert event_types.count(PermutationEvent) == 1
+    assert event_types.count(MatchEvent) == 1
+    assert event_types.count(ReplacementEvent) == 1
+    assert all(
+        event.pattern is rule.compiled_pattern for event in events if hasattr(event, "pattern")
+    )
+    (replacement,) = [event for event in events if isinstance(event, ReplacementEvent)]
+
+    assert replacement.rule is rule
+    assert replacement.mappings == {Position(0, 1): Position(0, 0), Position(0, 2): Position(0, 1)}
+
+
+def test_simplify_with_scheduler_records_statistics():
+    rules = [
+        SimplificationRule(GraphBuilder().push_x(0).push_x(0).build(), GraphBuilder().build()),
+        SimplificationRule(
+            GraphBuilder().push_h(0).push_z(0).push_h(0).build(),
+            GraphBuilder().push_x(0).build(False),
+        ),
+    ]
+    scheduler = RuleScheduler(rules)
+    graph = GraphBuilder().push_x(0).push_h(0).push_z(0).push_h(0).build()
+
+    result = simplifier.simplify(graph, scheduler=scheduler)
+
+    assert result.graph.is_empty()
+    assert result.statistics is None
+    assert [rule.matches for rule in scheduler.statistics.rules] == [1, 1]
+
+    with pytest.raises(ValueError, match=r"A scheduler can't be used along with a different set"):
+        simplifier.simplify(graph, rules, scheduler=scheduler)
+
+
+def test_simplify_with_exhausted_time_budget():
+    graph = GraphBuilder().push_x(0).push_x(0).push_id(1).build()
+
+    result = simplifier.simplify(graph, time_budget=0)
+
+    assert result.partial
+    assert not result.converged
+    assert result.graph == GraphBuilder().push_x(0).push_x(0).build()
+
+
+def test_simplify_within_time_budget():
+    graph = GraphBuilder().push_x(0).push_x(0).build()
+
+    result = simplifier.simplify(graph, time_budget=60)
+
+    assert not result.partial
+    assert result.graph.is_empty()
+
+    with pytest.raises(ValueError, match=r"Time budget can't be negative"):
+        simplifier.simplify(graph, time_budget=-1)
+
+
+def test_simplify_merging_rotations():
+    graph = GraphBuilder().push_rz(0.25, 0).push_h(1).push_rz(-0.25, 0).build()
+
+    simplified_graph = simplifier.simplify_graph(graph, merge_rotations=True)
+
+    assert simplified_graph == GraphBuilder().push_h(1).build()
+
+
+def test_simplify_stream():
+    rules = [SimplificationRule(GraphBuilder().push_x(0).push_x(0).build(), GraphBuilder().build())]
+    chunks = [
+        GraphBuilder().push_x(0).push_h(1).build(False),
+        GraphBuilder().push_x(0).push_z(1).build(False),
+        GraphBuilder().push_y(0).push_z(1).build(False),
+    ]
+
+    first, last = simplifier.simplify_stream(chunks, rules, window_width=3)
+
+    assert first == GraphBuilder().push_id(0).push_h(1).build(False)
+    assert last == GraphBuilder().push_z(1).push_z(1).put_y(0, 1).build(False)
+
+    with pytest.raises(ValueError, match=r"Window width must be greater than the widest pattern"):
+        list(simplifier.simplify_stream(chunks, rules, window_width=2))
+
+
+def test_apply_rule_in_batches(monkeypatch: pytest.MonkeyPatch):
+    rule = SimplificationRule(GraphBuilder().push_x(0).push_x(0).build(), GraphBuilder().build())
+    graph = GraphBuilder().push_x(0).push_x(0).push_x(0).push_x(1).push_x(1).build()
+    cleanups = []
+    clean_and_fill = graph_cleaner.clean_and_fill
+    monkeypatch.setattr(
+        graph_cleaner,
+        "clean_and_fill",
+        lambda graph, keep_rows=False: cleanups.append(clean_and_fill(graph, keep_rows)),
+    )
+
+    replacements = simplifier.apply_simplification_rule(graph, rule, batch_matches=True)
+
+    assert replacements == 2
+    assert len(cleanups) == 1
+    assert graph == GraphBuilder().push_x(0).build()
+
+
+def test_simplify_skips_symmetric_row_orderings():
+    rule = SimplificationRule(
+        GraphBuilder().push_ccz(0, 1, 2).push_ccz(0, 1, 2).build(), GraphBuilder().build()
+    )
+    graph = GraphBuilder().push_ccz(0, 1, 2).push_h(2).push_ccz(0, 1, 2).build()
+
+    result = simplifier.simplify(graph, [rule], incremental=False, collect_statistics=True)
+
+    assert result.graph == graph
+    assert result.statistics.rules[0].row_permutations == 2
+
+
+def test_simplify_skips_orderings_of_symmetric_gates():
+    rule = SimplificationRule(
+        GraphBuilder().push_cz(0, 1).push_cz(0, 1).build(), GraphBuilder().build()
+    )
+    asymmetric_rule = SimplificationRule.from_compiled(
+        rule.pattern, rule.replacement, replace(rule.compiled_pattern, symmetries=())
+    )
+    graph = GraphBuilder().push_cz(0, 1).push_h(1).push_cz(1, 0).build()
+
+    result = simplifier.simplify(graph, [rule], incremental=False, collect_statistics=True)
+    asymmetric_result = simplifier.simplify(
+        graph, [asymmetric_rule], incremental=False, collect_statistics=True
+    )
+
+    assert result.graph == asymmetric_result.graph == graph
+    assert result.statistics.rules[0].row_permutations == 2
+    assert asymmetric_result.statistics.rules[0].row_permutations == 4
+
+
+def test_simplify_takes_rows_from_the_edges_of_later_columns():
+    rule = SimplificationRule(
+        GraphBuilder().push_h(0).push_x(1).push_cx(0, 1).build(), GraphBuilder().push_x(0).build()
+    )
+    builder = GraphBuilder().push_h(0)
+
+    for row in range(1, 6):
+        builder.push_x(row)
+
+    graph = builder.push_cx(0, 3).build()
+
+    result = simplifier.simplify(graph, [rule], collect_statistics=True)
+
+    assert result.statistics.rules[0].matches == 1
+    assert result.statistics.rules[0].row_permutations == 1
+
+
+def test_simplify_only_checks_candidates_and_replaced_regions():
+    rule = SimplificationRule(GraphBuilder().push_x(0).push_x(0).build(), GraphBuilder().build())
+    builder = GraphBuilder()
+
+    for row in range(4):
+        for _ in range(10):
+            builder.push_h(row)
+
+    graph = builder.push_x(0).push_x(0).push_x(3).push_x(3).build()
+
+    result = simplifier.simplify(graph, [rule], collect_statistics=True)
+
+    assert len(result.graph) == 40
+    assert result.statistics.rules[0].matches == 2
+    assert result.statistics.rules[0].candidates == 5
+
+
+def test_simplify_only_reapplies_triggered_rules():
+    rules = [
+        SimplificationRule(GraphBuilder().push_x(0).push_x(0).build(), GraphBuilder().build()),
+        SimplificationRule(GraphBuilder().push_h(0).push_h(0).build(), GraphBuilder().build()),
+        SimplificationRule(GraphBuilder().push_z(0).push_z(0).build(), GraphBuilder().build()),
+    ]
+    graph = (
+        GraphBuilder()
+        .push_x(0)
+        .push_h(0)
+        .push_h(0)
+        .push_x(0)
+        .push_z(1)
+        .push_y(1)
+        .push_z(1)
+        .push_y(1)
+        .build()
+    )
+
+    result = simplifier.simplify(graph, rules, iterations="fixpoint", collect_statistics=True)
+
+    assert result.converged
+    assert result.iterations == 2
+    assert result.statistics.rules[0].candidates > 2
+    assert result.statistics.rules[2].candidates == 2
+
+
+def test_simplify_at_level():
+    graph = (
+        GraphBuilder()
+        .push_x(0)
+        .push_x(0)
+        .push_cx(0, 1)
+        .push_cx(0, 1)
+        .push_rz(0.5, 1)
+        .push_rz(-0.5, 1)
+        .push_h(2)
+        .build()
+    )
+    only_cx = (
+        GraphBuilder()
+        .push_h(2)
+        .put_cx(0, 1, 1)
+        .put_cx(0, 1, 2)
+        .put_rz(0.5, 1, 3)
+        .put_rz(-0.5, 1, 4)
+    )
+
+    unchanged = simplifier.simplify_at_level(graph, OptimizationLevel.NONE)
+    single_qubit = simplifier.simplify_at_level(graph, OptimizationLevel.SINGLE_QUBIT)
+    full = simplifier.simplify_at_level(graph, OptimizationLevel.FULL)
+
+    assert unchanged.graph == graph
+    assert single_qubit.graph == only_cx.build()
+    assert full.graph == GraphBuilder().push_h(0).build()
+    assert full.converged
+
+
+def test_simplify_at_invalid_level():
+    with pytest.raises(ValueError, match=r"4 is not a valid OptimizationLevel"):
+        simplifier.simplify_at_level(QuantumGraph(), 4)